@@ -0,0 +1,121 @@
+"""
+Report bytes per object for the model classes and their compact counterparts.
+
+Run from the repository root:
+
+    python -m benchmarks.model_memory [count]
+"""
+import gc
+import sys
+import tracemalloc
+from typing import Callable, List
+from src.learning_point import LearningPoint
+from src.topic import Topic
+from src.models.exercise import Exercise
+from src.models.grading_result import GradingResult
+from src.models.frozen_exercise import FrozenExercise
+from src.models.frozen_grading_result import FrozenGradingResult
+
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+TYPES = ["multiple_choice", "open_ended", "coding"]
+MASTERY = ["beginner", "intermediate", "advanced"]
+
+
+class DictLearningPoint:
+    """LearningPoint layout with a per-instance __dict__, as before it gained __slots__."""
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self.topics = set()
+
+    def add_topic(self, topic: str) -> None:
+        self.topics.add(topic)
+
+
+class DictTopic:
+    """Topic layout with a per-instance __dict__, as before it gained __slots__."""
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self.prerequisites = set()
+        self.learning_points = {}
+
+    def add_prerequisite(self, prerequisite: str) -> None:
+        self.prerequisites.add(prerequisite)
+
+
+def fresh(text: str) -> str:
+    # Build a new string object each time, as JSON parsing of LLM responses does
+    return "".join(list(text))
+
+
+def make_exercise(cls, index: int):
+    return cls(
+        question=f"Question {index}: explain concept {index % 1000}.",
+        expected_answer=f"Answer {index}",
+        explanation=f"Explanation {index}",
+        difficulty_level=fresh(DIFFICULTIES[index % 3]),
+        exercise_type=fresh(TYPES[index % 3]),
+        related_learning_points=[fresh(f"point_{index % 50}")]
+    )
+
+
+def make_grading_result(cls, index: int):
+    return cls(
+        score=float(index % 101),
+        feedback=f"Feedback for answer {index}",
+        metadata={
+            fresh("mastery_level"): fresh(MASTERY[index % 3]),
+            fresh("key_concepts_understood"): [fresh("variables")],
+        },
+        confidence=0.9
+    )
+
+
+def make_learning_point(cls, index: int):
+    point = cls(f"point_{index}", f"Description of point {index}")
+    point.add_topic(fresh(f"topic_{index % 100}"))
+    return point
+
+
+def make_topic(cls, index: int):
+    topic = cls(f"topic_{index}", f"Description of topic {index}")
+    topic.add_prerequisite(fresh(f"topic_{index // 2}"))
+    return topic
+
+
+def bytes_per_object(factory: Callable[[int], object], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects: List[object] = [factory(index) for index in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    list_overhead = sys.getsizeof(objects)
+    del objects
+    return (after - before - list_overhead) / count
+
+
+def main(count: int = 100_000) -> None:
+    cases = [
+        ("Exercise", lambda i: make_exercise(Exercise, i),
+         "FrozenExercise", lambda i: make_exercise(FrozenExercise, i)),
+        ("GradingResult", lambda i: make_grading_result(GradingResult, i),
+         "FrozenGradingResult", lambda i: make_grading_result(FrozenGradingResult, i)),
+        ("LearningPoint (__dict__)", lambda i: make_learning_point(DictLearningPoint, i),
+         "LearningPoint (__slots__)", lambda i: make_learning_point(LearningPoint, i)),
+        ("Topic (__dict__)", lambda i: make_topic(DictTopic, i),
+         "Topic (__slots__)", lambda i: make_topic(Topic, i)),
+    ]
+    print(f"Bytes per object over {count} objects (including owned strings and containers)")
+    for before_name, before_factory, after_name, after_factory in cases:
+        before = bytes_per_object(before_factory, count)
+        after = bytes_per_object(after_factory, count)
+        print(f"{before_name:>26}: {before:8.1f}   {after_name:>26}: {after:8.1f}"
+              f"   ({100 * (before - after) / before:5.1f}% smaller)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
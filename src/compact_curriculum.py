@@ -0,0 +1,256 @@
+from typing import Iterable, Iterator, List, Mapping, Set
+from .curriculum_graph import CurriculumGraph
+from .learning_point import LearningPoint
+
+class CompactLearningPointView:
+    """View of a learning point stored in a CurriculumGraph."""
+
+    __slots__ = ("_graph", "_id")
+
+    def __init__(self, graph: CurriculumGraph, point_id: int):
+        self._graph = graph
+        self._id = point_id
+
+    @property
+    def name(self) -> str:
+        return self._graph.point_names[self._id]
+
+    @property
+    def description(self) -> str:
+        return self._graph.point_descriptions[self._id]
+
+    @description.setter
+    def description(self, description: str) -> None:
+        self._graph.point_descriptions[self._id] = description
+
+    @property
+    def topics(self) -> Set[str]:
+        return self.get_topics()
+
+    def get_topics(self) -> Set[str]:
+        """Get all topics associated with this learning point."""
+        names = self._graph.topic_names
+        return {names[topic_id] for topic_id in self._graph.point_topics.neighbours(self._id)}
+
+    def to_learning_point(self) -> LearningPoint:
+        """Materialize a standalone LearningPoint with the same name, description and topics."""
+        learning_point = LearningPoint(self.name, self.description)
+        for topic in self.get_topics():
+            learning_point.add_topic(topic)
+        return learning_point
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactLearningPointView):
+            return self._graph is other._graph and self._id == other._id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._graph), self._id))
+
+    def __str__(self) -> str:
+        return f"LearningPoint(name='{self.name}', topics={self.get_topics()})"
+
+
+class CompactTopicView:
+    """View of a topic stored in a CurriculumGraph."""
+
+    __slots__ = ("_graph", "_id")
+
+    def __init__(self, graph: CurriculumGraph, topic_id: int):
+        self._graph = graph
+        self._id = topic_id
+
+    @property
+    def name(self) -> str:
+        return self._graph.topic_names[self._id]
+
+    @property
+    def description(self) -> str:
+        return self._graph.topic_descriptions[self._id]
+
+    @description.setter
+    def description(self, description: str) -> None:
+        self._graph.topic_descriptions[self._id] = description
+
+    @property
+    def prerequisites(self) -> Set[str]:
+        return self.get_prerequisites()
+
+    @property
+    def learning_points(self) -> List[CompactLearningPointView]:
+        return self.get_learning_points()
+
+    def get_prerequisites(self) -> Set[str]:
+        """Get all prerequisite topics."""
+        names = self._graph.topic_names
+        return {names[topic_id] for topic_id in self._graph.prerequisites.neighbours(self._id)}
+
+    def get_learning_points(self) -> List[CompactLearningPointView]:
+        """Get all learning points associated with this topic."""
+        return [
+            CompactLearningPointView(self._graph, point_id)
+            for point_id in self._graph.topic_points.neighbours(self._id)
+        ]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactTopicView):
+            return self._graph is other._graph and self._id == other._id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._graph), self._id))
+
+    def __str__(self) -> str:
+        return (f"Topic(name='{self.name}', prerequisites={self.get_prerequisites()}, "
+                f"learning_points={len(self.get_learning_points())})")
+
+
+class _NameMapping(Mapping):
+    """Mapping from names to views, built on demand from a graph's intern table."""
+
+    def __init__(self, ids: Mapping[str, int], make_view):
+        self._ids = ids
+        self._make_view = make_view
+
+    def __getitem__(self, name: str):
+        return self._make_view(self._ids[name])
+
+    def __contains__(self, name) -> bool:
+        return name in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class CompactCurriculum:
+    """
+    Curriculum backed by a CurriculumGraph instead of Topic objects.
+
+    Offers the same methods as Curriculum; topics and learning points are
+    returned as lightweight views over the interned graph, so memory grows
+    with a few integers per edge rather than one Python object per item.
+    """
+
+    def __init__(self, graph: CurriculumGraph = None):
+        self.graph = graph if graph is not None else CurriculumGraph()
+        self.topics: Mapping[str, CompactTopicView] = _NameMapping(
+            self.graph.topic_ids, lambda topic_id: CompactTopicView(self.graph, topic_id)
+        )
+        self.learning_points: Mapping[str, CompactLearningPointView] = _NameMapping(
+            self.graph.point_ids, lambda point_id: CompactLearningPointView(self.graph, point_id)
+        )
+
+    @classmethod
+    def from_curriculum(cls, curriculum) -> "CompactCurriculum":
+        """Build a compact copy of a Curriculum."""
+        compact = cls()
+        graph = compact.graph
+        for name, topic in curriculum.topics.items():
+            graph.add_topic(name, topic.description)
+        for name, learning_point in curriculum.learning_points.items():
+            graph.add_learning_point(name, learning_point.description)
+        for name, topic in curriculum.topics.items():
+            topic_id = graph.topic_ids[name]
+            for prerequisite in topic.prerequisites:
+                if prerequisite in graph.topic_ids:
+                    graph.add_prerequisite(topic_id, graph.topic_ids[prerequisite], check_cycles=False)
+            for learning_point in topic.learning_points:
+                point_id = graph.add_learning_point(learning_point.name, learning_point.description)
+                graph.assign_point(topic_id, point_id)
+        graph.compact()
+        return compact
+
+    def add_topic(self, name: str, description: str = "") -> CompactTopicView:
+        """Add a new topic to the curriculum."""
+        return CompactTopicView(self.graph, self.graph.add_topic(name, description))
+
+    def add_learning_point(self, name: str, description: str) -> CompactLearningPointView:
+        """Add a new learning point to the curriculum."""
+        return CompactLearningPointView(self.graph, self.graph.add_learning_point(name, description))
+
+    def assign_prerequisite(self, topic: str, prerequisite: str) -> None:
+        """
+        Assign a prerequisite to a topic.
+
+        Raises:
+            ValueError: If the prerequisite would create a cycle
+        """
+        ids = self.graph.topic_ids
+        if topic in ids and prerequisite in ids:
+            self.graph.add_prerequisite(ids[topic], ids[prerequisite])
+
+    def remove_prerequisite(self, topic: str, prerequisite: str) -> None:
+        """Remove a prerequisite from a topic."""
+        ids = self.graph.topic_ids
+        if topic in ids and prerequisite in ids:
+            self.graph.remove_prerequisite(ids[topic], ids[prerequisite])
+
+    def remove_topic(self, name: str) -> None:
+        """Remove a topic, its prerequisite edges and its learning point assignments."""
+        if name in self.graph.topic_ids:
+            self.graph.remove_topic(self.graph.topic_ids[name])
+
+    def assign_learning_point_to_topic(self, learning_point_name: str, topic_name: str) -> None:
+        """Assign a learning point to a topic."""
+        points = self.graph.point_ids
+        topics = self.graph.topic_ids
+        if learning_point_name in points and topic_name in topics:
+            self.graph.assign_point(topics[topic_name], points[learning_point_name])
+
+    def _names(self, topic_ids: Iterable[int]) -> Set[str]:
+        names = self.graph.topic_names
+        return {names[topic_id] for topic_id in topic_ids}
+
+    def get_topic_prerequisites(self, topic_name: str) -> Set[str]:
+        """Get all prerequisites for a given topic."""
+        topic_id = self.graph.topic_ids.get(topic_name)
+        if topic_id is None:
+            return set()
+        return self._names(self.graph.prerequisites.neighbours(topic_id))
+
+    def get_all_prerequisites(self, topic_name: str) -> Set[str]:
+        """Get every topic required, directly or transitively, before a given topic."""
+        topic_id = self.graph.topic_ids.get(topic_name)
+        if topic_id is None:
+            return set()
+        return self._names(self.graph.ancestors(topic_id))
+
+    def get_unlocked_topics(self, topic_name: str) -> Set[str]:
+        """Get every topic that requires, directly or transitively, a given topic."""
+        topic_id = self.graph.topic_ids.get(topic_name)
+        if topic_id is None:
+            return set()
+        return self._names(self.graph.descendants(topic_id))
+
+    def is_prerequisite(self, topic_name: str, prerequisite: str) -> bool:
+        """Check whether a topic is required, directly or transitively, before another."""
+        ids = self.graph.topic_ids
+        if topic_name not in ids or prerequisite not in ids:
+            return False
+        return self.graph.reaches(ids[topic_name], ids[prerequisite])
+
+    def topological_order(self) -> List[str]:
+        """Get every topic in a valid study order, prerequisites first."""
+        names = self.graph.topic_names
+        return [names[topic_id] for topic_id in self.graph.topological_order()]
+
+    def learning_path(self, target: str, completed: Iterable[str] = ()) -> List[str]:
+        """Get the prerequisites of a target topic still missing, in study order."""
+        ids = self.graph.topic_ids
+        if target not in ids:
+            return []
+        completed_ids = [ids[name] for name in completed if name in ids]
+        names = self.graph.topic_names
+        return [names[topic_id] for topic_id in self.graph.learning_path(ids[target], completed_ids)]
+
+    def get_topic_learning_points(self, topic_name: str) -> List[CompactLearningPointView]:
+        """Get all learning points for a given topic."""
+        if topic_name not in self.graph.topic_ids:
+            return []
+        return self.topics[topic_name].get_learning_points()
+
+    def __str__(self) -> str:
+        return f"Curriculum(topics={self.graph.topic_count}, learning_points={self.graph.point_count})"
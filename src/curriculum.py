@@ -1,4 +1,5 @@
-from typing import Dict, Set, List
+import heapq
+from typing import AbstractSet, Collection, Dict, Set, List, Iterable, Optional
 from .topic import Topic
 from .learning_point import LearningPoint
 
@@ -6,40 +7,215 @@ class Curriculum:
     def __init__(self):
         self.topics: Dict[str, Topic] = {}
         self.learning_points: Dict[str, LearningPoint] = {}
-        
+        # Prerequisite graph indexes, kept in sync by assign_prerequisite,
+        # remove_prerequisite and remove_topic.
+        self._dependents: Dict[str, Set[str]] = {}  # topic -> topics listing it as a direct prerequisite
+        self._ancestors: Dict[str, Set[str]] = {}  # topic -> all transitive prerequisites
+        self._descendants: Dict[str, Set[str]] = {}  # topic -> all topics it transitively unlocks
+        # Derived caches, invalidated when prerequisites change
+        self._topological_order: Optional[List[str]] = None
+        self._topological_position: Dict[str, int] = {}
+        self._path_cache: Dict[str, List[str]] = {}  # target -> its prerequisites in study order
+
     def add_topic(self, name: str, description: str = "") -> Topic:
         """Add a new topic to the curriculum."""
         if name not in self.topics:
             self.topics[name] = Topic(name, description)
+            self._dependents[name] = set()
+            self._ancestors[name] = set()
+            self._descendants[name] = set()
+            if self._topological_order is not None:
+                # A topic without prerequisites can always be studied last
+                self._topological_position[name] = len(self._topological_order)
+                self._topological_order.append(name)
         return self.topics[name]
-        
+
     def add_learning_point(self, name: str, description: str) -> LearningPoint:
         """Add a new learning point to the curriculum."""
         if name not in self.learning_points:
             self.learning_points[name] = LearningPoint(name, description)
         return self.learning_points[name]
-        
+
     def assign_prerequisite(self, topic: str, prerequisite: str) -> None:
-        """Assign a prerequisite to a topic."""
-        if topic in self.topics and prerequisite in self.topics:
-            self.topics[topic].add_prerequisite(prerequisite)
-            
+        """
+        Assign a prerequisite to a topic.
+
+        Raises:
+            ValueError: If the prerequisite would create a cycle
+        """
+        if topic not in self.topics or prerequisite not in self.topics:
+            return
+        if topic == prerequisite or topic in self._ancestors[prerequisite]:
+            raise ValueError(
+                f"Cannot make '{prerequisite}' a prerequisite of '{topic}': it would create a cycle"
+            )
+        if prerequisite in self.topics[topic].prerequisites:
+            return
+        self.topics[topic].add_prerequisite(prerequisite)
+        self._dependents[prerequisite].add(topic)
+        self._invalidate_paths([topic])
+
+        gained = {prerequisite} | self._ancestors[prerequisite]
+        unlocked = {topic} | self._descendants[topic]
+        for name in unlocked:
+            self._ancestors[name] |= gained
+        for name in gained:
+            self._descendants[name] |= unlocked
+
+    def remove_prerequisite(self, topic: str, prerequisite: str) -> None:
+        """Remove a prerequisite from a topic."""
+        if topic not in self.topics or prerequisite not in self.topics[topic].prerequisites:
+            return
+        self.topics[topic].remove_prerequisite(prerequisite)
+        self._dependents.get(prerequisite, set()).discard(topic)
+        self._invalidate_paths([topic])
+        self._recompute_closure([topic])
+
+    def remove_topic(self, name: str) -> None:
+        """Remove a topic, its prerequisite edges and its learning point assignments."""
+        if name not in self.topics:
+            return
+        self._invalidate_paths([name])
+        dependents = self._dependents.pop(name)
+        for dependent in dependents:
+            self.topics[dependent].remove_prerequisite(name)
+        for prerequisite in self.topics[name].prerequisites:
+            self._dependents.get(prerequisite, set()).discard(name)
+        for ancestor in self._ancestors.pop(name):
+            self._descendants[ancestor].discard(name)
+        for descendant in self._descendants.pop(name):
+            self._ancestors[descendant].discard(name)
+        for learning_point in self.topics[name].get_learning_points():
+            learning_point.remove_topic(name)
+        del self.topics[name]
+        self._recompute_closure(dependents)
+
+    def _recompute_closure(self, changed: Iterable[str]) -> None:
+        """Rebuild the transitive indexes of topics downstream of removed edges."""
+        affected = set()
+        for name in changed:
+            affected.add(name)
+            affected |= self._descendants[name]
+
+        # Process affected topics in prerequisite order so each one's
+        # prerequisites are already up to date when it is recomputed.
+        pending = {
+            name: sum(1 for prerequisite in self.topics[name].prerequisites if prerequisite in affected)
+            for name in affected
+        }
+        ready = [name for name, count in pending.items() if count == 0]
+        while ready:
+            name = ready.pop()
+            ancestors = set()
+            for prerequisite in self.topics[name].prerequisites:
+                ancestors.add(prerequisite)
+                ancestors |= self._ancestors.get(prerequisite, set())
+            for lost in self._ancestors[name] - ancestors:
+                self._descendants.get(lost, set()).discard(name)
+            self._ancestors[name] = ancestors
+            for dependent in self._dependents[name]:
+                if dependent in pending:
+                    pending[dependent] -= 1
+                    if pending[dependent] == 0:
+                        ready.append(dependent)
+
+    def _invalidate_paths(self, changed: Iterable[str]) -> None:
+        """Drop cached orderings that depend on the prerequisites of changed topics."""
+        self._topological_order = None
+        for name in changed:
+            self._path_cache.pop(name, None)
+            for descendant in self._descendants.get(name, ()):
+                self._path_cache.pop(descendant, None)
+
+    def topological_order(self) -> List[str]:
+        """
+        Get every topic in a valid study order, prerequisites first.
+
+        Among topics whose prerequisites are all satisfied, earlier-added
+        topics come first, so the order is deterministic.
+        """
+        if self._topological_order is None:
+            position = {name: index for index, name in enumerate(self.topics)}
+            remaining = {
+                name: sum(1 for prerequisite in topic.prerequisites if prerequisite in self.topics)
+                for name, topic in self.topics.items()
+            }
+            ready = [position[name] for name, count in remaining.items() if count == 0]
+            heapq.heapify(ready)
+            names = list(self.topics)
+            order = []
+            while ready:
+                name = names[heapq.heappop(ready)]
+                order.append(name)
+                for dependent in self._dependents[name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        heapq.heappush(ready, position[dependent])
+            self._topological_order = order
+            self._topological_position = {name: index for index, name in enumerate(order)}
+        return list(self._topological_order)
+
+    def learning_path(self, target: str, completed: Iterable[str] = ()) -> List[str]:
+        """
+        Get the prerequisites of a target topic still missing, in study order.
+
+        A completed topic counts as having its own prerequisites completed too.
+
+        Args:
+            target: The topic the student wants to reach
+            completed: Topics the student has already completed
+
+        Returns:
+            The missing transitive prerequisites of target, prerequisites first
+            (empty if target is unknown)
+        """
+        if target not in self.topics:
+            return []
+        path = self._path_cache.get(target)
+        if path is None:
+            if self._topological_order is None:
+                self.topological_order()
+            path = sorted(self._ancestors[target], key=self._topological_position.__getitem__)
+            self._path_cache[target] = path
+
+        ancestors = self._ancestors[target]
+        satisfied = set()
+        for name in completed:
+            if name in ancestors:
+                satisfied.add(name)
+                satisfied |= self._ancestors[name]
+        if not satisfied:
+            return list(path)
+        return [name for name in path if name not in satisfied]
+
     def assign_learning_point_to_topic(self, learning_point_name: str, topic_name: str) -> None:
         """Assign a learning point to a topic."""
         if learning_point_name in self.learning_points and topic_name in self.topics:
             self.topics[topic_name].add_learning_point(self.learning_points[learning_point_name])
-            
-    def get_topic_prerequisites(self, topic_name: str) -> Set[str]:
+
+    def get_topic_prerequisites(self, topic_name: str) -> AbstractSet[str]:
         """Get all prerequisites for a given topic."""
         if topic_name in self.topics:
             return self.topics[topic_name].get_prerequisites()
         return set()
-        
-    def get_topic_learning_points(self, topic_name: str) -> List[LearningPoint]:
+
+    def get_all_prerequisites(self, topic_name: str) -> Set[str]:
+        """Get every topic required, directly or transitively, before a given topic."""
+        return set(self._ancestors.get(topic_name, ()))
+
+    def get_unlocked_topics(self, topic_name: str) -> Set[str]:
+        """Get every topic that requires, directly or transitively, a given topic."""
+        return set(self._descendants.get(topic_name, ()))
+
+    def is_prerequisite(self, topic_name: str, prerequisite: str) -> bool:
+        """Check whether a topic is required, directly or transitively, before another."""
+        return prerequisite in self._ancestors.get(topic_name, ())
+
+    def get_topic_learning_points(self, topic_name: str) -> Collection[LearningPoint]:
         """Get all learning points for a given topic."""
         if topic_name in self.topics:
             return self.topics[topic_name].get_learning_points()
         return []
-        
+
     def __str__(self) -> str:
         return f"Curriculum(topics={len(self.topics)}, learning_points={len(self.learning_points)})"
@@ -0,0 +1,376 @@
+import heapq
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Edges staged outside the CSR arrays are merged in once they outnumber both
+# this threshold and the compacted edges, so compaction cost is amortized O(1)
+# per edit.
+MIN_COMPACTION_THRESHOLD = 1024
+
+
+class Adjacency:
+    """
+    Directed edges between integer ids in compressed sparse row form.
+
+    The neighbours of node i are targets[offsets[i]:offsets[i + 1]]. Edges
+    added since the last compaction live in a small overlay and removed
+    edges are masked until the next compaction, so single edits are cheap
+    and bulk loads stay linear.
+    """
+
+    __slots__ = ("offsets", "targets", "_added", "_added_count", "_removed", "_size")
+
+    def __init__(self, offsets=None, targets=None):
+        self.offsets = offsets if offsets is not None else array("i", [0])
+        self.targets = targets if targets is not None else array("i")
+        self._added: Dict[int, List[int]] = {}
+        self._added_count = 0
+        self._removed: Set[Tuple[int, int]] = set()
+        self._size = len(self.targets)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _compacted(self, node: int):
+        if node + 1 < len(self.offsets):
+            return self.targets[self.offsets[node]:self.offsets[node + 1]]
+        return ()
+
+    def neighbours(self, node: int) -> Iterator[int]:
+        """Iterate the targets of every edge leaving node."""
+        if self._removed:
+            for target in self._compacted(node):
+                if (node, target) not in self._removed:
+                    yield target
+        else:
+            yield from self._compacted(node)
+        yield from self._added.get(node, ())
+
+    def contains(self, source: int, target: int) -> bool:
+        if target in self._added.get(source, ()):
+            return True
+        return target in self._compacted(source) and (source, target) not in self._removed
+
+    def add(self, source: int, target: int) -> bool:
+        """Add an edge; returns False if it already existed."""
+        if self.contains(source, target):
+            return False
+        if (source, target) in self._removed:
+            self._removed.discard((source, target))
+        else:
+            self._added.setdefault(source, []).append(target)
+            self._added_count += 1
+        self._size += 1
+        return True
+
+    def remove(self, source: int, target: int) -> bool:
+        """Remove an edge; returns False if it did not exist."""
+        added = self._added.get(source)
+        if added and target in added:
+            added.remove(target)
+            self._added_count -= 1
+        elif target in self._compacted(source) and (source, target) not in self._removed:
+            self._removed.add((source, target))
+        else:
+            return False
+        self._size -= 1
+        return True
+
+    def needs_compaction(self) -> bool:
+        staged = self._added_count + len(self._removed)
+        return staged > max(MIN_COMPACTION_THRESHOLD, len(self.targets))
+
+    def compact(self, node_count: int) -> None:
+        """Merge staged edits into fresh CSR arrays covering node_count nodes."""
+        old_offsets, old_targets = self.offsets, self.targets
+        compacted_nodes = len(old_offsets) - 1
+        offsets = array("i", [0])
+        targets = array("i")
+        for node in range(node_count):
+            if node < compacted_nodes:
+                start, end = old_offsets[node], old_offsets[node + 1]
+                if self._removed:
+                    targets.extend(
+                        target for target in old_targets[start:end]
+                        if (node, target) not in self._removed
+                    )
+                else:
+                    targets.extend(old_targets[start:end])
+            added = self._added.get(node)
+            if added:
+                targets.extend(added)
+            offsets.append(len(targets))
+        self.offsets = offsets
+        self.targets = targets
+        self._added = {}
+        self._added_count = 0
+        self._removed = set()
+        self._size = len(targets)
+
+
+class CurriculumGraph:
+    """
+    Compact storage of a curriculum's topics, learning points and edges.
+
+    Topic and learning point names are interned to dense integer ids in
+    insertion order. Prerequisite edges (topic -> prerequisite) and
+    assignment edges (topic -> learning point) are stored as integer
+    adjacency arrays, each with a reverse index.
+
+    Like Curriculum, the graph keeps a transitive-closure index (every
+    topic's ancestors and descendants) so cycle checks and prerequisite
+    queries are set lookups. Checked edge edits update it incrementally;
+    unchecked bulk loads (check_cycles=False) drop it and it is rebuilt once,
+    in one pass over the topological order, by the next query that needs it.
+    """
+
+    def __init__(self):
+        self.topic_names: List[Optional[str]] = []  # None marks a removed topic
+        self.topic_descriptions: List[str] = []
+        self.topic_ids: Dict[str, int] = {}
+        self.point_names: List[str] = []
+        self.point_descriptions: List[str] = []
+        self.point_ids: Dict[str, int] = {}
+        self.prerequisites = Adjacency()  # topic id -> prerequisite topic ids
+        self.dependents = Adjacency()  # topic id -> ids of topics requiring it
+        self.topic_points = Adjacency()  # topic id -> learning point ids
+        self.point_topics = Adjacency()  # learning point id -> topic ids
+        self._order: Optional[array] = None
+        self._position: Optional[array] = None
+        self._path_cache: Dict[int, array] = {}
+        # Transitive-closure index by topic id, or None until (re)built
+        self._ancestors: Optional[List[Set[int]]] = None
+        self._descendants: Optional[List[Set[int]]] = None
+
+    @property
+    def topic_count(self) -> int:
+        return len(self.topic_ids)
+
+    @property
+    def point_count(self) -> int:
+        return len(self.point_ids)
+
+    def add_topic(self, name: str, description: str = "") -> int:
+        """Intern a topic name, returning its id."""
+        topic_id = self.topic_ids.get(name)
+        if topic_id is None:
+            topic_id = len(self.topic_names)
+            self.topic_ids[name] = topic_id
+            self.topic_names.append(name)
+            self.topic_descriptions.append(description)
+            if self._ancestors is not None:
+                self._ancestors.append(set())
+                self._descendants.append(set())
+            if self._order is not None:
+                self._position.append(len(self._order))
+                self._order.append(topic_id)
+        return topic_id
+
+    def add_learning_point(self, name: str, description: str) -> int:
+        """Intern a learning point name, returning its id."""
+        point_id = self.point_ids.get(name)
+        if point_id is None:
+            point_id = len(self.point_names)
+            self.point_ids[name] = point_id
+            self.point_names.append(name)
+            self.point_descriptions.append(description)
+        return point_id
+
+    def _invalidate(self) -> None:
+        self._order = None
+        self._position = None
+        self._path_cache.clear()
+
+    def _maybe_compact(self, *relations: Tuple[Adjacency, int]) -> None:
+        for relation, node_count in relations:
+            if relation.needs_compaction():
+                relation.compact(node_count)
+
+    def add_prerequisite(self, topic_id: int, prerequisite_id: int, check_cycles: bool = True) -> bool:
+        """
+        Add a prerequisite edge; returns False if it already existed.
+
+        Raises:
+            ValueError: If check_cycles is set and the edge would create a cycle
+        """
+        if check_cycles and (topic_id == prerequisite_id
+                             or self.reaches(prerequisite_id, topic_id)):
+            raise ValueError(
+                f"Cannot make '{self.topic_names[prerequisite_id]}' a prerequisite of "
+                f"'{self.topic_names[topic_id]}': it would create a cycle"
+            )
+        if not self.prerequisites.add(topic_id, prerequisite_id):
+            return False
+        self.dependents.add(prerequisite_id, topic_id)
+        self._invalidate()
+        if not check_cycles:
+            self._ancestors = self._descendants = None
+        elif self._ancestors is not None:
+            gained = {prerequisite_id} | self._ancestors[prerequisite_id]
+            unlocked = {topic_id} | self._descendants[topic_id]
+            for node in unlocked:
+                self._ancestors[node] |= gained
+            for node in gained:
+                self._descendants[node] |= unlocked
+        node_count = len(self.topic_names)
+        self._maybe_compact((self.prerequisites, node_count), (self.dependents, node_count))
+        return True
+
+    def remove_prerequisite(self, topic_id: int, prerequisite_id: int) -> bool:
+        """Remove a prerequisite edge; returns False if it did not exist."""
+        if not self.prerequisites.remove(topic_id, prerequisite_id):
+            return False
+        self.dependents.remove(prerequisite_id, topic_id)
+        self._invalidate()
+        if self._ancestors is not None:
+            self._recompute_closure(topic_id)
+        node_count = len(self.topic_names)
+        self._maybe_compact((self.prerequisites, node_count), (self.dependents, node_count))
+        return True
+
+    def _recompute_closure(self, changed: int) -> None:
+        """Rebuild the closure index of a topic that lost a prerequisite and of its descendants."""
+        affected = {changed} | self._descendants[changed]
+        # In prerequisite order, so each topic's prerequisites are up to date when it is recomputed
+        pending = {
+            node: sum(1 for prerequisite_id in self.prerequisites.neighbours(node)
+                      if prerequisite_id in affected)
+            for node in affected
+        }
+        ready = [node for node, count in pending.items() if count == 0]
+        while ready:
+            node = ready.pop()
+            ancestors: Set[int] = set()
+            for prerequisite_id in self.prerequisites.neighbours(node):
+                ancestors.add(prerequisite_id)
+                ancestors |= self._ancestors[prerequisite_id]
+            for lost in self._ancestors[node] - ancestors:
+                self._descendants[lost].discard(node)
+            self._ancestors[node] = ancestors
+            for dependent_id in self.dependents.neighbours(node):
+                if dependent_id in pending:
+                    pending[dependent_id] -= 1
+                    if pending[dependent_id] == 0:
+                        ready.append(dependent_id)
+
+    def assign_point(self, topic_id: int, point_id: int) -> bool:
+        """Assign a learning point to a topic; returns False if already assigned."""
+        if not self.topic_points.add(topic_id, point_id):
+            return False
+        self.point_topics.add(point_id, topic_id)
+        self._maybe_compact(
+            (self.topic_points, len(self.topic_names)),
+            (self.point_topics, len(self.point_names))
+        )
+        return True
+
+    def unassign_point(self, topic_id: int, point_id: int) -> bool:
+        """Remove a learning point from a topic; returns False if it was not assigned."""
+        if not self.topic_points.remove(topic_id, point_id):
+            return False
+        self.point_topics.remove(point_id, topic_id)
+        self._maybe_compact(
+            (self.topic_points, len(self.topic_names)),
+            (self.point_topics, len(self.point_names))
+        )
+        return True
+
+    def remove_topic(self, topic_id: int) -> None:
+        """Remove a topic and every edge touching it; its id is not reused."""
+        for prerequisite_id in list(self.prerequisites.neighbours(topic_id)):
+            self.remove_prerequisite(topic_id, prerequisite_id)
+        for dependent_id in list(self.dependents.neighbours(topic_id)):
+            self.remove_prerequisite(dependent_id, topic_id)
+        for point_id in list(self.topic_points.neighbours(topic_id)):
+            self.unassign_point(topic_id, point_id)
+        del self.topic_ids[self.topic_names[topic_id]]
+        self.topic_names[topic_id] = None
+        self._invalidate()
+
+    def compact(self) -> None:
+        """Merge every staged edge edit into the CSR arrays."""
+        topic_count = len(self.topic_names)
+        point_count = len(self.point_names)
+        self.prerequisites.compact(topic_count)
+        self.dependents.compact(topic_count)
+        self.topic_points.compact(topic_count)
+        self.point_topics.compact(point_count)
+
+    def _closure_index(self) -> Tuple[List[Set[int]], List[Set[int]]]:
+        """The ancestor and descendant index, built in one topological pass if missing."""
+        if self._ancestors is None:
+            node_count = len(self.topic_names)
+            ancestors: List[Set[int]] = [set() for _ in range(node_count)]
+            descendants: List[Set[int]] = [set() for _ in range(node_count)]
+            for topic_id in self.topological_order():
+                closure = ancestors[topic_id]
+                for prerequisite_id in self.prerequisites.neighbours(topic_id):
+                    closure.add(prerequisite_id)
+                    closure |= ancestors[prerequisite_id]
+                for ancestor_id in closure:
+                    descendants[ancestor_id].add(topic_id)
+            self._ancestors, self._descendants = ancestors, descendants
+        return self._ancestors, self._descendants
+
+    def ancestors(self, topic_id: int) -> Set[int]:
+        """Ids of every transitive prerequisite of a topic."""
+        return set(self._closure_index()[0][topic_id])
+
+    def descendants(self, topic_id: int) -> Set[int]:
+        """Ids of every topic transitively requiring a topic."""
+        return set(self._closure_index()[1][topic_id])
+
+    def reaches(self, topic_id: int, prerequisite_id: int) -> bool:
+        """Whether prerequisite_id is a transitive prerequisite of topic_id."""
+        return prerequisite_id in self._closure_index()[0][topic_id]
+
+    def topological_order(self) -> array:
+        """Topic ids in study order; ties are broken by insertion order."""
+        if self._order is None:
+            node_count = len(self.topic_names)
+            remaining = array("i", bytes(4 * node_count))
+            ready = []
+            for topic_id in range(node_count):
+                if self.topic_names[topic_id] is None:
+                    continue
+                remaining[topic_id] = sum(1 for _ in self.prerequisites.neighbours(topic_id))
+                if remaining[topic_id] == 0:
+                    ready.append(topic_id)
+            heapq.heapify(ready)
+            order = array("i")
+            while ready:
+                topic_id = heapq.heappop(ready)
+                order.append(topic_id)
+                for dependent_id in self.dependents.neighbours(topic_id):
+                    remaining[dependent_id] -= 1
+                    if remaining[dependent_id] == 0:
+                        heapq.heappush(ready, dependent_id)
+            position = array("i", bytes(4 * node_count))
+            for index, topic_id in enumerate(order):
+                position[topic_id] = index
+            self._order = order
+            self._position = position
+        return self._order
+
+    def learning_path(self, topic_id: int, completed: Iterable[int] = ()) -> List[int]:
+        """Ids of the missing transitive prerequisites of a topic, in study order."""
+        path = self._path_cache.get(topic_id)
+        if path is None:
+            self.topological_order()
+            path = array("i", sorted(self._closure_index()[0][topic_id], key=self._position.__getitem__))
+            self._path_cache[topic_id] = path
+        completed = set(completed)
+        if not completed:
+            return list(path)
+        members = set(path)
+        ancestors = self._closure_index()[0]
+        satisfied: Set[int] = set()
+        for done in completed:
+            if done in members and done not in satisfied:
+                satisfied.add(done)
+                satisfied |= ancestors[done]
+        return [node for node in path if node not in satisfied]
+
+    def live_topic_ids(self) -> Iterator[int]:
+        """Iterate the ids of topics that have not been removed, in insertion order."""
+        return iter(self.topic_ids.values())
@@ -0,0 +1,227 @@
+"""
+Bulk import and export of curricula.
+
+Two formats are supported:
+
+- JSONL: one record per line, streamed in a single pass with memory bounded
+  by the curriculum being built (never by the file). Records are
+
+      {"type": "topic", "name": ..., "description": ...}
+      {"type": "learning_point", "name": ..., "description": ...}
+      {"type": "prerequisite", "topic": ..., "prerequisite": ...}
+      {"type": "assignment", "topic": ..., "learning_point": ...}
+
+  Edges may reference names before their records appear; such topics and
+  learning points are created with an empty description that a later
+  record fills in.
+
+- Binary snapshot: the interned names and CSR arrays of a CurriculumGraph
+  written back to back. Loading memory-maps the file, so the edge arrays
+  are shared with the page cache instead of being parsed.
+"""
+import json
+import mmap
+import struct
+from array import array
+from typing import IO, Iterator, Dict, Any, Union
+from .curriculum import Curriculum
+from .curriculum_graph import Adjacency, CurriculumGraph
+from .compact_curriculum import CompactCurriculum
+
+AnyCurriculum = Union[Curriculum, CompactCurriculum]
+
+SNAPSHOT_MAGIC = b"CURRSNP1"
+_BYTE_ORDER_MARK = 0x01020304
+# magic, byte order mark, topic count, point count, 4 x (offsets, targets) lengths,
+# padding, 4 x string blob lengths; arrays are int32 in native byte order and
+# start 8-byte aligned right after the header
+_HEADER = struct.Struct("=8sIII8I4x4Q")
+_RELATIONS = ("prerequisites", "dependents", "topic_points", "point_topics")
+
+
+def iter_records(curriculum: AnyCurriculum) -> Iterator[Dict[str, Any]]:
+    """Yield the JSONL records describing a curriculum: nodes first, then edges."""
+    for name, topic in curriculum.topics.items():
+        yield {"type": "topic", "name": name, "description": topic.description}
+    for name, learning_point in curriculum.learning_points.items():
+        yield {"type": "learning_point", "name": name, "description": learning_point.description}
+    for name, topic in curriculum.topics.items():
+        for prerequisite in topic.get_prerequisites():
+            yield {"type": "prerequisite", "topic": name, "prerequisite": prerequisite}
+        for learning_point in topic.get_learning_points():
+            yield {"type": "assignment", "topic": name, "learning_point": learning_point.name}
+
+
+def export_jsonl(curriculum: AnyCurriculum, file: Union[str, IO[str]]) -> int:
+    """
+    Write a curriculum as JSONL.
+
+    Args:
+        curriculum: Curriculum or CompactCurriculum to export
+        file: Path or text file object to write to
+
+    Returns:
+        Number of records written
+    """
+    if isinstance(file, str):
+        with open(file, "w", encoding="utf-8") as handle:
+            return export_jsonl(curriculum, handle)
+    count = 0
+    for record in iter_records(curriculum):
+        file.write(json.dumps(record, ensure_ascii=False))
+        file.write("\n")
+        count += 1
+    return count
+
+
+def import_jsonl(file: Union[str, IO[str]], curriculum: AnyCurriculum = None) -> AnyCurriculum:
+    """
+    Load JSONL records into a curriculum in a single streaming pass.
+
+    Args:
+        file: Path or text file object to read from
+        curriculum: Curriculum to load into (defaults to a new Curriculum);
+                    pass a CompactCurriculum for large catalogs
+
+    Returns:
+        The populated curriculum
+
+    Raises:
+        ValueError: If a line is not a valid record, or a prerequisite would
+                    create a cycle
+    """
+    if isinstance(file, str):
+        with open(file, "r", encoding="utf-8") as handle:
+            return import_jsonl(handle, curriculum)
+    if curriculum is None:
+        curriculum = Curriculum()
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            kind = record["type"]
+            if kind == "topic":
+                _set_description(curriculum.add_topic(record["name"]), record.get("description", ""))
+            elif kind == "learning_point":
+                _set_description(
+                    curriculum.add_learning_point(record["name"], record.get("description", "")),
+                    record.get("description", "")
+                )
+            elif kind == "prerequisite":
+                curriculum.add_topic(record["topic"])
+                curriculum.add_topic(record["prerequisite"])
+                curriculum.assign_prerequisite(record["topic"], record["prerequisite"])
+            elif kind == "assignment":
+                curriculum.add_topic(record["topic"])
+                curriculum.add_learning_point(record["learning_point"], "")
+                curriculum.assign_learning_point_to_topic(record["learning_point"], record["topic"])
+            else:
+                raise ValueError(f"unknown record type {kind!r}")
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid curriculum record on line {line_number}: {e}") from e
+    return curriculum
+
+
+def _set_description(node, description: str) -> None:
+    # Nodes created implicitly by an earlier edge record have no description yet
+    if description and not node.description:
+        node.description = description
+
+
+def _compacted_graph(curriculum: Union[AnyCurriculum, CurriculumGraph]) -> CurriculumGraph:
+    """Return a compacted graph without removed topics for a curriculum."""
+    if isinstance(curriculum, Curriculum):
+        return CompactCurriculum.from_curriculum(curriculum).graph
+    graph = curriculum.graph if isinstance(curriculum, CompactCurriculum) else curriculum
+    if len(graph.topic_ids) != len(graph.topic_names):
+        # Removed topics leave gaps in the id space; rebuild with dense ids
+        return CompactCurriculum.from_curriculum(CompactCurriculum(graph)).graph
+    graph.compact()
+    return graph
+
+
+def _string_blob(strings) -> bytes:
+    for string in strings:
+        if "\0" in string:
+            raise ValueError(f"Cannot snapshot a name or description containing NUL: {string!r}")
+    return "\0".join(strings).encode("utf-8")
+
+
+def save_snapshot(curriculum: Union[AnyCurriculum, CurriculumGraph], path: str) -> None:
+    """
+    Write a binary snapshot of a curriculum.
+
+    Raises:
+        ValueError: If a name or description contains a NUL character
+    """
+    graph = _compacted_graph(curriculum)
+    relations = [getattr(graph, name) for name in _RELATIONS]
+    blobs = [
+        _string_blob(graph.topic_names),
+        _string_blob(graph.topic_descriptions),
+        _string_blob(graph.point_names),
+        _string_blob(graph.point_descriptions),
+    ]
+    lengths = []
+    for relation in relations:
+        lengths.extend([len(relation.offsets), len(relation.targets)])
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, _BYTE_ORDER_MARK, len(graph.topic_names), len(graph.point_names),
+        *lengths, *(len(blob) for blob in blobs)
+    )
+    with open(path, "wb") as handle:
+        handle.write(header)
+        for relation in relations:
+            for values in (relation.offsets, relation.targets):
+                handle.write(array("i", values).tobytes())
+        for blob in blobs:
+            handle.write(blob)
+
+
+def load_snapshot(path: str) -> CompactCurriculum:
+    """
+    Load a binary snapshot written by save_snapshot.
+
+    The CSR arrays are zero-copy views of a read-only memory map; they are
+    replaced by in-memory arrays the first time an edited relation is
+    compacted.
+
+    Raises:
+        ValueError: If the file is not a snapshot or was written on a
+                    machine with a different byte order
+    """
+    with open(path, "rb") as handle:
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < _HEADER.size:
+        raise ValueError(f"{path} is not a curriculum snapshot")
+    fields = _HEADER.unpack_from(mapped)
+    magic, byte_order_mark, topic_count, point_count = fields[:4]
+    lengths, blob_lengths = fields[4:12], fields[12:]
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a curriculum snapshot")
+    if byte_order_mark != _BYTE_ORDER_MARK:
+        raise ValueError(f"{path} was written with a different byte order")
+    if _HEADER.size + 4 * sum(lengths) + sum(blob_lengths) != len(mapped):
+        raise ValueError(f"{path} is truncated or corrupt")
+
+    view = memoryview(mapped)
+    position = _HEADER.size
+    graph = CurriculumGraph()
+    for index, name in enumerate(_RELATIONS):
+        arrays = []
+        for length in lengths[2 * index:2 * index + 2]:
+            size = 4 * length
+            arrays.append(view[position:position + size].cast("i"))
+            position += size
+        setattr(graph, name, Adjacency(*arrays))
+
+    strings = []
+    for length, count in zip(blob_lengths, (topic_count, topic_count, point_count, point_count)):
+        blob = str(view[position:position + length], "utf-8")
+        position += length
+        strings.append(blob.split("\0") if count else [])
+    graph.topic_names, graph.topic_descriptions, graph.point_names, graph.point_descriptions = strings
+    graph.topic_ids = {name: topic_id for topic_id, name in enumerate(graph.topic_names)}
+    graph.point_ids = {name: point_id for point_id, name in enumerate(graph.point_names)}
+    return CompactCurriculum(graph)
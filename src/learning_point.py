@@ -1,6 +1,9 @@
-from typing import List, Set
+from typing import AbstractSet, Set
+from .views import SetView
 
 class LearningPoint:
+    __slots__ = ("name", "description", "topics")
+
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
@@ -14,9 +17,18 @@ class LearningPoint:
         """Remove a topic from this learning point."""
         self.topics.discard(topic)
         
-    def get_topics(self) -> Set[str]:
-        """Get all topics associated with this learning point."""
-        return self.topics.copy()
+    def get_topics(self) -> AbstractSet[str]:
+        """Get a read-only view of all topics associated with this learning point."""
+        return SetView(self.topics)
+
+    def __eq__(self, other) -> bool:
+        # Learning points are identified by name, as in Curriculum.learning_points
+        if isinstance(other, LearningPoint):
+            return self.name == other.name
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.name)
         
     def __str__(self) -> str:
         return f"LearningPoint(name='{self.name}', topics={self.topics})"
@@ -0,0 +1,17 @@
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from .grading_result import GradingResult
+
+@dataclass
+class BatchGradingResult:
+    """Represents the results of grading a batch of answers."""
+    results: List[Optional[GradingResult]]  # Aligned with the requests; None where grading failed
+    errors: Dict[int, Exception] = field(default_factory=dict)  # Request index -> error
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether every request was graded without error."""
+        return not self.errors
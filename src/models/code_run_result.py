@@ -0,0 +1,15 @@
+from typing import Dict, Optional
+from dataclasses import dataclass, field
+
+@dataclass
+class CodeRunResult:
+    """Represents the outcome of running a code submission against its test cases."""
+    total: int  # Number of test cases
+    passed: int = 0  # Number of test cases that passed
+    failures: Dict[int, str] = field(default_factory=dict)  # Test index -> why it failed
+    error: Optional[str] = None  # Why the run as a whole failed (syntax error, timeout, crash)
+
+    @property
+    def pass_rate(self) -> float:
+        """Fraction of test cases passed (0 when there are none)."""
+        return self.passed / self.total if self.total else 0.0
@@ -10,7 +10,10 @@ class Exercise:
     difficulty_level: Optional[str] = None  # e.g., "beginner", "intermediate", "advanced"
     exercise_type: Optional[str] = None  # e.g., "multiple_choice", "open_ended", "coding"
     related_learning_points: List[str] = None
+    test_cases: List[str] = None  # Coding exercises: assert statements a correct solution passes
 
     def __post_init__(self):
         if self.related_learning_points is None:
             self.related_learning_points = []
+        if self.test_cases is None:
+            self.test_cases = []
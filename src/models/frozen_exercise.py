@@ -0,0 +1,49 @@
+import sys
+from typing import Optional, Tuple
+from dataclasses import dataclass
+from .exercise import Exercise
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+@dataclass(frozen=True, slots=True)
+class FrozenExercise:
+    """Immutable, slotted counterpart of Exercise for holding exercises in bulk."""
+    question: str
+    expected_answer: Optional[str] = None
+    explanation: Optional[str] = None
+    difficulty_level: Optional[str] = None  # Interned; shared by all exercises of a level
+    exercise_type: Optional[str] = None  # Interned; shared by all exercises of a type
+    related_learning_points: Tuple[str, ...] = ()  # Interned learning point names
+    test_cases: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, "difficulty_level", _intern(self.difficulty_level))
+        object.__setattr__(self, "exercise_type", _intern(self.exercise_type))
+        object.__setattr__(self, "related_learning_points", tuple(
+            sys.intern(name) for name in self.related_learning_points or ()
+        ))
+        object.__setattr__(self, "test_cases", tuple(self.test_cases or ()))
+
+    @classmethod
+    def from_exercise(cls, exercise: Exercise) -> "FrozenExercise":
+        return cls(
+            question=exercise.question,
+            expected_answer=exercise.expected_answer,
+            explanation=exercise.explanation,
+            difficulty_level=exercise.difficulty_level,
+            exercise_type=exercise.exercise_type,
+            related_learning_points=tuple(exercise.related_learning_points),
+            test_cases=tuple(exercise.test_cases)
+        )
+
+    def to_exercise(self) -> Exercise:
+        return Exercise(
+            question=self.question,
+            expected_answer=self.expected_answer,
+            explanation=self.explanation,
+            difficulty_level=self.difficulty_level,
+            exercise_type=self.exercise_type,
+            related_learning_points=list(self.related_learning_points),
+            test_cases=list(self.test_cases)
+        )
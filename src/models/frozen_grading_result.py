@@ -0,0 +1,56 @@
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+from dataclasses import dataclass, field
+from .grading_result import GradingResult
+
+def _intern_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    # Keys and short string values (e.g. mastery_level) repeat across millions of results
+    return {
+        _intern_short(key): _intern_short(value) for key, value in metadata.items()
+    }
+
+def _intern_short(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) and len(value) <= 32 else value
+
+@dataclass(frozen=True, slots=True)
+class FrozenGradingResult:
+    """
+    Immutable, slotted counterpart of GradingResult for holding results in bulk.
+
+    metadata is stored as a read-only mapping. It takes part in equality but
+    not in the hash (its values are often lists), so results hash on score,
+    feedback and confidence, and equal results still hash equally.
+    """
+    score: float  # Score between 0 and 100
+    feedback: str  # Detailed feedback for the student
+    metadata: Mapping[str, Any] = field(default_factory=dict, hash=False)  # Read-only view
+    confidence: float = 1.0  # LLM's confidence in its grading (0-1)
+
+    def __post_init__(self):
+        if not 0 <= self.score <= 100:
+            raise ValueError("Score must be between 0 and 100")
+        if not 0 <= self.confidence <= 1:
+            raise ValueError("Confidence must be between 0 and 1")
+        object.__setattr__(self, "metadata", MappingProxyType(_intern_metadata(self.metadata or {})))
+
+    def __reduce__(self):
+        # Mapping proxies cannot be pickled; rebuild from a plain dict
+        return (type(self), (self.score, self.feedback, dict(self.metadata), self.confidence))
+
+    @classmethod
+    def from_grading_result(cls, result: GradingResult) -> "FrozenGradingResult":
+        return cls(
+            score=result.score,
+            feedback=result.feedback,
+            metadata=result.metadata,
+            confidence=result.confidence
+        )
+
+    def to_grading_result(self) -> GradingResult:
+        return GradingResult(
+            score=self.score,
+            feedback=self.feedback,
+            metadata=dict(self.metadata),
+            confidence=self.confidence
+        )
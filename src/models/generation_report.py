@@ -0,0 +1,21 @@
+from typing import Dict, List
+from dataclasses import dataclass, field
+from .exercise import Exercise
+
+@dataclass
+class ExerciseGenerationReport:
+    """Represents the outcome of generating exercises for several learning points."""
+    exercises_by_point: List[List[Exercise]]  # One entry per learning point, in input order
+    failures: Dict[int, Exception] = field(default_factory=dict)  # Learning point index -> error
+    duplicates_rejected: int = 0  # Generated exercises dropped as near duplicates of earlier ones
+    served_from_bank: int = 0  # Exercises taken from the exercise bank instead of generated
+
+    @property
+    def exercises(self) -> List[Exercise]:
+        """All generated exercises, in learning-point order."""
+        return [exercise for point_exercises in self.exercises_by_point for exercise in point_exercises]
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether every learning point was generated without error."""
+        return not self.failures
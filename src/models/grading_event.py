@@ -0,0 +1,16 @@
+from typing import Optional
+from dataclasses import dataclass
+from .grading_result import GradingResult
+
+@dataclass
+class GradingEvent:
+    """An incremental update from a streamed grading."""
+    kind: str  # "score", "feedback" or "result"
+    score: Optional[float] = None  # Set on "score" and "result" events
+    confidence: Optional[float] = None  # Set on "score" events when known, and on "result" events
+    text: str = ""  # New feedback text on "feedback" events
+    result: Optional[GradingResult] = None  # The complete grade on the final "result" event
+
+    def __post_init__(self):
+        if self.kind not in ("score", "feedback", "result"):
+            raise ValueError(f"Unknown grading event kind: {self.kind}")
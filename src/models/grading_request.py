@@ -0,0 +1,14 @@
+from typing import Dict, Any, Optional
+from dataclasses import dataclass
+
+@dataclass
+class GradingRequest:
+    """Represents a single student answer submitted for grading."""
+    problem: str  # The question or problem statement
+    student_answer: str  # The student's answer to grade
+    expected_answer: Optional[str] = None  # The expected or model answer
+    metadata: Dict[str, Any] = None  # Additional grading context (topic, difficulty, ...)
+
+    def __post_init__(self):
+        if self.metadata is None:
+            self.metadata = {}
@@ -0,0 +1,343 @@
+"""
+Offline bulk grading through provider batch jobs.
+
+Grading requests are written as JSONL in the OpenAI Batch API format (one
+chat completion request per line, identified by custom_id), submitted as
+batch jobs, polled until they finish, and their output lines are parsed back
+into GradingResults.
+
+All progress lives in a work directory: the input files, a state file with
+each job's id and status, and the results collected so far. A BatchGradingJob
+created on the same directory picks up where a previous one stopped, so an
+overnight run survives restarts without resubmitting or re-paying for work.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from typing import Any, Callable, Dict, List, Optional
+from ..models.grading_result import GradingResult
+from ..models.grading_request import GradingRequest
+from ..models.batch_grading_result import BatchGradingResult
+
+COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+# Batch job statuses after which a job's output no longer changes
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchJobError(Exception):
+    """Raised for, or recorded against, requests a batch job did not grade."""
+
+
+class BatchBackend(ABC):
+    """Abstract base class for services that run batch jobs from JSONL files."""
+
+    @abstractmethod
+    async def submit(self, input_path: str) -> str:
+        """Start a batch job for a JSONL input file and return its id."""
+        pass
+
+    @abstractmethod
+    async def status(self, job_id: str) -> str:
+        """Current status of a job ("validating", "in_progress", "completed", "failed", ...)."""
+        pass
+
+    @abstractmethod
+    async def output_lines(self, job_id: str) -> List[Dict[str, Any]]:
+        """Output and error lines of a finished job, in the provider's output format."""
+        pass
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Runs batch jobs with the OpenAI Batch API."""
+
+    def __init__(self, client, completion_window: str = "24h"):
+        """
+        Args:
+            client: AsyncOpenAI client (e.g. OpenAIService(...).client)
+            completion_window: Time the provider has to finish a job
+        """
+        self.client = client
+        self.completion_window = completion_window
+
+    async def submit(self, input_path: str) -> str:
+        with open(input_path, "rb") as handle:
+            input_file = await self.client.files.create(file=handle, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=COMPLETIONS_ENDPOINT,
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    async def status(self, job_id: str) -> str:
+        return (await self.client.batches.retrieve(job_id)).status
+
+    async def output_lines(self, job_id: str) -> List[Dict[str, Any]]:
+        batch = await self.client.batches.retrieve(job_id)
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await self.client.files.content(file_id)
+                lines.extend(json.loads(line) for line in content.text.splitlines() if line.strip())
+        return lines
+
+
+def _mock_response(body: Dict[str, Any]) -> str:
+    return json.dumps({
+        "score": 75.0,
+        "feedback": "Mock grading feedback",
+        "metadata": {"mastery_level": "intermediate", "confidence": 1.0}
+    })
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for a batch API, for tests and dry runs.
+
+    Jobs are files in directory and complete on their first status check:
+    respond is called with each request body and returns the assistant
+    message content (an exception becomes a failed line).
+    """
+
+    def __init__(self, directory: str, respond: Optional[Callable[[Dict[str, Any]], str]] = None):
+        self.directory = directory
+        self.respond = respond or _mock_response
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.{kind}.jsonl")
+
+    async def submit(self, input_path: str) -> str:
+        job_id = f"batch_local_{uuid.uuid4().hex}"
+        with open(input_path, "rb") as source, open(self._path(job_id, "input"), "wb") as target:
+            target.write(source.read())
+        return job_id
+
+    async def status(self, job_id: str) -> str:
+        if not os.path.exists(self._path(job_id, "input")):
+            raise BatchJobError(f"Unknown batch job: {job_id}")
+        if not os.path.exists(self._path(job_id, "output")):
+            self._process(job_id)
+        return "completed"
+
+    def _process(self, job_id: str) -> None:
+        lines = []
+        with open(self._path(job_id, "input"), "r", encoding="utf-8") as handle:
+            for line in handle:
+                request = json.loads(line)
+                try:
+                    content = self.respond(request["body"])
+                except Exception as e:
+                    response = {"status_code": 500, "body": {"error": {"message": str(e)}}}
+                else:
+                    response = {"status_code": 200, "body": {
+                        "model": request["body"].get("model"),
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]
+                    }}
+                lines.append({"id": f"response_{len(lines)}", "custom_id": request["custom_id"],
+                              "response": response, "error": None})
+        _write_jsonl(self._path(job_id, "output"), lines)
+
+    async def output_lines(self, job_id: str) -> List[Dict[str, Any]]:
+        with open(self._path(job_id, "output"), "r", encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle if line.strip()]
+
+
+def _write_jsonl(path: str, lines: List[Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        for line in lines:
+            handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+
+class BatchGradingJob:
+    """
+    Grades a large list of requests with an OpenAIService's prompts and model
+    through a BatchBackend, with progress saved in work_dir.
+
+    run() does everything; prepare(), submit(), poll() and collect() are the
+    individual steps, for callers that schedule polling themselves.
+    """
+
+    STATE_FILE = "state.json"
+    RESULTS_FILE = "results.jsonl"
+
+    def __init__(self,
+                 service,
+                 backend: BatchBackend,
+                 work_dir: str,
+                 max_requests_per_file: int = 50000,
+                 max_bytes_per_file: int = 190 * 1024 * 1024,
+                 poll_interval: float = 60.0):
+        """
+        Args:
+            service: OpenAIService whose grading prompt, model and response
+                     parsing are used
+            backend: Where batch jobs run
+            work_dir: Directory holding the job's files and progress
+            max_requests_per_file: Requests per batch job (provider limit: 50,000)
+            max_bytes_per_file: Input file size per batch job (provider limit: 200 MB)
+            poll_interval: Seconds between status checks in run()
+        """
+        self.service = service
+        self.backend = backend
+        self.work_dir = work_dir
+        self.max_requests_per_file = max_requests_per_file
+        self.max_bytes_per_file = max_bytes_per_file
+        self.poll_interval = poll_interval
+        os.makedirs(work_dir, exist_ok=True)
+        self.state = self._load_state()
+
+    @property
+    def _state_path(self) -> str:
+        return os.path.join(self.work_dir, self.STATE_FILE)
+
+    @property
+    def _results_path(self) -> str:
+        return os.path.join(self.work_dir, self.RESULTS_FILE)
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self._state_path):
+            return None
+        with open(self._state_path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def _save_state(self) -> None:
+        # Write then rename, so a crash never leaves a half-written state file
+        temporary = self._state_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(self.state, handle, indent=2)
+        os.replace(temporary, self._state_path)
+
+    def _request_line(self, index: int, request: GradingRequest) -> Dict[str, Any]:
+        prompt = self.service._create_grading_prompt(
+            request.problem, request.student_answer, request.expected_answer, request.metadata
+        )
+        return {
+            "custom_id": f"request-{index}",
+            "method": "POST",
+            "url": COMPLETIONS_ENDPOINT,
+            "body": {
+                "model": self.service.model,
+                "messages": self.service._grading_messages(prompt),
+                "temperature": self.service.GRADING_TEMPERATURE
+            }
+        }
+
+    def prepare(self, requests: List[GradingRequest]) -> None:
+        """
+        Write the requests as batch input files, unless work_dir already
+        holds this job.
+
+        Raises:
+            ValueError: If work_dir holds a job for different requests
+        """
+        lines = [self._request_line(index, request) for index, request in enumerate(requests)]
+        encoded = [json.dumps(line, ensure_ascii=False) + "\n" for line in lines]
+        digest = hashlib.sha256("".join(encoded).encode("utf-8")).hexdigest()
+        if self.state is not None:
+            if self.state["digest"] != digest:
+                raise ValueError(f"{self.work_dir} holds a batch job for different requests")
+            return
+
+        shards, current, size = [], [], 0
+        for line in encoded:
+            line_size = len(line.encode("utf-8"))
+            if current and (len(current) >= self.max_requests_per_file or size + line_size > self.max_bytes_per_file):
+                shards.append(current)
+                current, size = [], 0
+            current.append(line)
+            size += line_size
+        if current:
+            shards.append(current)
+
+        self.state = {"digest": digest, "request_count": len(requests), "shards": []}
+        for number, shard in enumerate(shards):
+            path = os.path.join(self.work_dir, f"input-{number:04d}.jsonl")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.writelines(shard)
+            self.state["shards"].append({"input": path, "job_id": None, "status": None, "collected": False})
+        self._save_state()
+
+    async def submit(self) -> None:
+        """Start a batch job for every input file that does not have one yet."""
+        for shard in self.state["shards"]:
+            if shard["job_id"] is None:
+                shard["job_id"] = await self.backend.submit(shard["input"])
+                shard["status"] = "submitted"
+                self._save_state()
+
+    async def poll(self) -> bool:
+        """
+        Refresh job statuses and collect the output of finished jobs.
+
+        Returns:
+            Whether every job has finished and been collected
+        """
+        for shard in self.state["shards"]:
+            if shard["collected"] or shard["job_id"] is None:
+                continue
+            shard["status"] = await self.backend.status(shard["job_id"])
+            if shard["status"] in TERMINAL_STATUSES:
+                self._store_output(await self.backend.output_lines(shard["job_id"]))
+                shard["collected"] = True
+            self._save_state()
+        return all(shard["collected"] for shard in self.state["shards"])
+
+    def _store_output(self, output_lines: List[Dict[str, Any]]) -> None:
+        with open(self._results_path, "a", encoding="utf-8") as handle:
+            for line in output_lines:
+                try:
+                    result, error = asdict(self._parse_output_line(line)), None
+                except Exception as e:
+                    result, error = None, str(e)
+                handle.write(json.dumps(
+                    {"custom_id": line.get("custom_id"), "result": result, "error": error},
+                    ensure_ascii=False, default=str
+                ) + "\n")
+
+    def _parse_output_line(self, line: Dict[str, Any]) -> GradingResult:
+        if line.get("error"):
+            raise BatchJobError(f"Request failed: {line['error']}")
+        response = line.get("response") or {}
+        if response.get("status_code") != 200:
+            raise BatchJobError(f"Request failed with status {response.get('status_code')}: {response.get('body')}")
+        content = response["body"]["choices"][0]["message"]["content"]
+        return self.service._parse_grading_response(content)
+
+    def collect(self) -> BatchGradingResult:
+        """
+        Results collected so far, aligned with the prepared requests.
+
+        Requests without a result (not finished, failed, or missing from a
+        failed or expired job's output) are None with an error.
+        """
+        stored: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self._results_path):
+            with open(self._results_path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        stored[entry["custom_id"]] = entry
+
+        batch = BatchGradingResult(results=[])
+        for index in range(self.state["request_count"]):
+            entry = stored.get(f"request-{index}")
+            if entry is not None and entry["result"] is not None:
+                batch.results.append(GradingResult(**entry["result"]))
+                continue
+            batch.results.append(None)
+            message = entry["error"] if entry is not None else "No result from the batch job"
+            batch.errors[index] = BatchJobError(message)
+        return batch
+
+    async def run(self, requests: List[GradingRequest]) -> BatchGradingResult:
+        """Prepare, submit and poll until every job has finished, then collect the results."""
+        self.prepare(requests)
+        await self.submit()
+        while not await self.poll():
+            await asyncio.sleep(self.poll_interval)
+        return self.collect()
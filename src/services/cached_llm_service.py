@@ -0,0 +1,111 @@
+from typing import List, Dict, Any, Optional
+from .llm_service import LLMService
+from .grading_cache import GradingCache, LRUGradingCache, CacheStats
+from .request_keys import grading_key
+from ..models.exercise import Exercise
+from ..models.grading_result import GradingResult
+from ..models.grading_request import GradingRequest
+from ..models.batch_grading_result import BatchGradingResult
+from ..learning_point import LearningPoint
+
+class CachedLLMService(LLMService):
+    """LLM service wrapper that caches grading results of another service."""
+
+    def __init__(self,
+                 llm_service: LLMService,
+                 cache: GradingCache = None,
+                 case_sensitive: bool = False):
+        """
+        Args:
+            llm_service: The service whose grades are cached
+            cache: Cache backend (defaults to an in-memory LRUGradingCache)
+            case_sensitive: Whether answers differing only in case are graded separately
+        """
+        self.llm_service = llm_service
+        self.cache = cache if cache is not None else LRUGradingCache()
+        self.case_sensitive = case_sensitive
+
+    @property
+    def stats(self) -> CacheStats:
+        """Hit and miss counters of the underlying cache."""
+        return self.cache.stats
+
+    def _key(self,
+             problem: str,
+             student_answer: str,
+             expected_answer: str = None,
+             metadata: Dict[str, Any] = None) -> str:
+        return grading_key(
+            problem, student_answer, expected_answer, metadata,
+            model=getattr(self.llm_service, "model", None),
+            case_sensitive=self.case_sensitive
+        )
+
+    @staticmethod
+    def _is_cacheable(result: GradingResult) -> bool:
+        # Fallback results for failed calls carry an "error" entry and must be retried
+        return not result.metadata.get("error")
+
+    async def generate_exercises(self,
+                               learning_points: List[LearningPoint],
+                               count: int = 1,
+                               difficulty: str = "intermediate",
+                               exercise_type: str = "open_ended") -> List[Exercise]:
+        """Generation is not cached; delegates to the wrapped service."""
+        return await self.llm_service.generate_exercises(
+            learning_points, count, difficulty, exercise_type
+        )
+
+    async def grade_answer(self,
+                          problem: str,
+                          student_answer: str,
+                          expected_answer: str = None,
+                          metadata: Dict[str, Any] = None) -> GradingResult:
+        """Return a cached grade if available, otherwise grade and cache the result."""
+        key = self._key(problem, student_answer, expected_answer, metadata)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = await self.llm_service.grade_answer(
+            problem, student_answer, expected_answer, metadata
+        )
+        if self._is_cacheable(result):
+            self.cache.set(key, result)
+        return result
+
+    async def grade_answers(self,
+                           requests: List[GradingRequest],
+                           max_concurrency: Optional[int] = None,
+                           timeout: Optional[float] = None) -> BatchGradingResult:
+        """Serve cached grades and forward only the misses, as one batch, to the wrapped service."""
+        keys = [
+            self._key(request.problem, request.student_answer,
+                      request.expected_answer, request.metadata)
+            for request in requests
+        ]
+        batch = BatchGradingResult(results=[self.cache.get(key) for key in keys])
+
+        # Identical requests within the batch are only graded once
+        miss_positions: Dict[str, List[int]] = {}
+        for index, (key, result) in enumerate(zip(keys, batch.results)):
+            if result is None:
+                miss_positions.setdefault(key, []).append(index)
+        if not miss_positions:
+            return batch
+
+        miss_keys = list(miss_positions)
+        graded = await self.llm_service.grade_answers(
+            [requests[miss_positions[key][0]] for key in miss_keys],
+            max_concurrency=max_concurrency,
+            timeout=timeout
+        )
+        for miss_index, key in enumerate(miss_keys):
+            result = graded.results[miss_index]
+            for index in miss_positions[key]:
+                if result is None:
+                    batch.errors[index] = graded.errors[miss_index]
+                else:
+                    batch.results[index] = result
+            if result is not None and self._is_cacheable(result):
+                self.cache.set(key, result)
+        return batch
@@ -0,0 +1,116 @@
+"""
+Process-wide registry of AsyncOpenAI clients.
+
+Services built with share_client=True and the same API key and base URL
+share one client and so one HTTP connection pool, keeping TLS connections
+warm across service instances. Clients are reference counted and closed when
+the last service using them is closed.
+
+Like any pooled HTTP client, a shared client must be used from a single event loop,
+which is why sharing is opt-in.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DEFAULT_CONNECTION_LIMITS, Timeout
+
+# The SDK's HTTP library's Limits class, whichever library the SDK is built on
+_Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+@dataclass(frozen=True)
+class HTTPClientOptions:
+    """Connection pool and timeout settings for an API client."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    http2: bool = False  # Requires the h2 package
+    timeout: Optional[float] = None  # Read, write and pool timeout in seconds (None: the SDK default)
+    connect_timeout: float = 5.0  # Used only with timeout
+
+    def build_http_client(self) -> Any:
+        """An HTTP client for AsyncOpenAI, built with the SDK's defaults for anything not set here."""
+        kwargs: Dict[str, Any] = {
+            "limits": _Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            "http2": self.http2,
+        }
+        if self.timeout is not None:
+            kwargs["timeout"] = Timeout(self.timeout, connect=self.connect_timeout)
+        return DefaultAsyncHttpxClient(**kwargs)
+
+
+@dataclass
+class _SharedClient:
+    client: AsyncOpenAI
+    options: HTTPClientOptions
+    references: int = 0
+
+
+_clients: Dict[Tuple[str, Optional[str]], _SharedClient] = {}
+
+
+def create_client(api_key: str,
+                  base_url: Optional[str] = None,
+                  options: Optional[HTTPClientOptions] = None) -> AsyncOpenAI:
+    """
+    Create an unshared client with the given pool settings.
+
+    The client's own retries are disabled; OpenAIService retries through
+    its RequestScheduler.
+    """
+    options = options or HTTPClientOptions()
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=0,
+        http_client=options.build_http_client()
+    )
+
+
+def acquire_client(api_key: str,
+                   base_url: Optional[str] = None,
+                   options: Optional[HTTPClientOptions] = None) -> AsyncOpenAI:
+    """
+    Get the shared client for an API key and base URL, creating it if needed.
+
+    Every call must be paired with release_client.
+
+    Raises:
+        ValueError: If the client is already shared with different options
+    """
+    options = options or HTTPClientOptions()
+    key = (api_key, base_url)
+    shared = _clients.get(key)
+    if shared is None:
+        shared = _SharedClient(create_client(api_key, base_url, options), options)
+        _clients[key] = shared
+    elif shared.options != options:
+        raise ValueError(
+            "A client for this API key and base URL is already shared with different HTTP options"
+        )
+    shared.references += 1
+    return shared.client
+
+
+async def release_client(client: AsyncOpenAI) -> None:
+    """Release a client from acquire_client, closing it once no service uses it."""
+    for key, shared in list(_clients.items()):
+        if shared.client is client:
+            shared.references -= 1
+            if shared.references <= 0:
+                del _clients[key]
+                await client.close()
+            return
+
+
+async def close_all_clients() -> None:
+    """Close every shared client, e.g. at application shutdown."""
+    while _clients:
+        _, shared = _clients.popitem()
+        await shared.client.close()
+
+
+def shared_client_count() -> int:
+    return len(_clients)
@@ -0,0 +1,67 @@
+import asyncio
+import copy
+from typing import List, Dict, Any, Awaitable, Callable
+from .llm_service import LLMService
+from .request_keys import grading_key, generation_key
+from ..models.exercise import Exercise
+from ..models.grading_result import GradingResult
+from ..learning_point import LearningPoint
+
+class CoalescingLLMService(LLMService):
+    """
+    LLM service wrapper that coalesces identical concurrent requests.
+
+    While a request is in flight, later callers with identical arguments
+    await the same underlying call instead of issuing a duplicate. Each
+    caller receives its own copy of the result.
+    """
+
+    def __init__(self, llm_service: LLMService, case_sensitive: bool = True):
+        """
+        Args:
+            llm_service: The service whose calls are coalesced
+            case_sensitive: Whether grading requests differing only in case are distinct
+        """
+        self.llm_service = llm_service
+        self.case_sensitive = case_sensitive
+        self.coalesced = 0  # Number of calls served by another caller's request
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def _single_flight(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shield so a cancelled caller does not cancel the call other callers await
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    async def generate_exercises(self,
+                               learning_points: List[LearningPoint],
+                               count: int = 1,
+                               difficulty: str = "intermediate",
+                               exercise_type: str = "open_ended") -> List[Exercise]:
+        key = "generate:" + generation_key(
+            learning_points, count, difficulty, exercise_type,
+            model=getattr(self.llm_service, "model", None)
+        )
+        return await self._single_flight(key, lambda: self.llm_service.generate_exercises(
+            learning_points, count, difficulty, exercise_type
+        ))
+
+    async def grade_answer(self,
+                          problem: str,
+                          student_answer: str,
+                          expected_answer: str = None,
+                          metadata: Dict[str, Any] = None) -> GradingResult:
+        key = "grade:" + grading_key(
+            problem, student_answer, expected_answer, metadata,
+            model=getattr(self.llm_service, "model", None),
+            case_sensitive=self.case_sensitive
+        )
+        return await self._single_flight(key, lambda: self.llm_service.grade_answer(
+            problem, student_answer, expected_answer, metadata
+        ))
@@ -0,0 +1,466 @@
+"""
+Grading of coding exercises by running submissions against their test cases.
+
+Each submission runs in a fresh Python interpreter in isolated mode, with an
+empty temporary working directory, an empty environment, CPU-time and
+address-space limits, and a wall-clock timeout enforced by the parent. At
+most max_workers of these processes run at once.
+
+This contains crashes, runaway loops and memory blowups, and keeps a
+submission from reporting its own test results. It is not an operating
+system sandbox: run it under one (a container or unprivileged user) when
+submissions may be hostile.
+"""
+import asyncio
+import json
+import os
+import re
+import secrets
+import signal
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+from .llm_service import LLMService
+from ..models.code_run_result import CodeRunResult
+from ..models.exercise import Exercise
+from ..models.grading_result import GradingResult
+from ..models.grading_request import GradingRequest
+from ..models.batch_grading_result import BatchGradingResult
+from ..learning_point import LearningPoint
+
+# Runs inside the sandboxed interpreter. Reads the submission, tests and
+# limits as JSON on stdin, runs them, and only then writes a single result
+# record on stdout, prefixed with a nonce so output the submission writes
+# itself is not mistaken for it. Everything the record is built from is
+# captured, and the nonce and output stream are held in a closure, before
+# the submission runs; an audit hook then refuses the ways code could reach
+# them (frame introspection, tracing, gc, signals, ctypes, /proc) or outlive
+# the harness (new processes). A process that exits without the record
+# fails every test.
+_RUNNER = r"""
+def _harness():
+    import io, json, os, sys
+
+    request = json.loads(sys.stdin.read())
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_CPU, (request["cpu_seconds"], request["cpu_seconds"] + 1))
+        if request["memory_bytes"]:
+            resource.setrlimit(resource.RLIMIT_AS, (request["memory_bytes"], request["memory_bytes"]))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    str_, bytes_, type_, isinstance_, enumerate_ = str, bytes, type, isinstance, enumerate
+    exec_, compile_, BaseException_, AssertionError_ = exec, compile, BaseException, AssertionError
+    write, exit_, realpath, fsdecode = os.write, os._exit, os.path.realpath, os.fsdecode
+
+    def make_report(fd, nonce):
+        def report(setup_error, outcomes):
+            fields = [nonce, b"-" if setup_error is None else b"E" + setup_error]
+            fields.extend(b"P" if error is None else b"F" + error for error in outcomes)
+            data = b" ".join(fields) + b"\n"
+            while data:
+                data = data[write(fd, data):]
+            exit_(0)
+        return report
+
+    report = make_report(os.dup(1), str_.encode(request["nonce"], "ascii"))
+    code, tests = request["code"], request["tests"]
+    del request
+
+    def describe(error):
+        try:
+            message = str_(error)
+            if not message and isinstance_(error, AssertionError_):
+                message = "assertion failed"
+            name = type_(error).__name__
+            if not isinstance_(name, str_):
+                name = "Exception"
+            text = str_.join("", [name, ": ", message] if message else [name])[:500]
+        except BaseException_:
+            text = "Exception"
+        return str_.encode(bytes_.hex(str_.encode(text, "utf-8", "replace")), "ascii")
+
+    compiled = []
+    for index, test in enumerate_(tests):
+        try:
+            compiled.append((compile_(test, "<test %d>" % index, "exec"), None))
+        except BaseException_ as error:
+            compiled.append((None, describe(error)))
+    try:
+        submission = compile_(code, "<submission>", "exec")
+    except BaseException_ as error:
+        report(describe(error), [])
+
+    frame_events = frozenset({"sys._getframe", "sys._getframemodulename", "sys._current_frames"})
+    frame_attributes = frozenset({"tb_frame", "gi_frame", "cr_frame", "ag_frame", "f_back"})
+    denied_events = frozenset({
+        "sys.settrace", "sys.setprofile", "gc.get_objects", "gc.get_referrers", "gc.get_referents",
+        "os.system", "os.exec", "os.posix_spawn", "os.spawn", "os.fork", "os.forkpty",
+        "subprocess.Popen", "os.kill", "os.killpg", "signal.pthread_kill",
+    })
+    denied_modules = frozenset({"ctypes", "_ctypes", "signal", "_signal", "_testcapi", "_testinternalcapi"})
+
+    def audit(event, args):
+        if event in frame_events:
+            raise ValueError("frame introspection is not allowed")
+        if event == "object.__getattr__" and args[1] in frame_attributes:
+            raise ValueError("frame introspection is not allowed")
+        if event in denied_events:
+            raise PermissionError(event + " is not allowed")
+        if event == "import" and args[0] in denied_modules:
+            raise ImportError("import of " + args[0] + " is not allowed")
+        if event in ("open", "sqlite3.connect") and isinstance_(args[0], (str_, bytes_)):
+            if str_.startswith(realpath(fsdecode(args[0])), "/proc"):
+                raise PermissionError("access to /proc is not allowed")
+
+    # Signal handlers receive the interrupted frame; drop the preloaded module
+    # so the only way back to it is an import, which the hook refuses
+    sys.modules.pop("_signal", None)
+    sys.modules.pop("signal", None)
+    globals().pop("_harness", None)
+    sys.stdout = sys.stderr = io.StringIO()
+    sys.stdin = io.StringIO()
+    sys.addaudithook(audit)
+
+    namespace = {"__name__": "__submission__"}
+    try:
+        exec_(submission, namespace)
+    except BaseException_ as error:
+        report(describe(error), [])
+    outcomes = []
+    for test, error in compiled:
+        if test is not None:
+            try:
+                exec_(test, namespace)
+            except BaseException_ as raised:
+                error = describe(raised)
+        outcomes.append(error)
+    report(None, outcomes)
+
+_harness()
+"""
+
+_FENCED_CODE = re.compile(r"```[\w+-]*[ \t]*\n(.*?)```", re.DOTALL)
+
+
+def extract_code(answer: str) -> str:
+    """The code in an answer: its fenced code blocks if it has any, otherwise the whole answer."""
+    blocks = _FENCED_CODE.findall(answer or "")
+    return "\n".join(blocks) if blocks else answer or ""
+
+
+def _describe_exit(returncode: int) -> str:
+    if returncode < 0:
+        signal_number = -returncode
+        if signal_number == getattr(signal, "SIGXCPU", None):
+            return "CPU time limit exceeded"
+        try:
+            return f"Killed by {signal.Signals(signal_number).name}"
+        except ValueError:
+            return f"Killed by signal {signal_number}"
+    return f"Exited with status {returncode}"
+
+
+class SandboxedCodeRunner:
+    """Runs Python submissions against assert-statement test cases in limited subprocesses."""
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 timeout: float = 10.0,
+                 cpu_seconds: int = 5,
+                 memory_mb: Optional[int] = 256,
+                 python: str = sys.executable):
+        """
+        Args:
+            max_workers: Maximum number of submissions running at once
+                         (defaults to the number of CPUs)
+            timeout: Wall-clock seconds a submission and all its tests may take
+            cpu_seconds: CPU-time limit for a submission
+            memory_mb: Address-space limit for a submission, or None for no limit
+            python: Interpreter to run submissions with
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if timeout <= 0 or cpu_seconds < 1:
+            raise ValueError("timeout and cpu_seconds must be positive")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.python = python
+        self._slots = asyncio.Semaphore(max_workers)
+
+    async def run(self, code: str, tests: Sequence[str]) -> CodeRunResult:
+        """
+        Run code, then each test in the namespace it defined.
+
+        A test passes when it runs without raising. Results come from one
+        record written after every test has run; if the process ends without
+        it (timed out, killed or exited early), every test counts as failed.
+        """
+        tests = list(tests)
+        nonce = secrets.token_hex(8)
+        payload = json.dumps({
+            "code": code,
+            "tests": tests,
+            "nonce": nonce,
+            "cpu_seconds": self.cpu_seconds,
+            "memory_bytes": self.memory_mb * 1024 * 1024 if self.memory_mb else 0,
+        }).encode("utf-8")
+
+        async with self._slots:
+            with tempfile.TemporaryDirectory() as workdir:
+                process = await asyncio.create_subprocess_exec(
+                    self.python, "-I", "-c", _RUNNER,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                    cwd=workdir,
+                    env={},
+                    start_new_session=True,
+                    limit=2 ** 16 + 4096 * len(tests)  # Room for the record's hex-encoded failures
+                )
+                records: List[List[str]] = []
+                timed_out = False
+                try:
+                    await asyncio.wait_for(self._communicate(process, payload, nonce, records), self.timeout)
+                except asyncio.TimeoutError:
+                    timed_out = True
+                finally:
+                    await self._kill(process)
+
+        return self._result(tests, records, timed_out, process.returncode)
+
+    @staticmethod
+    async def _communicate(process, payload: bytes, nonce: str, records: List[List[str]]) -> None:
+        try:
+            process.stdin.write(payload)
+            await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The process died before reading its input; its exit status says why
+        prefix = nonce.encode("ascii") + b" "
+        while True:
+            try:
+                line = await process.stdout.readline()
+            except ValueError:
+                continue  # An over-long line can only come from the submission
+            if not line:
+                break
+            # The submission may leave a partial line of its own before the record
+            position = line.find(prefix)
+            if position >= 0:
+                records.append(line[position + len(prefix):].decode("ascii", "replace").split())
+        await process.wait()
+
+    @staticmethod
+    async def _kill(process) -> None:
+        if process.returncode is not None:
+            return
+        try:
+            # The process leads its own session; kill anything it started too
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
+    def _result(self,
+                tests: List[str],
+                records: List[List[str]],
+                timed_out: bool,
+                returncode: Optional[int]) -> CodeRunResult:
+        result = CodeRunResult(total=len(tests))
+        record = next((fields for fields in records if self._valid_record(fields, len(tests))), None)
+        if record is None:
+            # No complete record: the submission timed out, crashed or exited early
+            if timed_out:
+                result.error = f"Timed out after {self.timeout:g}s"
+            elif returncode:
+                result.error = _describe_exit(returncode)
+            else:
+                result.error = "Exited before reporting results"
+        elif record[0] != "-":
+            result.error = _decode(record[0][1:])
+        else:
+            for index, outcome in enumerate(record[1:]):
+                if outcome == "P":
+                    result.passed += 1
+                else:
+                    result.failures[index] = _decode(outcome[1:])
+            return result
+        for index in range(len(tests)):
+            result.failures[index] = result.error
+        return result
+
+    @staticmethod
+    def _valid_record(fields: List[str], test_count: int) -> bool:
+        if not fields:
+            return False
+        if fields[0] != "-":
+            return len(fields) == 1 and fields[0].startswith("E")
+        return len(fields) == test_count + 1 and all(
+            field == "P" or field.startswith("F") for field in fields[1:]
+        )
+
+
+def _decode(field: str) -> str:
+    try:
+        return bytes.fromhex(field).decode("utf-8", "replace")
+    except ValueError:
+        return field
+
+
+class CodeGradingService(LLMService):
+    """
+    LLM service wrapper that grades coding answers by running their test cases.
+
+    Requests whose metadata has "test_cases" (assert statements, as on
+    Exercise.test_cases) are scored by the fraction of tests the answer
+    passes. The wrapped service is asked only for feedback text, and only
+    when some tests fail; its score is ignored. Other requests are graded
+    by the wrapped service as usual.
+    """
+
+    def __init__(self,
+                 llm_service: LLMService,
+                 runner: Optional[SandboxedCodeRunner] = None,
+                 llm_feedback: bool = True):
+        """
+        Args:
+            llm_service: Service for feedback text and for answers without test cases
+            runner: Sandbox to run submissions in (defaults to SandboxedCodeRunner())
+            llm_feedback: Ask the wrapped service to explain failing tests; if
+                          False (or it fails), feedback lists the failures
+        """
+        self.llm_service = llm_service
+        self.runner = runner or SandboxedCodeRunner()
+        self.llm_feedback = llm_feedback
+
+    @staticmethod
+    def _test_cases(metadata: Optional[Dict[str, Any]]) -> List[str]:
+        return list((metadata or {}).get("test_cases") or [])
+
+    @staticmethod
+    def _summary(run: CodeRunResult) -> str:
+        if run.total and run.passed == run.total:
+            return f"All {run.total} tests passed."
+        lines = [f"{run.passed} of {run.total} tests passed."]
+        if run.error:
+            lines.append(f"Error: {run.error}")
+        lines.extend(
+            f"Test {index + 1} failed: {failure}"
+            for index, failure in sorted(run.failures.items())
+            if failure != run.error
+        )
+        return "\n".join(lines)
+
+    def _grading_result(self, run: CodeRunResult, feedback: Optional[str] = None) -> GradingResult:
+        metadata = {
+            "grader": "tests",
+            "tests_passed": run.passed,
+            "tests_total": run.total,
+            "test_failures": dict(run.failures),
+        }
+        if run.error:
+            metadata["error"] = run.error
+        return GradingResult(
+            score=100.0 * run.pass_rate,
+            feedback=feedback or self._summary(run),
+            metadata=metadata,
+            confidence=1.0
+        )
+
+    @staticmethod
+    def _llm_feedback(result: Optional[GradingResult]) -> Optional[str]:
+        # Services that report failures as results (OpenAIService with
+        # raise_on_error=False) put the error text in feedback
+        if result is None or result.metadata.get("error"):
+            return None
+        return result.feedback
+
+    def _feedback_request(self, request: GradingRequest, run: CodeRunResult) -> GradingRequest:
+        metadata = {key: value for key, value in request.metadata.items() if key != "test_cases"}
+        metadata["test_results"] = self._summary(run)
+        return GradingRequest(request.problem, request.student_answer, request.expected_answer, metadata)
+
+    async def _run(self, request: GradingRequest) -> CodeRunResult:
+        return await self.runner.run(extract_code(request.student_answer), self._test_cases(request.metadata))
+
+    async def generate_exercises(self,
+                               learning_points: List[LearningPoint],
+                               count: int = 1,
+                               difficulty: str = "intermediate",
+                               exercise_type: str = "open_ended") -> List[Exercise]:
+        """Delegates to the wrapped service."""
+        return await self.llm_service.generate_exercises(
+            learning_points, count, difficulty, exercise_type
+        )
+
+    async def grade_answer(self,
+                          problem: str,
+                          student_answer: str,
+                          expected_answer: str = None,
+                          metadata: Dict[str, Any] = None) -> GradingResult:
+        """Grade by test pass rate when metadata has test cases, otherwise with the wrapped service."""
+        request = GradingRequest(problem, student_answer, expected_answer, metadata)
+        if not self._test_cases(request.metadata):
+            return await self.llm_service.grade_answer(problem, student_answer, expected_answer, metadata)
+        run = await self._run(request)
+        if not self.llm_feedback or run.passed == run.total:
+            return self._grading_result(run)
+        feedback_request = self._feedback_request(request, run)
+        try:
+            feedback = await self.llm_service.grade_answer(
+                feedback_request.problem,
+                feedback_request.student_answer,
+                feedback_request.expected_answer,
+                feedback_request.metadata
+            )
+        except Exception as e:
+            print(f"Error getting feedback for failed tests: {str(e)}")
+            return self._grading_result(run)
+        return self._grading_result(run, self._llm_feedback(feedback))
+
+    async def grade_answers(self,
+                           requests: List[GradingRequest],
+                           max_concurrency: Optional[int] = None,
+                           timeout: Optional[float] = None) -> BatchGradingResult:
+        """
+        Run the test cases of every coding request (bounded by the runner's
+        max_workers), then send the wrapped service one batch holding the
+        requests without test cases and the feedback requests for failed runs.
+        """
+        coding = [index for index, request in enumerate(requests) if self._test_cases(request.metadata)]
+        others = [index for index, request in enumerate(requests) if not self._test_cases(request.metadata)]
+        runs = dict(zip(coding, await asyncio.gather(*(self._run(requests[index]) for index in coding))))
+
+        needs_feedback = [
+            index for index in coding
+            if self.llm_feedback and runs[index].passed < runs[index].total
+        ]
+        forwarded = [requests[index] for index in others]
+        forwarded += [self._feedback_request(requests[index], runs[index]) for index in needs_feedback]
+
+        batch = BatchGradingResult(results=[None] * len(requests))
+        for index in coding:
+            batch.results[index] = self._grading_result(runs[index])
+        if not forwarded:
+            return batch
+
+        graded = await self.llm_service.grade_answers(forwarded, max_concurrency=max_concurrency, timeout=timeout)
+        for position, index in enumerate(others + needs_feedback):
+            if index in runs:
+                if position not in graded.errors:
+                    batch.results[index] = self._grading_result(
+                        runs[index], self._llm_feedback(graded.results[position])
+                    )
+            else:
+                batch.results[index] = graded.results[position]
+                if position in graded.errors:
+                    batch.errors[index] = graded.errors[position]
+        return batch
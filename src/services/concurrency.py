@@ -0,0 +1,44 @@
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Sequence, TypeVar, Union
+
+T = TypeVar("T")
+
+
+async def gather_bounded(factories: Sequence[Callable[[], Awaitable[T]]],
+                         max_concurrency: int,
+                         timeout: Optional[float] = None) -> List[Union[T, Exception]]:
+    """
+    Run coroutine factories with at most max_concurrency in flight.
+
+    Args:
+        factories: Zero-argument callables each returning an awaitable
+        max_concurrency: Maximum number of awaitables running at once
+        timeout: Optional per-call timeout in seconds
+
+    Returns:
+        Results in the same order as factories; a call that raised (or timed
+        out) contributes its exception instead of a result
+
+    Raises:
+        ValueError: If max_concurrency is less than 1
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    results: List[Union[T, Exception]] = [None] * len(factories)
+    next_index = iter(range(len(factories)))
+
+    async def worker() -> None:
+        for index in next_index:
+            try:
+                awaitable = factories[index]()
+                if timeout is not None:
+                    results[index] = await asyncio.wait_for(awaitable, timeout)
+                else:
+                    results[index] = await awaitable
+            except Exception as e:
+                results[index] = e
+
+    workers = min(max_concurrency, len(factories))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return results
@@ -0,0 +1,171 @@
+"""
+A local store of generated exercises, retrievable by learning point similarity.
+
+Each learning point's "name: description" text is embedded once; its
+exercises are attached to that vector. Looking up a learning point returns
+the exercises of the most similar stored learning points, so a point whose
+description closely matches one already covered can be served without
+calling the LLM.
+
+Banks are saved as a single file: a fixed header, the float32 vectors, then
+a JSON blob with the learning point names and exercises. Loading memory-maps
+the file so the vectors are not read into memory up front.
+"""
+import json
+import mmap
+import os
+import struct
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Sequence
+from .vector_index import BruteForceIndex, HashingEmbedder, LSHIndex
+from ..models.exercise import Exercise
+from ..learning_point import LearningPoint
+
+Embedder = Callable[[str], Sequence[float]]
+
+BANK_MAGIC = b"EXBANK01"
+_BYTE_ORDER_MARK = 0x01020304
+# magic, byte order mark, dimension, vector count, metadata length;
+# float32 vectors in native byte order follow the header
+_HEADER = struct.Struct("=8sIIIQ4x")
+
+
+class ExerciseBank:
+    """Exercises indexed by the embedding of the learning point they cover."""
+
+    def __init__(self,
+                 embed: Optional[Embedder] = None,
+                 dim: Optional[int] = None,
+                 approximate: bool = False,
+                 min_similarity: float = 0.85):
+        """
+        Args:
+            embed: Function mapping text to a vector (defaults to HashingEmbedder)
+            dim: Vector dimension (defaults to embed.dim, or 256)
+            approximate: Use an LSH index instead of exact search; worth it
+                         from roughly a hundred thousand learning points
+            min_similarity: Cosine similarity a stored learning point needs
+                            for its exercises to be served
+        """
+        self.embed = embed or HashingEmbedder(dim or 256)
+        self.dim = dim or getattr(self.embed, "dim", 256)
+        self.approximate = approximate
+        self.min_similarity = min_similarity
+        self.index = self._make_index(None)
+        self.point_names: List[str] = []
+        self.point_ids: Dict[str, int] = {}
+        self.exercises: List[List[Exercise]] = []  # Vector id -> exercises for that learning point
+
+    def _make_index(self, vectors):
+        index_class = LSHIndex if self.approximate else BruteForceIndex
+        return index_class(self.dim, vectors)
+
+    @staticmethod
+    def _point_text(learning_point: LearningPoint) -> str:
+        return f"{learning_point.name}: {learning_point.description}"
+
+    def __len__(self) -> int:
+        return sum(len(exercises) for exercises in self.exercises)
+
+    def add(self, learning_point: LearningPoint, exercises: List[Exercise]) -> None:
+        """Store exercises for a learning point, embedding the point on first use."""
+        point_id = self.point_ids.get(learning_point.name)
+        if point_id is None:
+            point_id = self.index.add(self.embed(self._point_text(learning_point)))
+            self.point_ids[learning_point.name] = point_id
+            self.point_names.append(learning_point.name)
+            self.exercises.append([])
+        self.exercises[point_id].extend(exercises)
+
+    def find(self,
+             learning_point: LearningPoint,
+             k: int = 10,
+             difficulty: Optional[str] = None,
+             exercise_type: Optional[str] = None,
+             min_similarity: Optional[float] = None,
+             max_points: int = 5) -> List[Exercise]:
+        """
+        Get up to k stored exercises for a learning point.
+
+        Args:
+            learning_point: The point exercises are wanted for
+            k: Maximum number of exercises to return
+            difficulty: Only return exercises of this difficulty level
+            exercise_type: Only return exercises of this type
+            min_similarity: Override of the bank's similarity threshold
+            max_points: Number of most similar learning points to draw from
+
+        Returns:
+            Exercises from the most similar learning points first
+        """
+        threshold = self.min_similarity if min_similarity is None else min_similarity
+        if k <= 0 or not self.exercises:
+            return []
+        found = []
+        for point_id, similarity in self.index.search(self.embed(self._point_text(learning_point)), max_points):
+            if similarity < threshold:
+                break
+            for exercise in self.exercises[point_id]:
+                if difficulty is not None and exercise.difficulty_level != difficulty:
+                    continue
+                if exercise_type is not None and exercise.exercise_type != exercise_type:
+                    continue
+                found.append(exercise)
+                if len(found) == k:
+                    return found
+        return found
+
+    def save(self, path: str) -> None:
+        """Write the bank to a file that load() can memory-map."""
+        metadata = json.dumps({
+            "points": self.point_names,
+            "exercises": [[asdict(exercise) for exercise in exercises] for exercises in self.exercises],
+        }, ensure_ascii=False).encode("utf-8")
+        # Write then rename: path may be the file this bank's vectors are mapped from
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as handle:
+            handle.write(_HEADER.pack(BANK_MAGIC, _BYTE_ORDER_MARK, self.dim, len(self.point_names), len(metadata)))
+            for buffer in self.index.iter_buffers():
+                handle.write(bytes(buffer))
+            handle.write(metadata)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls,
+             path: str,
+             embed: Optional[Embedder] = None,
+             approximate: bool = False,
+             min_similarity: float = 0.85) -> "ExerciseBank":
+        """
+        Load a bank written by save(), memory-mapping its vectors.
+
+        embed must produce the same vectors as the function the bank was
+        built with.
+
+        Raises:
+            ValueError: If the file is not a bank, is truncated, or was written
+                        with a different byte order or dimension than embed
+        """
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < _HEADER.size:
+            raise ValueError(f"{path} is not an exercise bank")
+        magic, byte_order_mark, dim, count, metadata_length = _HEADER.unpack_from(mapped)
+        if magic != BANK_MAGIC:
+            raise ValueError(f"{path} is not an exercise bank")
+        if byte_order_mark != _BYTE_ORDER_MARK:
+            raise ValueError(f"{path} was written with a different byte order")
+        vectors_end = _HEADER.size + 4 * dim * count
+        if vectors_end + metadata_length != len(mapped):
+            raise ValueError(f"{path} is truncated or corrupt")
+        embed_dim = getattr(embed, "dim", None)
+        if embed_dim is not None and embed_dim != dim:
+            raise ValueError(f"{path} holds {dim}-dimensional vectors but embed produces {embed_dim}")
+
+        bank = cls(embed or HashingEmbedder(dim), dim, approximate, min_similarity)
+        bank.index = bank._make_index(memoryview(mapped)[_HEADER.size:vectors_end].cast("f"))
+        metadata = json.loads(bytes(mapped[vectors_end:]).decode("utf-8"))
+        bank.point_names = metadata["points"]
+        bank.point_ids = {name: point_id for point_id, name in enumerate(bank.point_names)}
+        bank.exercises = [[Exercise(**exercise) for exercise in exercises] for exercises in metadata["exercises"]]
+        return bank
@@ -1,45 +1,173 @@
 from typing import List, Optional
 from .llm_service import LLMService
+from .concurrency import gather_bounded
+from .near_duplicate_index import NearDuplicateIndex
+from .exercise_bank import ExerciseBank
 from ..models.exercise import Exercise
+from ..models.generation_report import ExerciseGenerationReport
 from ..learning_point import LearningPoint
 
+class ExerciseGenerationError(Exception):
+    """Raised when exercises could not be generated for some learning points."""
+
+    def __init__(self, report: ExerciseGenerationReport, learning_points: Optional[List[LearningPoint]] = None):
+        self.report = report
+        failed = ", ".join(
+            learning_points[index].name if learning_points is not None else str(index)
+            for index in report.failures
+        )
+        super().__init__(f"Failed to generate exercises for learning points: {failed}")
+
+class EmptyGenerationError(Exception):
+    """Recorded for learning points the LLM service returned no exercises for."""
+
 class ExerciseGenerator:
     """Service for generating educational exercises using LLM."""
-    
-    def __init__(self, llm_service: LLMService):
+
+    def __init__(self,
+                 llm_service: LLMService,
+                 duplicate_index: Optional[NearDuplicateIndex] = None,
+                 bank: Optional[ExerciseBank] = None):
+        """
+        Args:
+            llm_service: Service used to generate exercises
+            duplicate_index: Index of questions already in the bank; generated
+                             exercises that near-duplicate an indexed (or an
+                             earlier generated) question are dropped, and the
+                             rest are added to it
+            bank: Store of existing exercises; learning points are served from
+                  it first and only the shortfall is generated, then stored
+        """
         self.llm_service = llm_service
-        
+        self.duplicate_index = duplicate_index
+        self.bank = bank
+
     async def generate_exercises_for_learning_points(
         self,
         learning_points: List[LearningPoint],
         count_per_point: int = 1,
         difficulty: str = "intermediate",
-        exercise_type: str = "open_ended"
+        exercise_type: str = "open_ended",
+        max_concurrency: int = 1,
+        timeout: Optional[float] = None
     ) -> List[Exercise]:
         """
         Generate exercises for a list of learning points.
-        
+
         Args:
             learning_points: List of LearningPoint objects to generate exercises for
             count_per_point: Number of exercises to generate per learning point
             difficulty: Desired difficulty level ("beginner", "intermediate", "advanced")
             exercise_type: Type of exercise to generate ("multiple_choice", "open_ended", "coding")
-            
+            max_concurrency: Maximum number of learning points generated at once
+            timeout: Optional timeout in seconds for each learning point's LLM call
+
         Returns:
-            List of Exercise objects
-            
+            List of Exercise objects, in learning-point order
+
         Raises:
             ValueError: If count_per_point is less than 0
+            ExerciseGenerationError: If generation failed for any learning point;
+                the exercises that did succeed are available on its report
+        """
+        report = await self.generate_exercise_report(
+            learning_points,
+            count_per_point=count_per_point,
+            difficulty=difficulty,
+            exercise_type=exercise_type,
+            max_concurrency=max_concurrency,
+            timeout=timeout
+        )
+        if report.failures:
+            raise ExerciseGenerationError(report, learning_points) from next(iter(report.failures.values()))
+        return report.exercises
+
+    async def generate_exercise_report(
+        self,
+        learning_points: List[LearningPoint],
+        count_per_point: int = 1,
+        difficulty: str = "intermediate",
+        exercise_type: str = "open_ended",
+        max_concurrency: int = 1,
+        timeout: Optional[float] = None
+    ) -> ExerciseGenerationReport:
+        """
+        Generate exercises for a list of learning points, collecting failures
+        per learning point instead of raising.
+
+        Args:
+            learning_points: List of LearningPoint objects to generate exercises for
+            count_per_point: Number of exercises to generate per learning point
+            difficulty: Desired difficulty level ("beginner", "intermediate", "advanced")
+            exercise_type: Type of exercise to generate ("multiple_choice", "open_ended", "coding")
+            max_concurrency: Maximum number of learning points generated at once
+            timeout: Optional timeout in seconds for each learning point's LLM call
+
+        Returns:
+            ExerciseGenerationReport with one exercise list per learning point
+            (banked exercises first; only banked ones for failed points) and
+            the errors keyed by learning point index (an empty result for a
+            point that needed exercises is an EmptyGenerationError)
+
+        Raises:
+            ValueError: If count_per_point is less than 0 or max_concurrency is less than 1
         """
         if count_per_point < 0:
             raise ValueError("count_per_point must be non-negative")
-        exercises = []
-        for point in learning_points:
-            point_exercises = await self.llm_service.generate_exercises(
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        banked = [
+            self.bank.find(point, k=count_per_point, difficulty=difficulty, exercise_type=exercise_type)
+            if self.bank is not None else []
+            for point in learning_points
+        ]
+
+        def make_call(point: LearningPoint, count: int):
+            return lambda: self.llm_service.generate_exercises(
                 learning_points=[point],
-                count=count_per_point,
+                count=count,
                 difficulty=difficulty,
                 exercise_type=exercise_type
             )
-            exercises.extend(point_exercises)
-        return exercises
+
+        to_generate = [
+            index for index, point_banked in enumerate(banked)
+            if len(point_banked) < count_per_point
+        ]
+        outcomes = await gather_bounded(
+            [make_call(learning_points[index], count_per_point - len(banked[index])) for index in to_generate],
+            max_concurrency=max_concurrency,
+            timeout=timeout
+        )
+        generated = dict(zip(to_generate, outcomes))
+
+        report = ExerciseGenerationReport(exercises_by_point=[])
+        for index, point in enumerate(learning_points):
+            exercises = list(banked[index])
+            report.served_from_bank += len(exercises)
+            outcome = generated.get(index, [])
+            if index in generated and not isinstance(outcome, Exception) and not outcome:
+                # Services that report errors as empty results (OpenAIService
+                # with raise_on_error=False) return nothing for a failed call
+                outcome = EmptyGenerationError(f"No exercises were generated for {point.name}")
+            if isinstance(outcome, Exception):
+                report.failures[index] = outcome
+            else:
+                new_exercises = self._reject_duplicates(outcome, report)
+                if self.bank is not None and new_exercises:
+                    self.bank.add(point, new_exercises)
+                exercises.extend(new_exercises)
+            report.exercises_by_point.append(exercises)
+        return report
+
+    def _reject_duplicates(self, exercises: List[Exercise], report: ExerciseGenerationReport) -> List[Exercise]:
+        if self.duplicate_index is None:
+            return list(exercises)
+        unique = []
+        for exercise in exercises:
+            if self.duplicate_index.add_if_unique(exercise.question) is None:
+                report.duplicates_rejected += 1
+            else:
+                unique.append(exercise)
+        return unique
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from .llm_service import LLMService
+from ..models.exercise import Exercise
+from ..learning_point import LearningPoint
+
+PoolKey = Tuple[str, str, str]  # (learning point name, difficulty, exercise type)
+
+class ExercisePool:
+    """
+    Stock of pre-generated exercises served without waiting on the LLM.
+
+    Exercises are kept per (learning point, difficulty, exercise type). Taking
+    an exercise that drops a key's stock below low_water_mark starts a
+    background refill up to capacity; exercises older than max_age are
+    evicted instead of served.
+    """
+
+    def __init__(self,
+                 llm_service: LLMService,
+                 capacity: int = 10,
+                 low_water_mark: int = 3,
+                 max_age: Optional[float] = None):
+        """
+        Args:
+            llm_service: Service used to generate exercises
+            capacity: Maximum number of exercises stocked per key
+            low_water_mark: Stock level below which a key is refilled
+            max_age: Seconds after which a stocked exercise is considered stale
+
+        Raises:
+            ValueError: If capacity is less than 1 or low_water_mark is not in [0, capacity]
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 <= low_water_mark <= capacity:
+            raise ValueError("low_water_mark must be between 0 and capacity")
+        self.llm_service = llm_service
+        self.capacity = capacity
+        self.low_water_mark = low_water_mark
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._stock: Dict[PoolKey, Deque[Tuple[float, Exercise]]] = {}
+        self._points: Dict[str, LearningPoint] = {}
+        self._refills: Dict[PoolKey, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(learning_point: LearningPoint, difficulty: str, exercise_type: str) -> PoolKey:
+        return (learning_point.name, difficulty, exercise_type)
+
+    def _evict_stale(self, key: PoolKey) -> Deque[Tuple[float, Exercise]]:
+        stock = self._stock.setdefault(key, deque())
+        if self.max_age is not None:
+            cutoff = time.monotonic() - self.max_age
+            while stock and stock[0][0] < cutoff:
+                stock.popleft()
+        return stock
+
+    def stock_level(self,
+                    learning_point: LearningPoint,
+                    difficulty: str = "intermediate",
+                    exercise_type: str = "open_ended") -> int:
+        """Number of fresh exercises currently stocked for a key."""
+        return len(self._evict_stale(self._key(learning_point, difficulty, exercise_type)))
+
+    def take_nowait(self,
+                    learning_point: LearningPoint,
+                    difficulty: str = "intermediate",
+                    exercise_type: str = "open_ended") -> Optional[Exercise]:
+        """
+        Take a stocked exercise without waiting, scheduling a refill if needed.
+
+        Returns:
+            An Exercise, or None if the key's stock is empty
+        """
+        key = self._key(learning_point, difficulty, exercise_type)
+        self._points[learning_point.name] = learning_point
+        stock = self._evict_stale(key)
+        exercise = stock.popleft()[1] if stock else None
+        if exercise is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        if len(stock) < self.low_water_mark or exercise is None:
+            self._schedule_refill(key)
+        return exercise
+
+    async def get_exercise(self,
+                           learning_point: LearningPoint,
+                           difficulty: str = "intermediate",
+                           exercise_type: str = "open_ended") -> Exercise:
+        """
+        Take a stocked exercise, waiting for a refill only if the stock is empty.
+
+        Raises:
+            LookupError: If the refill produced no exercise
+        """
+        exercise = self.take_nowait(learning_point, difficulty, exercise_type)
+        if exercise is not None:
+            return exercise
+        key = self._key(learning_point, difficulty, exercise_type)
+        refill = self._refills.get(key)
+        if refill is not None:
+            await asyncio.shield(refill)
+        stock = self._evict_stale(key)
+        if not stock:
+            raise LookupError(
+                f"No exercise available for {learning_point.name} ({difficulty}, {exercise_type})"
+            )
+        exercise = stock.popleft()[1]
+        if len(stock) < self.low_water_mark:
+            self._schedule_refill(key)
+        return exercise
+
+    async def warm(self,
+                   learning_points: List[LearningPoint],
+                   difficulty: str = "intermediate",
+                   exercise_type: str = "open_ended") -> None:
+        """Fill the stock of each learning point up to capacity and wait for it."""
+        for point in learning_points:
+            self._points[point.name] = point
+            self._schedule_refill(self._key(point, difficulty, exercise_type))
+        await self.wait_for_refills()
+
+    async def wait_for_refills(self) -> None:
+        """Wait until every background refill in progress has finished."""
+        while self._refills:
+            await asyncio.gather(*list(self._refills.values()), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Cancel background refills in progress."""
+        refills = list(self._refills.values())
+        for refill in refills:
+            refill.cancel()
+        await asyncio.gather(*refills, return_exceptions=True)
+
+    def _schedule_refill(self, key: PoolKey) -> None:
+        if key in self._refills:
+            return
+        refill = asyncio.ensure_future(self._refill(key))
+        self._refills[key] = refill
+        refill.add_done_callback(lambda _: self._refills.pop(key, None))
+
+    async def _refill(self, key: PoolKey) -> None:
+        name, difficulty, exercise_type = key
+        missing = self.capacity - len(self._evict_stale(key))
+        if missing <= 0:
+            return
+        try:
+            exercises = await self.llm_service.generate_exercises(
+                learning_points=[self._points[name]],
+                count=missing,
+                difficulty=difficulty,
+                exercise_type=exercise_type
+            )
+        except Exception as e:
+            print(f"Failed to refill exercise pool for {name}: {str(e)}")
+            return
+        stock = self._evict_stale(key)
+        now = time.monotonic()
+        for exercise in exercises[:self.capacity - len(stock)]:
+            stock.append((now, exercise))
@@ -0,0 +1,148 @@
+import copy
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional, Tuple
+from ..models.grading_result import GradingResult
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for a grading cache."""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class GradingCache(ABC):
+    """Abstract base class for grading result caches keyed by request hash."""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[GradingResult]:
+        """Return a copy of the cached result for key, or None, counting the lookup."""
+        result = self._get(key)
+        if result is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return result
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[GradingResult]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, result: GradingResult) -> None:
+        """Store a result under key."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every cached result."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class LRUGradingCache(GradingCache):
+    """In-memory least-recently-used cache with optional time-to-live."""
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: Maximum number of results kept before evicting the least recently used
+            ttl: Seconds a result stays valid, or None to keep results until evicted
+        """
+        super().__init__()
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, GradingResult]]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[GradingResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def set(self, key: str, result: GradingResult) -> None:
+        self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteGradingCache(GradingCache):
+    """On-disk cache backed by a SQLite table, shared across processes and restarts."""
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a private in-memory database)
+            ttl: Seconds a result stays valid, or None to keep results indefinitely
+        """
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS grading_cache ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+
+    def _get(self, key: str) -> Optional[GradingResult]:
+        row = self._connection.execute(
+            "SELECT result, stored_at FROM grading_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        result, stored_at = row
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            self._connection.execute("DELETE FROM grading_cache WHERE key = ?", (key,))
+            self._connection.commit()
+            return None
+        return GradingResult(**json.loads(result))
+
+    def set(self, key: str, result: GradingResult) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO grading_cache (key, result, stored_at) VALUES (?, ?, ?)",
+            (key, json.dumps(asdict(result), default=str), time.time())
+        )
+        self._connection.commit()
+
+    def clear(self) -> None:
+        self._connection.execute("DELETE FROM grading_cache")
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM grading_cache").fetchone()[0]
@@ -0,0 +1,345 @@
+import math
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import List, Dict, Any, Optional, Tuple
+from .llm_service import LLMService
+from .request_keys import is_code_exercise, normalize_text
+from ..models.exercise import Exercise
+from ..models.grading_result import GradingResult
+from ..models.grading_request import GradingRequest
+from ..models.batch_grading_result import BatchGradingResult
+from ..learning_point import LearningPoint
+
+LLM_STAGE = "llm"
+
+
+class DeterministicGrader(ABC):
+    """A rule-based grader that only answers when it is certain."""
+
+    name = "deterministic"
+
+    @abstractmethod
+    def grade(self,
+              problem: str,
+              student_answer: str,
+              expected_answer: str = None,
+              metadata: Dict[str, Any] = None) -> Optional[GradingResult]:
+        """Return a grade, or None to let the next stage decide."""
+        pass
+
+    def _result(self, correct: bool, expected: str) -> GradingResult:
+        return GradingResult(
+            score=100.0 if correct else 0.0,
+            feedback="Correct." if correct else f"Incorrect. The expected answer is {expected}.",
+            metadata={"grader": self.name},
+            confidence=1.0
+        )
+
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s.!?;:,]+$")
+
+
+class ExactMatchGrader(DeterministicGrader):
+    """
+    Full marks for answers equal to the expected answer after normalizing
+    case, whitespace and trailing punctuation. Mismatches are escalated,
+    since a differently worded answer may still be right. Code answers are
+    always escalated: case and indentation change what code does.
+    """
+
+    name = "exact_match"
+
+    def __init__(self, case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+
+    def _normalize(self, text: str) -> str:
+        return _TRAILING_PUNCTUATION.sub("", normalize_text(text, self.case_sensitive))
+
+    def grade(self, problem, student_answer, expected_answer=None, metadata=None):
+        if not expected_answer or not student_answer or is_code_exercise(metadata):
+            return None
+        if self._normalize(student_answer) == self._normalize(expected_answer):
+            return self._result(True, expected_answer)
+        return None
+
+
+# "B", "(b)", "B)", "B.", "B: Paris", "B - Paris", "B or C"
+_OPTION = r"\(?([A-Ha-h])(?:\)|\.|:|,|\s*$|\s+[-–]\s|\s+(?:or|and)\s)"
+_LEADING_OPTION = re.compile(r"^\s*" + _OPTION)
+# "Answer: B", "The correct answer is B", "Option (c)"
+_STATED_OPTION = re.compile(r"\b(?:answer|option|choice)\s*(?:is\s*|:\s*)?" + _OPTION, re.IGNORECASE)
+_OPTION_LINE = re.compile(r"^\s*\(?[A-Ha-h][).]", re.MULTILINE)
+_BARE_OPTION = re.compile(r"^\s*\(?[A-Ha-h]\)?\.?\s*$")
+
+
+def parse_option(text: Optional[str]) -> Optional[str]:
+    """Extract the single multiple-choice option letter an answer names, if there is one."""
+    if not text:
+        return None
+    stated = {letter.upper() for letter in _STATED_OPTION.findall(text)}
+    if stated:
+        return stated.pop() if len(stated) == 1 else None
+    match = _LEADING_OPTION.match(text)
+    if match is None or match.group(0).rstrip().endswith((" or", " and")):
+        return None
+    # Text listing several options ("A) ..\nB) ..") does not choose one
+    if len(_OPTION_LINE.findall(text)) > 1:
+        return None
+    return match.group(1).upper()
+
+
+class MultipleChoiceGrader(DeterministicGrader):
+    """
+    Compares option letters when both the expected and student answers name
+    exactly one.
+
+    An item counts as multiple choice when its expected answer is a bare
+    option letter or its metadata has exercise_type "multiple_choice".
+    """
+
+    name = "multiple_choice"
+
+    def grade(self, problem, student_answer, expected_answer=None, metadata=None):
+        if not expected_answer:
+            return None
+        if not (_BARE_OPTION.match(expected_answer)
+                or (metadata or {}).get("exercise_type") == "multiple_choice"):
+            return None
+        expected = parse_option(expected_answer)
+        chosen = parse_option(student_answer)
+        if expected is None or chosen is None:
+            return None
+        return self._result(chosen == expected, expected)
+
+
+_NUMBER = re.compile(r"[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)?(?:\.\d+)?(?:[eE][-+]?\d+)?(?:/\d+)?%?")
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def _parse_number(token: str) -> Optional[float]:
+    token = token.replace(",", "")
+    percent = token.endswith("%")
+    token = token.rstrip("%")
+    if not any(char.isdigit() for char in token):
+        return None
+    try:
+        value = float(Fraction(token)) if "/" in token else float(token)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return value / 100 if percent else value
+
+
+def parse_single_number(text: Optional[str], max_words: int = 3) -> Optional[float]:
+    """
+    The number an answer consists of ("42", "x = 3.5", "1/4", "12%",
+    "about 7 meters"), or None if it has no number, several numbers, or
+    more than max_words words besides the number.
+    """
+    if not text:
+        return None
+    numbers = []
+    for match in _NUMBER.finditer(text):
+        value = _parse_number(match.group())
+        if value is not None:
+            numbers.append((value, match))
+    if len(numbers) != 1:
+        return None
+    value, match = numbers[0]
+    remainder = text[:match.start()] + " " + text[match.end():]
+    if len(_WORD.findall(remainder)) > max_words:
+        return None
+    return value
+
+
+# Lead-ins that do not change what a numeric answer says: "The answer is 42", "x = 3.5"
+_ANSWER_LEAD_IN = re.compile(
+    r"^\s*(?:(?:the\s+)?(?:final\s+)?answer\s*(?:is\b|[:=])|[^\W\d_]\s*=|=)\s*", re.IGNORECASE
+)
+
+
+def _split_number(text: Optional[str]) -> Optional[Tuple[float, str, str, str]]:
+    if not text:
+        return None
+    text = _ANSWER_LEAD_IN.sub("", text, count=1)
+    numbers = []
+    for match in _NUMBER.finditer(text):
+        value = _parse_number(match.group())
+        if value is not None:
+            numbers.append((value, match))
+    if len(numbers) != 1:
+        return None
+    value, match = numbers[0]
+    before = normalize_text(text[:match.start()], False)
+    after = _TRAILING_PUNCTUATION.sub("", normalize_text(text[match.end():], False))
+    return value, match.group(), before, after
+
+
+def split_number(text: Optional[str]) -> Optional[Tuple[float, str, str]]:
+    """
+    The single number in an answer with the normalized text before and after
+    it ("5 cm" -> (5.0, "", "cm"), "x^2" -> (2.0, "x^", "")), or None if it
+    has no number or several. A leading "The answer is" or "x =" is dropped.
+    """
+    parts = _split_number(text)
+    return None if parts is None else (parts[0], parts[2], parts[3])
+
+
+_PLAIN_DECIMAL = re.compile(r"[-+]?[\d,]*(?:\.(\d+))?")
+
+
+def _decimal_places(token: str) -> Optional[int]:
+    """Digits after the decimal point ("3.14" -> 2); None for fractions, percentages and exponents."""
+    match = _PLAIN_DECIMAL.fullmatch(token)
+    return len(match.group(1) or "") if match else None
+
+
+class NumericGrader(DeterministicGrader):
+    """
+    Compares numeric answers within a tolerance.
+
+    Only expected answers that are a bare number, optionally followed by a
+    unit of at most two words ("42", "1/4", "9.8 m/s"), are graded, and only
+    student answers with nothing but that same unit around their number.
+    Anything else ("not 5", "x^2", "5 km" for "5 cm") is escalated.
+
+    With metadata["tolerance"] (absolute) set, answers within it are correct
+    and all others wrong. Otherwise answers equal to the expected value up
+    to a relative tolerance are correct, and a different answer is only
+    marked wrong when it is a decimal with as many digits after the point
+    as the expected answer; rounded or more precise answers ("3.14" for
+    "3.14159") are escalated.
+    """
+
+    name = "numeric"
+
+    def __init__(self, rel_tol: float = 1e-6, abs_tol: float = 1e-9):
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+
+    def grade(self, problem, student_answer, expected_answer=None, metadata=None):
+        expected = _split_number(expected_answer)
+        if expected is None:
+            return None
+        expected_value, expected_token, before, unit = expected
+        if before or len(_WORD.findall(unit)) > 2 or any(char.isdigit() for char in unit):
+            return None
+        answer = _split_number(student_answer)
+        if answer is None or answer[2:] != ("", unit):
+            return None
+        value, token = answer[0], answer[1]
+        tolerance = (metadata or {}).get("tolerance")
+        if tolerance is not None:
+            return self._result(abs(value - expected_value) <= float(tolerance), expected_answer)
+        if math.isclose(value, expected_value, rel_tol=self.rel_tol, abs_tol=self.abs_tol):
+            return self._result(True, expected_answer)
+        places = _decimal_places(expected_token)
+        if places is not None and _decimal_places(token) == places:
+            return self._result(False, expected_answer)
+        return None
+
+
+@dataclass
+class CascadeStats:
+    """How many grades each stage of a grading cascade decided."""
+    hits: Dict[str, int] = field(default_factory=dict)  # Stage name -> grades decided
+
+    @property
+    def total(self) -> int:
+        return sum(self.hits.values())
+
+    @property
+    def deterministic_rate(self) -> float:
+        """Fraction of grades decided without the LLM."""
+        if not self.total:
+            return 0.0
+        return 1 - self.hits.get(LLM_STAGE, 0) / self.total
+
+    def record(self, stage: str, count: int = 1) -> None:
+        self.hits[stage] = self.hits.get(stage, 0) + count
+
+
+def default_graders() -> List[DeterministicGrader]:
+    return [ExactMatchGrader(), MultipleChoiceGrader(), NumericGrader()]
+
+
+class GradingCascadeService(LLMService):
+    """
+    LLM service wrapper that tries deterministic graders before the LLM.
+
+    Graders run in order; the first to return a result decides the grade.
+    Answers no grader is certain about are escalated to the wrapped service.
+    """
+
+    def __init__(self, llm_service: LLMService, graders: Optional[List[DeterministicGrader]] = None):
+        """
+        Args:
+            llm_service: Service that grades the answers the graders escalate
+            graders: Deterministic stages, in order (defaults to exact match,
+                     multiple choice and numeric tolerance)
+        """
+        self.llm_service = llm_service
+        self.graders = graders if graders is not None else default_graders()
+        self.stats = CascadeStats()
+
+    def _grade_locally(self,
+                       problem: str,
+                       student_answer: str,
+                       expected_answer: str = None,
+                       metadata: Dict[str, Any] = None) -> Optional[GradingResult]:
+        for grader in self.graders:
+            result = grader.grade(problem, student_answer, expected_answer, metadata)
+            if result is not None:
+                self.stats.record(grader.name)
+                return result
+        return None
+
+    async def generate_exercises(self,
+                               learning_points: List[LearningPoint],
+                               count: int = 1,
+                               difficulty: str = "intermediate",
+                               exercise_type: str = "open_ended") -> List[Exercise]:
+        """Delegates to the wrapped service."""
+        return await self.llm_service.generate_exercises(
+            learning_points, count, difficulty, exercise_type
+        )
+
+    async def grade_answer(self,
+                          problem: str,
+                          student_answer: str,
+                          expected_answer: str = None,
+                          metadata: Dict[str, Any] = None) -> GradingResult:
+        """Grade deterministically when possible, otherwise with the wrapped service."""
+        result = self._grade_locally(problem, student_answer, expected_answer, metadata)
+        if result is not None:
+            return result
+        self.stats.record(LLM_STAGE)
+        return await self.llm_service.grade_answer(
+            problem, student_answer, expected_answer, metadata
+        )
+
+    async def grade_answers(self,
+                           requests: List[GradingRequest],
+                           max_concurrency: Optional[int] = None,
+                           timeout: Optional[float] = None) -> BatchGradingResult:
+        """Grade deterministically where possible and forward the rest, as one batch, to the wrapped service."""
+        batch = BatchGradingResult(results=[
+            self._grade_locally(request.problem, request.student_answer,
+                                request.expected_answer, request.metadata)
+            for request in requests
+        ])
+        escalated = [index for index, result in enumerate(batch.results) if result is None]
+        if not escalated:
+            return batch
+        self.stats.record(LLM_STAGE, len(escalated))
+        graded = await self.llm_service.grade_answers(
+            [requests[index] for index in escalated],
+            max_concurrency=max_concurrency,
+            timeout=timeout
+        )
+        for position, index in enumerate(escalated):
+            batch.results[index] = graded.results[position]
+            if position in graded.errors:
+                batch.errors[index] = graded.errors[position]
+        return batch
@@ -0,0 +1,105 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """
+    Hedged requests: when a call has not returned within a high percentile
+    of recent latencies, start a duplicate and use whichever finishes first.
+
+    The hedge delay is the given percentile of the last window successful
+    call latencies (initial_delay until min_samples have been seen), so only
+    the slowest few percent of calls are duplicated. Hedges are further
+    capped at max_hedge_rate of calls: every call earns max_hedge_rate of a
+    hedge credit and each hedge spends one, so a slow upstream cannot double
+    the load.
+    """
+
+    def __init__(self,
+                 percentile: float = 95.0,
+                 initial_delay: float = 2.0,
+                 min_delay: float = 0.05,
+                 max_hedge_rate: float = 0.1,
+                 window: int = 500,
+                 min_samples: int = 20):
+        """
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            initial_delay: Hedge delay in seconds until min_samples latencies are known
+            min_delay: Lower bound on the hedge delay in seconds
+            max_hedge_rate: Largest fraction of calls that may be hedged
+            window: Number of recent latencies the percentile is taken over
+            min_samples: Latencies needed before the percentile is used
+        """
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if not 0 <= max_hedge_rate <= 1:
+            raise ValueError("max_hedge_rate must be between 0 and 1")
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._credit = 1.0
+        self.calls = 0  # Number of calls run
+        self.hedged = 0  # Number of calls a hedge was sent for
+        self.hedge_wins = 0  # Number of hedged calls the hedge answered first
+
+    def delay(self) -> float:
+        """Seconds to wait for a call before hedging it."""
+        if len(self._latencies) < self.min_samples:
+            return max(self.min_delay, self.initial_delay)
+        ordered = sorted(self._latencies)
+        rank = math.ceil(self.percentile / 100 * len(ordered)) - 1
+        return max(self.min_delay, ordered[rank])
+
+    def record(self, latency: float) -> None:
+        self._latencies.append(latency)
+
+    def _take_hedge_credit(self) -> bool:
+        if self._credit < 1:
+            return False
+        self._credit -= 1
+        return True
+
+    async def run(self,
+                  call: Callable[[], Awaitable[T]],
+                  hedge: Optional[Callable[[], Awaitable[T]]] = None) -> T:
+        """
+        Run call, hedging it with hedge (or a second call) if it is slow.
+
+        The first successful result is returned and the other attempt is
+        cancelled. If an attempt fails, the other is still awaited.
+
+        Raises:
+            The primary call's error if no attempt succeeds
+        """
+        self.calls += 1
+        self._credit = min(1.0, self._credit + self.max_hedge_rate)
+        started = time.monotonic()
+        primary = asyncio.ensure_future(call())
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay())
+            if not done and self._take_hedge_credit():
+                self.hedged += 1
+                pending.add(asyncio.ensure_future((hedge or call)()))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        self.record(time.monotonic() - started)
+                        return task.result()
+            return primary.result()  # Every attempt failed; raise the primary's error
+        finally:
+            for task in pending:
+                task.cancel()
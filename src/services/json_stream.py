@@ -0,0 +1,208 @@
+"""
+Incremental parsing of JSON objects arriving in chunks, as produced by
+streamed LLM completions.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class JSONObjectStream:
+    """
+    Splits a stream of text into complete top-level JSON objects.
+
+    Text outside objects (prose, markdown fences, whitespace) is skipped.
+    Each character is scanned once, so feeding a response chunk by chunk
+    costs the same as parsing it whole.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0  # Next character of the buffer to scan
+        self._start = -1  # Start of the object being read, or -1 between objects
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Add text to the stream.
+
+        Returns:
+            The objects completed by this chunk, in order
+
+        Raises:
+            ValueError: If a completed object is not valid JSON
+        """
+        self._buffer += text
+        objects = []
+        buffer = self._buffer
+        position = self._position
+        while position < len(buffer):
+            char = buffer[position]
+            if self._start < 0:
+                if char == "{":
+                    self._start = position
+                    self._depth = 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    objects.append(json.loads(buffer[self._start:position + 1]))
+                    self._start = -1
+            position += 1
+
+        # Keep only the unfinished object so the buffer stays small
+        keep_from = self._start if self._start >= 0 else position
+        self._buffer = buffer[keep_from:]
+        self._position = position - keep_from
+        if self._start >= 0:
+            self._start = 0
+        return objects
+
+    @property
+    def pending(self) -> str:
+        """Text of the object currently being read, if any."""
+        return self._buffer if self._start >= 0 else ""
+
+
+class JSONFieldStream:
+    """
+    Reports the top-level fields of one JSON object while it streams in.
+
+    feed() returns events of two kinds:
+
+    - ("delta", key, text): more decoded text of a string field still being read
+    - ("value", key, value): a field whose value has been read completely
+
+    Fields are reported in the order they appear, so callers can act on
+    early fields (such as a score) before later ones finish.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._token_start = 0  # Start of the key or value being read
+        self._emitted = 0  # End of the string value text already reported as deltas
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the object's closing brace has been read."""
+        return self._state == "done"
+
+    def feed(self, text: str) -> List[Tuple[str, str, Any]]:
+        """
+        Add text to the stream and return the events it completes.
+
+        Raises:
+            ValueError: If a key or value is not valid JSON
+        """
+        self._buffer += text
+        buffer = self._buffer
+        events: List[Tuple[str, str, Any]] = []
+        for position in range(self._position, len(buffer)):
+            char = buffer[position]
+            state = self._state
+            if state == "start":
+                if char == "{":
+                    self._state = "key"
+            elif state == "key":
+                if char == '"':
+                    self._token_start = position
+                    self._state = "in_key"
+                elif char == "}":
+                    self._state = "done"
+            elif state in ("in_key", "string"):
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    token = buffer[self._token_start:position + 1]
+                    if state == "in_key":
+                        self._key = json.loads(token)
+                        self._state = "colon"
+                    else:
+                        self._emit_delta(events, position)
+                        events.append(("value", self._key, json.loads(token)))
+                        self._state = "after"
+            elif state == "colon":
+                if char == ":":
+                    self._state = "value"
+            elif state == "value":
+                if char == '"':
+                    self._token_start = position
+                    self._emitted = position + 1
+                    self._state = "string"
+                elif char in "{[":
+                    self._token_start = position
+                    self._depth = 1
+                    self._in_string = False
+                    self._state = "nested"
+                elif not char.isspace():
+                    self._token_start = position
+                    self._state = "scalar"
+            elif state == "nested":
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif char == "\\":
+                        self._escaped = True
+                    elif char == '"':
+                        self._in_string = False
+                elif char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                elif char in "}]":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        events.append(
+                            ("value", self._key, json.loads(buffer[self._token_start:position + 1]))
+                        )
+                        self._state = "after"
+            elif state == "scalar":
+                if char in ",}" or char.isspace():
+                    events.append(("value", self._key, json.loads(buffer[self._token_start:position])))
+                    self._state = "after"
+                    state = "after"
+            if state == "after":
+                if char == ",":
+                    self._state = "key"
+                elif char == "}":
+                    self._state = "done"
+        self._position = len(buffer)
+        if self._state == "string":
+            self._emit_delta(events, len(buffer))
+        return events
+
+    def _emit_delta(self, events: List[Tuple[str, str, Any]], end: int) -> None:
+        """Report the decodable part of the current string value up to end."""
+        raw = self._buffer[self._emitted:end]
+        # A chunk may stop inside an escape sequence (or between the halves of
+        # a surrogate pair); hold back the unfinished tail until more arrives.
+        for cut in range(len(raw), max(len(raw) - 12, 0) - 1, -1):
+            try:
+                decoded = json.loads(f'"{raw[:cut]}"')
+            except ValueError:
+                continue
+            if decoded and "\ud800" <= decoded[-1] <= "\udbff":
+                continue
+            if decoded:
+                events.append(("delta", self._key, decoded))
+            self._emitted += cut
+            return
@@ -0,0 +1,280 @@
+"""
+Routing of LLM calls across several backends.
+
+Each backend is an LLMService (typically an OpenAIService with its own API
+key, base URL or model). Every call goes to one backend, chosen by
+outstanding requests or observed latency among the backends whose circuit
+breaker is closed. A failed call fails over to the next backend in order.
+"""
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+from .llm_service import LLMService
+from ..models.exercise import Exercise
+from ..models.grading_result import GradingResult
+from ..learning_point import LearningPoint
+
+T = TypeVar("T")
+
+LEAST_OUTSTANDING = "least_outstanding"
+LATENCY_WEIGHTED = "latency_weighted"
+
+
+class NoBackendAvailableError(Exception):
+    """Raised when every backend's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops sending calls to a failing backend.
+
+    After failure_threshold consecutive failures the breaker opens and
+    rejects calls for reset_timeout seconds. It then lets one trial call
+    through (half-open): success closes it, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def available(self) -> bool:
+        """Whether a call would currently be let through."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return time.monotonic() - self._opened_at >= self.reset_timeout
+        return not self._trial_in_flight
+
+    def before_call(self) -> bool:
+        """Claim permission for a call; False if the breaker rejects it."""
+        if not self.available():
+            return False
+        if self.state != self.CLOSED:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = True
+        return True
+
+    def on_success(self) -> None:
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def on_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def on_abandoned(self) -> None:
+        """Release a half-open trial whose call ended without a verdict (e.g. was cancelled)."""
+        self._trial_in_flight = False
+
+
+class RoutedBackend:
+    """A backend service with its load, latency and health as seen by the router."""
+
+    def __init__(self, service: LLMService, name: str, breaker: CircuitBreaker):
+        self.service = service
+        self.name = name
+        self.breaker = breaker
+        self.outstanding = 0  # Calls in flight
+        self.latency: Optional[float] = None  # Moving average of successful call latency in seconds
+        self.successes = 0
+        self.failures = 0
+
+    def record_latency(self, latency: float, smoothing: float) -> None:
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += smoothing * (latency - self.latency)
+
+
+def _is_backend_failure(error: Exception) -> bool:
+    """Whether an error says something about the backend rather than the request."""
+    status = getattr(error, "status_code", None)
+    # Other 4xx errors (bad request, too long, ...) would fail on every backend
+    return not (isinstance(status, int) and 400 <= status < 500 and status not in (408, 409, 429))
+
+
+class RouterLLMService(LLMService):
+    """
+    LLM service that spreads calls over several backend services with
+    load balancing, circuit breaking and failover.
+
+    Backends should raise on failure (OpenAIService(raise_on_error=True)).
+    Grading results whose metadata has an "error" and empty exercise lists
+    are also treated as failures, so services that report errors that way
+    still fail over; if every attempt fails like that, the last such result
+    is returned.
+    """
+
+    def __init__(self,
+                 backends: Sequence[LLMService],
+                 names: Optional[Sequence[str]] = None,
+                 strategy: str = LEAST_OUTSTANDING,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0,
+                 max_attempts: Optional[int] = None,
+                 latency_smoothing: float = 0.2,
+                 max_concurrency: Optional[int] = None):
+        """
+        Args:
+            backends: Services to route between
+            names: Names for the backends in stats (defaults to their index)
+            strategy: "least_outstanding" (fewest calls in flight, round-robin
+                      among ties) or "latency_weighted" (random, weighted by
+                      the inverse of latency times load)
+            failure_threshold: Consecutive failures that open a backend's breaker
+            reset_timeout: Seconds an open breaker waits before a trial call
+            max_attempts: Backends tried per call (defaults to all of them)
+            latency_smoothing: Weight of the newest latency in the moving average
+            max_concurrency: Default batch concurrency (defaults to the sum of
+                             the backends' max_concurrency)
+        """
+        if not backends:
+            raise ValueError("At least one backend is required")
+        if strategy not in (LEAST_OUTSTANDING, LATENCY_WEIGHTED):
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        names = list(names) if names is not None else [str(index) for index in range(len(backends))]
+        if len(names) != len(backends):
+            raise ValueError("names must match backends")
+        self.backends = [
+            RoutedBackend(service, name, CircuitBreaker(failure_threshold, reset_timeout))
+            for service, name in zip(backends, names)
+        ]
+        self.strategy = strategy
+        self.max_attempts = max_attempts or len(self.backends)
+        self.latency_smoothing = latency_smoothing
+        self.default_max_concurrency = max_concurrency or sum(
+            getattr(service, "max_concurrency", LLMService.default_max_concurrency) for service in backends
+        )
+        self.failovers = 0  # Calls retried on another backend
+        self._next = 0
+
+    def _ranked(self) -> List[RoutedBackend]:
+        """Available backends, most preferred first."""
+        count = len(self.backends)
+        start = self._next
+        self._next = (self._next + 1) % count
+        available = [
+            (index, backend) for index, backend in enumerate(self.backends)
+            if backend.breaker.available()
+        ]
+        if self.strategy == LEAST_OUTSTANDING:
+            available.sort(key=lambda item: (item[1].outstanding, (item[0] - start) % count))
+            return [backend for _, backend in available]
+
+        known = [backend.latency for _, backend in available if backend.latency is not None]
+        # Backends without measurements yet look as fast as the fastest one
+        default_latency = min(known) if known else 1.0
+
+        def sort_key(item):
+            backend = item[1]
+            latency = max(backend.latency if backend.latency is not None else default_latency, 1e-6)
+            weight = 1.0 / (latency * (backend.outstanding + 1))
+            # Weighted random order without replacement (Efraimidis-Spirakis)
+            return random.random() ** (1.0 / weight)
+
+        return [backend for _, backend in sorted(available, key=sort_key, reverse=True)]
+
+    async def _route(self,
+                     call: Callable[[LLMService], Awaitable[T]],
+                     failed: Callable[[T], bool]) -> T:
+        last_error: Optional[Exception] = None
+        last_failed_result = None
+        has_failed_result = False
+        attempts = 0
+        for backend in self._ranked():
+            if attempts >= self.max_attempts:
+                break
+            if not backend.breaker.before_call():
+                continue
+            if attempts:
+                self.failovers += 1
+            attempts += 1
+            backend.outstanding += 1
+            started = time.monotonic()
+            try:
+                result = await call(backend.service)
+            except Exception as e:
+                error = e
+            except BaseException:
+                backend.breaker.on_abandoned()  # Cancelled: no verdict on the backend
+                raise
+            else:
+                error = None
+            finally:
+                backend.outstanding -= 1
+
+            if error is not None:
+                if not _is_backend_failure(error):
+                    backend.breaker.on_success()  # The backend answered; the request was bad
+                    raise error
+                print(f"Error from backend {backend.name}: {str(error)}")
+                backend.failures += 1
+                backend.breaker.on_failure()
+                last_error, has_failed_result = error, False
+                continue
+            if failed(result):
+                backend.failures += 1
+                backend.breaker.on_failure()
+                last_failed_result, has_failed_result = result, True
+                continue
+            backend.successes += 1
+            backend.breaker.on_success()
+            backend.record_latency(time.monotonic() - started, self.latency_smoothing)
+            return result
+
+        if has_failed_result:
+            return last_failed_result
+        if last_error is not None:
+            raise last_error
+        raise NoBackendAvailableError("No backend is available; every circuit breaker is open")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Load, latency and health of every backend."""
+        return [
+            {
+                "name": backend.name,
+                "state": backend.breaker.state,
+                "outstanding": backend.outstanding,
+                "latency": backend.latency,
+                "successes": backend.successes,
+                "failures": backend.failures,
+            }
+            for backend in self.backends
+        ]
+
+    async def generate_exercises(self,
+                               learning_points: List[LearningPoint],
+                               count: int = 1,
+                               difficulty: str = "intermediate",
+                               exercise_type: str = "open_ended") -> List[Exercise]:
+        """Generate exercises on one backend, failing over to the others."""
+        expect_exercises = bool(learning_points) and count > 0
+        return await self._route(
+            lambda service: service.generate_exercises(learning_points, count, difficulty, exercise_type),
+            lambda exercises: expect_exercises and not exercises
+        )
+
+    async def grade_answer(self,
+                          problem: str,
+                          student_answer: str,
+                          expected_answer: str = None,
+                          metadata: Dict[str, Any] = None) -> GradingResult:
+        """Grade an answer on one backend, failing over to the others."""
+        return await self._route(
+            lambda service: service.grade_answer(problem, student_answer, expected_answer, metadata),
+            lambda result: bool(result.metadata.get("error"))
+        )
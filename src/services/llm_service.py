@@ -1,11 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
+from .concurrency import gather_bounded
 from ..models.exercise import Exercise
 from ..models.grading_result import GradingResult
+from ..models.grading_event import GradingEvent
+from ..models.grading_request import GradingRequest
+from ..models.batch_grading_result import BatchGradingResult
 from ..learning_point import LearningPoint
 
 class LLMService(ABC):
     """Abstract base class for LLM service implementations."""
+
+    default_max_concurrency = 10
     
     @abstractmethod
     async def generate_exercises(self, 
@@ -27,6 +33,23 @@ class LLMService(ABC):
         """
         pass
 
+    async def astream_exercises(self,
+                                learning_points: List[LearningPoint],
+                                count: int = 1,
+                                difficulty: str = "intermediate",
+                                exercise_type: str = "open_ended") -> AsyncIterator[Exercise]:
+        """
+        Generate exercises, yielding each one as soon as it is ready.
+
+        Takes the same arguments as generate_exercises. The default
+        implementation waits for generate_exercises and yields its results;
+        services that can stream override it to cut time-to-first-exercise.
+        """
+        for exercise in await self.generate_exercises(
+            learning_points, count, difficulty, exercise_type
+        ):
+            yield exercise
+
     @abstractmethod
     async def grade_answer(self,
                           problem: str,
@@ -51,3 +74,68 @@ class LLMService(ABC):
             GradingResult containing score, feedback, and metadata
         """
         pass
+
+    async def astream_grade(self,
+                            problem: str,
+                            student_answer: str,
+                            expected_answer: str = None,
+                            metadata: Dict[str, Any] = None) -> AsyncIterator[GradingEvent]:
+        """
+        Grade a student's answer, reporting the score before the feedback.
+
+        Takes the same arguments as grade_answer and yields a "score" event,
+        then "feedback" events carrying successive pieces of the feedback,
+        then a "result" event with the complete GradingResult. The default
+        implementation waits for grade_answer; services that can stream
+        override it so the score arrives before the feedback is written.
+        """
+        result = await self.grade_answer(problem, student_answer, expected_answer, metadata)
+        yield GradingEvent("score", score=result.score, confidence=result.confidence)
+        if result.feedback:
+            yield GradingEvent("feedback", text=result.feedback)
+        yield GradingEvent("result", score=result.score, confidence=result.confidence, result=result)
+
+    async def grade_answers(self,
+                           requests: List[GradingRequest],
+                           max_concurrency: Optional[int] = None,
+                           timeout: Optional[float] = None) -> BatchGradingResult:
+        """
+        Grade a batch of student answers concurrently.
+
+        Args:
+            requests: The answers to grade
+            max_concurrency: Maximum number of grading calls in flight
+                             (defaults to default_max_concurrency)
+            timeout: Optional timeout in seconds for each grading call
+
+        Returns:
+            BatchGradingResult whose results are aligned with requests, with
+            None and an entry in errors for every request that failed
+        """
+        outcomes = await gather_bounded(
+            [self._grading_call(request) for request in requests],
+            max_concurrency=max_concurrency or self.default_max_concurrency,
+            timeout=timeout
+        )
+        return self._collect_batch(outcomes)
+
+    def _grading_call(self, request: GradingRequest):
+        """Return a zero-argument callable grading a single request."""
+        return lambda: self.grade_answer(
+            problem=request.problem,
+            student_answer=request.student_answer,
+            expected_answer=request.expected_answer,
+            metadata=request.metadata
+        )
+
+    @staticmethod
+    def _collect_batch(outcomes: List[Any]) -> BatchGradingResult:
+        """Split gathered outcomes into aligned results and per-index errors."""
+        batch = BatchGradingResult(results=[])
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                batch.errors[index] = outcome
+                batch.results.append(None)
+            else:
+                batch.results.append(outcome)
+        return batch
@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import AsyncIterator, List, Dict, Any
 from .llm_service import LLMService
 from ..models.exercise import Exercise
 from ..models.grading_result import GradingResult
@@ -19,16 +20,30 @@ class MockLLMService(LLMService):
         exercises = []
         for _ in range(count):
             for point in learning_points:
-                exercise = Exercise(
-                    question=f"Explain the concept of {point.name} in your own words.",
-                    expected_answer=None,  # LLM would generate this
-                    explanation=f"This question tests understanding of {point.description}",
-                    difficulty_level=difficulty,
-                    exercise_type=exercise_type,
-                    related_learning_points=[point.name]
-                )
-                exercises.append(exercise)
+                exercises.append(self._mock_exercise(point, difficulty, exercise_type))
         return exercises
+
+    async def astream_exercises(self,
+                                learning_points: List[LearningPoint],
+                                count: int = 1,
+                                difficulty: str = "intermediate",
+                                exercise_type: str = "open_ended") -> AsyncIterator[Exercise]:
+        """Mock implementation that yields the generated exercises one at a time."""
+        for _ in range(count):
+            for point in learning_points:
+                yield self._mock_exercise(point, difficulty, exercise_type)
+                await asyncio.sleep(0)  # Let consumers run between exercises, as a real stream would
+
+    @staticmethod
+    def _mock_exercise(point: LearningPoint, difficulty: str, exercise_type: str) -> Exercise:
+        return Exercise(
+            question=f"Explain the concept of {point.name} in your own words.",
+            expected_answer=None,  # LLM would generate this
+            explanation=f"This question tests understanding of {point.description}",
+            difficulty_level=difficulty,
+            exercise_type=exercise_type,
+            related_learning_points=[point.name]
+        )
         
     async def grade_answer(self,
                           problem: str,
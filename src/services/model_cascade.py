@@ -0,0 +1,160 @@
+from dataclasses import replace
+from typing import List, Dict, Any, Optional, Sequence
+from .llm_service import LLMService
+from .grading_cascade import CascadeStats
+from ..models.exercise import Exercise
+from ..models.grading_result import GradingResult
+from ..models.grading_request import GradingRequest
+from ..models.batch_grading_result import BatchGradingResult
+from ..learning_point import LearningPoint
+
+FAST_TIER = "fast"
+STRONG_TIER = "strong"
+
+
+class ModelCascadeService(LLMService):
+    """
+    Grades with a fast, cheap service and re-grades with a stronger one only
+    when the first grade is uncertain.
+
+    A fast grade is escalated when its confidence is below
+    confidence_threshold, when its score is within boundary_margin points
+    of a pass/fail boundary, or when it failed. Every result's
+    metadata["tier"] names the tier that decided it; escalated results also
+    carry the fast tier's score and confidence.
+
+    Typically both tiers are OpenAIService instances with different models,
+    e.g. OpenAIService(model="gpt-4o-mini") and OpenAIService(model="gpt-4o");
+    pass share_client=True to both to have tiers with the same API key share
+    one pooled client.
+    """
+
+    def __init__(self,
+                 fast_service: LLMService,
+                 strong_service: LLMService,
+                 confidence_threshold: float = 0.8,
+                 boundaries: Sequence[float] = (60.0,),
+                 boundary_margin: float = 5.0):
+        """
+        Args:
+            fast_service: First-tier grader; also generates exercises
+            strong_service: Second-tier grader for escalated answers
+            confidence_threshold: Fast grades less confident than this are escalated
+            boundaries: Scores at which a grade changes meaning (e.g. the pass mark)
+            boundary_margin: Fast grades this close to a boundary are escalated
+        """
+        if not 0 <= confidence_threshold <= 1:
+            raise ValueError("confidence_threshold must be between 0 and 1")
+        if boundary_margin < 0:
+            raise ValueError("boundary_margin must be non-negative")
+        self.fast_service = fast_service
+        self.strong_service = strong_service
+        self.confidence_threshold = confidence_threshold
+        self.boundaries = tuple(boundaries)
+        self.boundary_margin = boundary_margin
+        self.stats = CascadeStats()
+
+    @staticmethod
+    def _failed(result: GradingResult) -> bool:
+        return bool(result.metadata.get("error"))
+
+    def escalation_reason(self, result: Optional[GradingResult]) -> Optional[str]:
+        """Why a fast-tier result needs the strong tier, or None if it can stand."""
+        if result is None or self._failed(result):
+            return "error"
+        if result.confidence < self.confidence_threshold:
+            return "low_confidence"
+        if any(abs(result.score - boundary) <= self.boundary_margin for boundary in self.boundaries):
+            return "near_boundary"
+        return None
+
+    def _decided(self, result: GradingResult, tier: str, **details: Any) -> GradingResult:
+        self.stats.record(tier)
+        return replace(result, metadata={**result.metadata, "tier": tier, **details})
+
+    def _combine(self,
+                 fast: Optional[GradingResult],
+                 reason: str,
+                 strong: Optional[GradingResult],
+                 strong_error: Optional[Exception]) -> Optional[GradingResult]:
+        """The result of an escalated grade, or None if neither tier produced one."""
+        if strong is not None and not (self._failed(strong) and fast is not None):
+            details = {"escalation_reason": reason}
+            if fast is not None:
+                details.update(fast_score=fast.score, fast_confidence=fast.confidence)
+            return self._decided(strong, STRONG_TIER, **details)
+        if fast is None:
+            return None
+        if strong_error is not None:
+            error = strong_error
+        else:
+            error = strong.metadata["error"] if strong is not None else "no result"
+        print(f"Error re-grading with the strong tier: {str(error)}")
+        return self._decided(fast, FAST_TIER, escalation_reason=reason, escalation_error=str(error))
+
+    async def generate_exercises(self,
+                               learning_points: List[LearningPoint],
+                               count: int = 1,
+                               difficulty: str = "intermediate",
+                               exercise_type: str = "open_ended") -> List[Exercise]:
+        """Delegates to the fast service."""
+        return await self.fast_service.generate_exercises(
+            learning_points, count, difficulty, exercise_type
+        )
+
+    async def grade_answer(self,
+                          problem: str,
+                          student_answer: str,
+                          expected_answer: str = None,
+                          metadata: Dict[str, Any] = None) -> GradingResult:
+        """Grade with the fast service, re-grading with the strong service if needed."""
+        try:
+            fast = await self.fast_service.grade_answer(problem, student_answer, expected_answer, metadata)
+        except Exception as e:
+            print(f"Error grading with the fast tier: {str(e)}")
+            fast = None
+        reason = self.escalation_reason(fast)
+        if reason is None:
+            return self._decided(fast, FAST_TIER)
+
+        strong, strong_error = None, None
+        try:
+            strong = await self.strong_service.grade_answer(problem, student_answer, expected_answer, metadata)
+        except Exception as e:
+            if fast is None:
+                raise
+            strong_error = e
+        return self._combine(fast, reason, strong, strong_error)
+
+    async def grade_answers(self,
+                           requests: List[GradingRequest],
+                           max_concurrency: Optional[int] = None,
+                           timeout: Optional[float] = None) -> BatchGradingResult:
+        """Grade a batch with the fast service, then re-grade the escalated requests as one batch."""
+        fast = await self.fast_service.grade_answers(requests, max_concurrency=max_concurrency, timeout=timeout)
+        batch = BatchGradingResult(results=[None] * len(requests))
+        reasons = {}
+        for index, result in enumerate(fast.results):
+            reason = self.escalation_reason(result)
+            if reason is None:
+                batch.results[index] = self._decided(result, FAST_TIER)
+            else:
+                reasons[index] = reason
+        if not reasons:
+            return batch
+
+        escalated = list(reasons)
+        strong = await self.strong_service.grade_answers(
+            [requests[index] for index in escalated],
+            max_concurrency=max_concurrency,
+            timeout=timeout
+        )
+        for position, index in enumerate(escalated):
+            result = self._combine(
+                fast.results[index], reasons[index],
+                strong.results[position], strong.errors.get(position)
+            )
+            batch.results[index] = result
+            if result is None:
+                batch.errors[index] = strong.errors.get(position) or fast.errors.get(index)
+        return batch
@@ -0,0 +1,137 @@
+"""
+Near-duplicate detection for exercise questions using SimHash.
+
+Each question is reduced to a 64-bit fingerprint in which similar texts
+differ in few bits. Two questions are near duplicates when their
+fingerprints are within max_distance bits (Hamming distance).
+
+Lookups avoid pairwise comparison by the pigeonhole principle: the
+fingerprint is split into max_distance + 1 blocks, and any fingerprint
+within max_distance bits must match at least one block exactly. Each block
+has a hash table from block value to item ids, so a lookup only verifies
+the few items sharing a block.
+"""
+import hashlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+from .request_keys import question_key
+
+FINGERPRINT_BITS = 64
+
+
+def _spread_byte(value: int) -> int:
+    # Move bit j of a byte to bit 16 * j, so adding spread values counts bits
+    # per position in 16-bit fields.
+    return sum(1 << (16 * bit) for bit in range(8) if value >> bit & 1)
+
+
+_SPREAD = [_spread_byte(value) for value in range(256)]
+
+
+def _features(text: str) -> List[str]:
+    """
+    Words of a normalized question.
+
+    Bigrams were left out on purpose: on question-length texts they push
+    reordered phrasings ("a list and a tuple" / "a tuple and a list") far
+    apart.
+    """
+    return question_key(text).split()
+
+
+def simhash(text: str) -> int:
+    """Compute the 64-bit SimHash fingerprint of a text."""
+    features = _features(text)
+    if not features:
+        return 0
+    # Sum every feature's bits per position in one big integer (16 bits per
+    # position) instead of looping over 64 positions for each feature.
+    total = 0
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        for index, byte in enumerate(digest):
+            total += _SPREAD[byte] << (128 * index)
+    counts = total.to_bytes(16 * FINGERPRINT_BITS // 8, "little")
+    half = len(features) / 2
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if counts[2 * bit] | counts[2 * bit + 1] << 8 > half:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class NearDuplicateIndex:
+    """
+    Incremental index of question fingerprints answering "is there a
+    near duplicate of this question?" in sub-linear time.
+
+    Items are identified by their insertion index.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        """
+        Args:
+            max_distance: Largest Hamming distance between fingerprints still
+                          treated as a duplicate (at most 15)
+        """
+        if not 0 <= max_distance < 16:
+            raise ValueError("max_distance must be between 0 and 15")
+        self.max_distance = max_distance
+        block_count = max_distance + 1
+        bounds = [FINGERPRINT_BITS * block // block_count for block in range(block_count + 1)]
+        # (shift, mask) selecting each block of the fingerprint
+        self._blocks: List[Tuple[int, int]] = [
+            (start, (1 << (end - start)) - 1) for start, end in zip(bounds, bounds[1:])
+        ]
+        self._tables: List[Dict[int, array]] = [{} for _ in self._blocks]
+        self._fingerprints = array("Q")
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def fingerprint(self, item_id: int) -> int:
+        return self._fingerprints[item_id]
+
+    def query(self, question: str) -> List[int]:
+        """Ids of indexed questions that are near duplicates, closest first."""
+        return [item_id for item_id, _ in self._matches(simhash(question))]
+
+    def _matches(self, fingerprint: int) -> List[Tuple[int, int]]:
+        seen = set()
+        matches = []
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            for item_id in table.get(fingerprint >> shift & mask, ()):
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                distance = (self._fingerprints[item_id] ^ fingerprint).bit_count()
+                if distance <= self.max_distance:
+                    matches.append((item_id, distance))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+    def contains(self, question: str) -> bool:
+        """Whether a near duplicate of question is indexed."""
+        return bool(self._matches(simhash(question)))
+
+    def add(self, question: str) -> int:
+        """Index a question, returning its id."""
+        return self._insert(simhash(question))
+
+    def add_if_unique(self, question: str) -> Optional[int]:
+        """Index a question unless a near duplicate is already indexed; returns its id or None."""
+        fingerprint = simhash(question)
+        if self._matches(fingerprint):
+            return None
+        return self._insert(fingerprint)
+
+    def _insert(self, fingerprint: int) -> int:
+        item_id = len(self._fingerprints)
+        self._fingerprints.append(fingerprint)
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            bucket = table.get(fingerprint >> shift & mask)
+            if bucket is None:
+                table[fingerprint >> shift & mask] = array("i", [item_id])
+            else:
+                bucket.append(item_id)
+        return item_id
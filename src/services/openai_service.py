@@ -1,23 +1,140 @@
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional
+import asyncio
 import os
 import json
-from openai import AsyncOpenAI
+from openai import APIConnectionError
 from ..models.grading_result import GradingResult
+from ..models.grading_event import GradingEvent
+from ..models.grading_request import GradingRequest
+from ..models.batch_grading_result import BatchGradingResult
 from .llm_service import LLMService
+from .concurrency import gather_bounded
+from .rate_limiter import RequestScheduler
+from .hedging import HedgingPolicy
+from .json_stream import JSONFieldStream, JSONObjectStream
+from .request_keys import question_key
+from .client_pool import HTTPClientOptions, acquire_client, create_client, release_client
 from ..models.exercise import Exercise
 from ..learning_point import LearningPoint
 
 class OpenAIService(LLMService):
     """OpenAI implementation of the LLM service."""
+
+    # Output tokens budgeted per grade and per generated exercise when
+    # charging requests against the tokens-per-minute limit
+    GRADING_OUTPUT_TOKENS = 300
+    EXERCISE_OUTPUT_TOKENS = 300
+    # Lower temperature for more consistent grading
+    GRADING_TEMPERATURE = 0.3
     
-    def __init__(self, api_key: str = None, model: str = "gpt-3.5-turbo"):
-        """Initialize the OpenAI service."""
+    def __init__(self,
+                 api_key: str = None,
+                 model: str = "gpt-3.5-turbo",
+                 max_concurrency: int = 10,
+                 max_packed_prompt_tokens: int = 3000,
+                 max_answers_per_pack: int = 20,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_retries: int = 3,
+                 raise_on_error: bool = True,
+                 base_url: Optional[str] = None,
+                 http_options: Optional[HTTPClientOptions] = None,
+                 share_client: bool = False,
+                 max_choices_per_request: int = 8,
+                 max_top_up_rounds: int = 2,
+                 hedging: Optional[HedgingPolicy] = None,
+                 hedge_model: Optional[str] = None,
+                 hedge_base_url: Optional[str] = None):
+        """
+        Initialize the OpenAI service.
+
+        Args:
+            api_key: OpenAI API key (defaults to OPENAI_API_KEY)
+            model: Chat model to use
+            max_concurrency: Upper bound on API calls in flight; the effective
+                             limit shrinks while the API is throttling
+            max_packed_prompt_tokens: Prompt budget for packed grading
+            max_answers_per_pack: Maximum answers graded in one packed request
+            requests_per_minute: Request budget, or None for no limit
+            tokens_per_minute: Estimated token budget, or None for no limit
+            max_retries: Retries for throttled (429), server and connection errors
+            raise_on_error: Raise from grade_answer and generate_exercises once
+                            retries are exhausted. If False, they return a
+                            zero-score result with metadata["error"] or an
+                            empty list instead. grade_answers always reports
+                            failures in the batch's errors
+            base_url: Alternative API endpoint (e.g. a proxy or compatible server)
+            http_options: Connection pool limits, keep-alive, HTTP/2 and timeouts
+            share_client: Reuse one client, and its warm connections, across all
+                          services with the same API key and base URL. A
+                          shared client is bound to one event loop, so only
+                          share between services used from the same loop
+            max_choices_per_request: Largest n sent in one exercise generation
+                                     request; larger counts are split up
+            max_top_up_rounds: Extra generation rounds used to replace
+                               duplicate or unparseable exercises
+            hedging: Hedge grading requests that are slower than the policy's
+                     latency percentile with a duplicate request; the faster
+                     response is used. Hedges share the original request's
+                     rate budget and concurrency slot.
+            hedge_model: Model for hedge requests (defaults to model)
+            hedge_base_url: Endpoint for hedge requests (defaults to base_url)
+
+        Close the service with aclose(), or use it as an async context manager,
+        to release its connections.
+        """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key must be provided or set in OPENAI_API_KEY environment variable")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.share_client = share_client
+        if share_client:
+            self.client = acquire_client(self.api_key, base_url, http_options)
+        else:
+            self.client = create_client(self.api_key, base_url, http_options)
+        self._owned_client = self.client
+        self.hedging = hedging
+        self.hedge_model = hedge_model or model
+        self.hedge_client = self.client
+        self._owned_hedge_client = None
+        if hedge_base_url is not None:
+            if share_client:
+                self.hedge_client = acquire_client(self.api_key, hedge_base_url, http_options)
+            else:
+                self.hedge_client = create_client(self.api_key, hedge_base_url, http_options)
+            self._owned_hedge_client = self.hedge_client
         self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_packed_prompt_tokens = max_packed_prompt_tokens
+        self.max_answers_per_pack = max_answers_per_pack
+        self.raise_on_error = raise_on_error
+        self.max_choices_per_request = max_choices_per_request
+        self.max_top_up_rounds = max_top_up_rounds
+        self.scheduler = RequestScheduler(
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+            max_concurrency=max_concurrency,
+            max_retries=max_retries,
+            retryable_exceptions=(APIConnectionError,)
+        )
+
+    async def aclose(self) -> None:
+        """Release the service's clients; shared clients close with their last user."""
+        clients = [self._owned_client, self._owned_hedge_client]
+        self._owned_client = self._owned_hedge_client = None
+        for client in clients:
+            if client is None:
+                continue
+            if self.share_client:
+                await release_client(client)
+            else:
+                await client.close()
+
+    async def __aenter__(self) -> "OpenAIService":
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        await self.aclose()
         
     def _create_prompt(self, 
                       learning_points: List[LearningPoint],
@@ -31,7 +148,7 @@ class OpenAIService(LLMService):
         type_instructions = {
             "multiple_choice": "Create multiple choice questions with 4 options (A, B, C, D). Include all options in the answer field.",
             "open_ended": "Create open-ended questions that test understanding.",
-            "coding": "Create coding exercises that require writing code. Include a sample solution in the answer field."
+            "coding": "Create coding exercises that require writing Python code. Include a sample solution in the answer field."
         }
         
         difficulty_instructions = {
@@ -40,6 +157,11 @@ class OpenAIService(LLMService):
             "advanced": "Make the questions challenging and test complex understanding."
         }
         
+        test_cases_field = ""
+        if exercise_type == "coding":
+            test_cases_field = (',\n    "test_cases": ["Python assert statements that pass for a correct solution, '
+                                'one check per item, using only names the question asks the student to define"]')
+
         return f"""Generate an educational exercise based on these learning points:
 
 {points_desc}
@@ -51,61 +173,216 @@ Respond with ONLY a JSON object that has these exact fields:
 {{
     "question": "the exercise question",
     "expected_answer": "the correct answer or solution",
-    "explanation": "explanation of why this is the correct answer"
+    "explanation": "explanation of why this is the correct answer"{test_cases_field}
 }}"""
 
+    def _exercise_messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "You are an expert educational content creator. Respond only with the requested JSON format."},
+            {"role": "user", "content": prompt}
+        ]
+
+    @staticmethod
+    def _exercise_from_dict(response_data: Dict[str, Any],
+                            learning_points: List[LearningPoint],
+                            difficulty: str,
+                            exercise_type: str) -> Exercise:
+        return Exercise(
+            question=response_data["question"],
+            expected_answer=response_data["expected_answer"],
+            explanation=response_data["explanation"],
+            difficulty_level=difficulty,
+            exercise_type=exercise_type,
+            related_learning_points=[point.name for point in learning_points],
+            test_cases=[str(test) for test in response_data.get("test_cases") or []]
+        )
+
     async def generate_exercises(self,
                                learning_points: List[LearningPoint],
                                count: int = 1,
                                difficulty: str = "intermediate",
                                exercise_type: str = "open_ended") -> List[Exercise]:
-        if not learning_points:
+        """
+        Generate exercises, splitting large counts into parallel requests.
+
+        Requests ask for at most max_choices_per_request choices each. Results
+        are deduplicated by normalized question text, and shortfalls (from
+        duplicates or unparseable choices) are topped up with up to
+        max_top_up_rounds further rounds of requests.
+        """
+        if not learning_points or count < 1:
             return []
             
         prompt = self._create_prompt(learning_points, difficulty, exercise_type)
-        
-        try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert educational content creator. Respond only with the requested JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                n=count,
-                temperature=0.7
+
+        def make_call(size: int):
+            return lambda: self._generate_choices(prompt, size, learning_points, difficulty, exercise_type)
+
+        exercises: List[Exercise] = []
+        seen = set()
+        needed = count
+        for _ in range(1 + self.max_top_up_rounds):
+            sizes = [
+                min(self.max_choices_per_request, needed - start)
+                for start in range(0, needed, self.max_choices_per_request)
+            ]
+            outcomes = await gather_bounded(
+                [make_call(size) for size in sizes], max_concurrency=self.max_concurrency
             )
-            
-            exercises = []
-            for choice in response.choices:
-                content = choice.message.content
+            produced = 0
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    if self.raise_on_error:
+                        raise outcome
+                    print(f"Error calling OpenAI API: {str(outcome)}")
+                    continue
+                produced += len(outcome)
+                for exercise in outcome:
+                    key = question_key(exercise.question)
+                    if key not in seen:
+                        seen.add(key)
+                        exercises.append(exercise)
+            needed = count - len(exercises)
+            if needed <= 0 or produced == 0:
+                break
+        return exercises[:count]
+
+    async def _generate_choices(self,
+                                prompt: str,
+                                count: int,
+                                learning_points: List[LearningPoint],
+                                difficulty: str,
+                                exercise_type: str) -> List[Exercise]:
+        """Request count choices in one completion, skipping unparseable ones; raises on API errors."""
+        response = await self._create_completion(
+            self._estimate_tokens(prompt) + count * self.EXERCISE_OUTPUT_TOKENS,
+            messages=self._exercise_messages(prompt),
+            n=count,
+            temperature=0.7
+        )
+
+        exercises = []
+        for choice in response.choices:
+            content = choice.message.content
+            try:
+                response_data = json.loads(content)
+                exercise = self._exercise_from_dict(
+                    response_data, learning_points, difficulty, exercise_type
+                )
+                exercises.append(exercise)
+            except Exception as e:
+                print(f"Failed to parse exercise from response: {str(e)}")
+                print(f"Response content: {content}")
+                continue
+        return exercises
+
+    async def astream_exercises(self,
+                                learning_points: List[LearningPoint],
+                                count: int = 1,
+                                difficulty: str = "intermediate",
+                                exercise_type: str = "open_ended") -> AsyncIterator[Exercise]:
+        """
+        Stream exercises from streamed completions of at most
+        max_choices_per_request choices each.
+
+        Each choice's text is parsed incrementally, so an exercise is yielded
+        as soon as its JSON object closes, while other choices (and other
+        requests) are still being generated. Exercises repeating an earlier
+        question are skipped, as in generate_exercises, but shortfalls are
+        not topped up.
+        """
+        if not learning_points or count < 1:
+            return
+
+        prompt = self._create_prompt(learning_points, difficulty, exercise_type)
+        sizes = [
+            min(self.max_choices_per_request, count - start)
+            for start in range(0, count, self.max_choices_per_request)
+        ]
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def pump(size: int) -> None:
+            try:
+                async with slots:
+                    async for exercise in self._stream_choices(
+                            prompt, size, learning_points, difficulty, exercise_type):
+                        queue.put_nowait(exercise)
+            except Exception as e:
+                queue.put_nowait(e)
+            finally:
+                queue.put_nowait(None)
+
+        tasks = [asyncio.ensure_future(pump(size)) for size in sizes]
+        seen = set()
+        try:
+            running = len(tasks)
+            while running:
+                item = await queue.get()
+                if item is None:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    # Covers errors raised mid-stream too (dropped connections, timeouts)
+                    if self.raise_on_error:
+                        raise item
+                    print(f"Error calling OpenAI API: {str(item)}")
+                else:
+                    key = question_key(item.question)
+                    if key not in seen:
+                        seen.add(key)
+                        yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _stream_choices(self,
+                              prompt: str,
+                              count: int,
+                              learning_points: List[LearningPoint],
+                              difficulty: str,
+                              exercise_type: str) -> AsyncIterator[Exercise]:
+        """Stream count choices from one completion, skipping unparseable ones; raises on API errors."""
+        parsers: Dict[int, JSONObjectStream] = {}
+        stream = await self._create_completion(
+            self._estimate_tokens(prompt) + count * self.EXERCISE_OUTPUT_TOKENS,
+            messages=self._exercise_messages(prompt),
+            n=count,
+            temperature=0.7,
+            stream=True
+        )
+        async for chunk in stream:
+            for choice in chunk.choices:
+                content = choice.delta.content
+                if not content:
+                    continue
+                parser = parsers.setdefault(choice.index, JSONObjectStream())
                 try:
-                    response_data = json.loads(content)
-                    exercise = Exercise(
-                        question=response_data["question"],
-                        expected_answer=response_data["expected_answer"],
-                        explanation=response_data["explanation"],
-                        difficulty_level=difficulty,
-                        exercise_type=exercise_type,
-                        related_learning_points=[point.name for point in learning_points]
-                    )
-                    exercises.append(exercise)
-                except Exception as e:
+                    objects = parser.feed(content)
+                except ValueError as e:
                     print(f"Failed to parse exercise from response: {str(e)}")
-                    print(f"Response content: {content}")
+                    parsers[choice.index] = JSONObjectStream()
                     continue
-                    
-            return exercises
-            
-        except Exception as e:
-            print(f"Error calling OpenAI API: {str(e)}")
-            return []
-            
+                for response_data in objects:
+                    try:
+                        yield self._exercise_from_dict(
+                            response_data, learning_points, difficulty, exercise_type
+                        )
+                    except (KeyError, TypeError) as e:
+                        print(f"Failed to parse exercise from response: {str(e)}")
+
     def _create_grading_prompt(self,
                              problem: str,
                              student_answer: str,
                              expected_answer: str = None,
-                             metadata: Dict[str, Any] = None) -> str:
-        """Create a prompt for grading an answer."""
+                             metadata: Dict[str, Any] = None,
+                             score_first: bool = False) -> str:
+        """
+        Create a prompt for grading an answer.
+
+        With score_first, confidence is requested as a top-level field right
+        after the score, so both are generated before the feedback.
+        """
         prompt_parts = [
             "Grade the following student answer:",
             f"\nProblem: {problem}"
@@ -116,18 +393,23 @@ Respond with ONLY a JSON object that has these exact fields:
             
         prompt_parts.append(f"\nStudent Answer: {student_answer}")
         
-        if metadata:
-            context_parts = []
-            if "topic" in metadata:
-                context_parts.append(f"Topic: {metadata['topic']}")
-            if "difficulty" in metadata:
-                context_parts.append(f"Difficulty Level: {metadata['difficulty']}")
-            if "student_level" in metadata:
-                context_parts.append(f"Student Level: {metadata['student_level']}")
-            if context_parts:
-                prompt_parts.append("\nContext:")
-                prompt_parts.extend(f"- {part}" for part in context_parts)
-        
+        prompt_parts.extend(self._format_grading_context(metadata))
+
+        if score_first:
+            prompt_parts.append("""
+Provide your evaluation in the following JSON format, with the fields in this order:
+{
+    "score": <number between 0 and 100>,
+    "confidence": <number between 0 and 1 indicating grading confidence>,
+    "feedback": "detailed explanation of the grade and suggestions for improvement",
+    "metadata": {
+        "key_concepts_understood": ["list", "of", "concepts", "demonstrated"],
+        "areas_for_improvement": ["list", "of", "areas", "to", "work", "on"],
+        "mastery_level": "beginner|intermediate|advanced"
+    }
+}""")
+            return "\n".join(prompt_parts)
+
         prompt_parts.append("""
 Provide your evaluation in the following JSON format:
 {
@@ -142,52 +424,409 @@ Provide your evaluation in the following JSON format:
 }""")
         
         return "\n".join(prompt_parts)
+
+    @staticmethod
+    def _format_grading_context(metadata: Dict[str, Any] = None) -> List[str]:
+        """Format the grading-relevant metadata fields as prompt lines."""
+        if not metadata:
+            return []
+        context_parts = []
+        if "topic" in metadata:
+            context_parts.append(f"Topic: {metadata['topic']}")
+        if "difficulty" in metadata:
+            context_parts.append(f"Difficulty Level: {metadata['difficulty']}")
+        if "student_level" in metadata:
+            context_parts.append(f"Student Level: {metadata['student_level']}")
+        if "test_results" in metadata:
+            context_parts.append(f"Test Results: {metadata['test_results']}")
+        if not context_parts:
+            return []
+        return ["\nContext:"] + [f"- {part}" for part in context_parts]
+
+    def _create_packed_grading_prompt(self,
+                                    problem: str,
+                                    student_answers: List[str],
+                                    expected_answer: str = None,
+                                    metadata: Dict[str, Any] = None) -> str:
+        """Create a prompt grading several answers to the same problem at once."""
+        prompt_parts = [self._packed_grading_prefix(problem, expected_answer, metadata)]
+        for index, student_answer in enumerate(student_answers):
+            prompt_parts.append(self._packed_answer_section(index, student_answer))
+        prompt_parts.append(f"""
+Grade each of the {len(student_answers)} student answers independently.
+Respond with ONLY a JSON array containing one object per answer, in answer order:
+[
+    {{
+        "answer": <answer number>,
+        "score": <number between 0 and 100>,
+        "feedback": "detailed explanation of the grade and suggestions for improvement",
+        "metadata": {{
+            "key_concepts_understood": ["list", "of", "concepts", "demonstrated"],
+            "areas_for_improvement": ["list", "of", "areas", "to", "work", "on"],
+            "mastery_level": "beginner|intermediate|advanced",
+            "confidence": <number between 0 and 1 indicating grading confidence>
+        }}
+    }}
+]""")
+        return "\n".join(prompt_parts)
+
+    def _packed_grading_prefix(self,
+                               problem: str,
+                               expected_answer: str = None,
+                               metadata: Dict[str, Any] = None) -> str:
+        prompt_parts = [
+            "Grade each of the following student answers to the same problem:",
+            f"\nProblem: {problem}"
+        ]
+        if expected_answer:
+            prompt_parts.append(f"\nExpected Answer: {expected_answer}")
+        prompt_parts.extend(self._format_grading_context(metadata))
+        return "\n".join(prompt_parts)
+
+    @staticmethod
+    def _packed_answer_section(index: int, student_answer: str) -> str:
+        return f"\nStudent Answer {index + 1}:\n{student_answer}"
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token estimate (about four characters per token)."""
+        return len(text) // 4 + 1
         
+    async def _create_completion(self, estimated_tokens: int, hedge: bool = False, **kwargs):
+        """
+        Create a chat completion through the scheduler, which enforces the
+        rate budgets and retries throttled or transient failures.
+
+        With hedge and a hedging policy, each attempt is hedged by the policy.
+        """
+        call = lambda: self.client.chat.completions.create(model=self.model, **kwargs)
+        if hedge and self.hedging is not None:
+            primary = call
+            secondary = lambda: self.hedge_client.chat.completions.create(model=self.hedge_model, **kwargs)
+            call = lambda: self.hedging.run(primary, secondary)
+        return await self.scheduler.run(call, estimated_tokens)
+
+    async def _create_grading_completion(self, prompt: str, expected_grades: int = 1) -> str:
+        """Send a grading prompt to the API and return the response content."""
+        response = await self._create_completion(
+            self._estimate_tokens(prompt) + expected_grades * self.GRADING_OUTPUT_TOKENS,
+            # Packed prompts take longer; keep them out of the single-grade latency distribution
+            hedge=expected_grades == 1,
+            messages=self._grading_messages(prompt),
+            temperature=self.GRADING_TEMPERATURE
+        )
+        return response.choices[0].message.content
+
+    @staticmethod
+    def _grading_messages(prompt: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": "You are an expert teacher and grader. Grade the student's answer fairly and provide constructive feedback."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_grading_response(self, content: str) -> GradingResult:
+        """Parse the JSON grading response into a GradingResult."""
+        result = json.loads(content)
+        return self._grading_result_from_dict(result)
+
+    @staticmethod
+    def _grading_result_from_dict(result: Dict[str, Any]) -> GradingResult:
+        return GradingResult(
+            score=float(result["score"]),
+            feedback=result["feedback"],
+            metadata=result["metadata"],
+            confidence=float(result["metadata"].get("confidence", 1.0))
+        )
+
     async def grade_answer(self,
                           problem: str,
                           student_answer: str,
                           expected_answer: str = None,
                           metadata: Dict[str, Any] = None) -> GradingResult:
         """Grade a student's answer using OpenAI's API."""
+        if self.raise_on_error:
+            return await self._request_grade(
+                GradingRequest(problem, student_answer, expected_answer, metadata)
+            )
         prompt = self._create_grading_prompt(
             problem, student_answer, expected_answer, metadata
         )
-        
+
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert teacher and grader. Grade the student's answer fairly and provide constructive feedback."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3  # Lower temperature for more consistent grading
-            )
-            
-            content = response.choices[0].message.content
-            try:
-                result = json.loads(content)
-                return GradingResult(
-                    score=float(result["score"]),
-                    feedback=result["feedback"],
-                    metadata=result["metadata"],
-                    confidence=float(result["metadata"].get("confidence", 1.0))
-                )
-            except Exception as e:
-                print(f"Failed to parse grading response: {str(e)}")
-                print(f"Response content: {content}")
-                # Return a default result indicating failure
-                return GradingResult(
-                    score=0,
-                    feedback="Failed to grade answer due to technical error.",
-                    metadata={"error": str(e)},
-                    confidence=0
-                )
-                
+            content = await self._create_grading_completion(prompt)
         except Exception as e:
             print(f"Error calling OpenAI API: {str(e)}")
-            return GradingResult(
-                score=0,
-                feedback=f"Failed to grade answer: {str(e)}",
-                metadata={"error": str(e)},
-                confidence=0
+            return self._failed_grading_result(f"Failed to grade answer: {str(e)}", e)
+
+        try:
+            return self._parse_grading_response(content)
+        except Exception as e:
+            print(f"Failed to parse grading response: {str(e)}")
+            print(f"Response content: {content}")
+            # Return a default result indicating failure
+            return self._failed_grading_result("Failed to grade answer due to technical error.", e)
+
+    @staticmethod
+    def _failed_grading_result(feedback: str, error: Exception) -> GradingResult:
+        return GradingResult(
+            score=0,
+            feedback=feedback,
+            metadata={"error": str(error)},
+            confidence=0
+        )
+
+    async def astream_grade(self,
+                            problem: str,
+                            student_answer: str,
+                            expected_answer: str = None,
+                            metadata: Dict[str, Any] = None) -> AsyncIterator[GradingEvent]:
+        """
+        Grade a student's answer from a streamed completion.
+
+        The score (and confidence) are requested ahead of the feedback and
+        yielded as soon as they are parsed, followed by the feedback as it is
+        generated and finally the complete GradingResult. Errors are handled
+        as in grade_answer: with raise_on_error unset, a failed grading ends
+        with a zero-score result carrying the error in its metadata. If the
+        stream failed after its score was yielded, the result supersedes that
+        score, which is kept in the result's metadata as "retracted_score".
+        """
+        prompt = self._create_grading_prompt(
+            problem, student_answer, expected_answer, metadata, score_first=True
+        )
+        fields: Dict[str, Any] = {}
+        score_sent: Optional[float] = None
+        try:
+            stream = await self._create_completion(
+                self._estimate_tokens(prompt) + self.GRADING_OUTPUT_TOKENS,
+                messages=self._grading_messages(prompt),
+                temperature=self.GRADING_TEMPERATURE,
+                stream=True
             )
+            parser = JSONFieldStream()
+            async for chunk in stream:
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if not content:
+                    continue
+                for kind, key, value in parser.feed(content):
+                    if kind == "value":
+                        fields[key] = value
+                    if score_sent is None and "score" in fields and ("confidence" in fields or key == "feedback"):
+                        event = GradingEvent(
+                            "score",
+                            score=float(fields["score"]),
+                            confidence=float(fields["confidence"]) if "confidence" in fields else None
+                        )
+                        score_sent = event.score
+                        yield event
+                    if kind == "delta" and key == "feedback":
+                        yield GradingEvent("feedback", text=value)
+            result = self._streamed_grading_result(fields)
+        except Exception as e:
+            if self.raise_on_error:
+                raise
+            print(f"Failed to stream grading response: {str(e)}")
+            result = self._failed_grading_result(f"Failed to grade answer: {str(e)}", e)
+            if score_sent is not None:
+                result.metadata["retracted_score"] = score_sent
+
+        if score_sent is None:
+            yield GradingEvent("score", score=result.score, confidence=result.confidence)
+        yield GradingEvent("result", score=result.score, confidence=result.confidence, result=result)
+
+    @staticmethod
+    def _streamed_grading_result(fields: Dict[str, Any]) -> GradingResult:
+        """Build a GradingResult from the fields of a score-first grading response."""
+        metadata = dict(fields.get("metadata") or {})
+        confidence = float(fields.get("confidence", metadata.get("confidence", 1.0)))
+        metadata.setdefault("confidence", confidence)
+        return GradingResult(
+            score=float(fields["score"]),
+            feedback=fields["feedback"],
+            metadata=metadata,
+            confidence=confidence
+        )
+
+    async def _request_grade(self, request: GradingRequest) -> GradingResult:
+        """Grade a single request, raising on API or parsing errors."""
+        prompt = self._create_grading_prompt(
+            request.problem, request.student_answer, request.expected_answer, request.metadata
+        )
+        content = await self._create_grading_completion(prompt)
+        return self._parse_grading_response(content)
+
+    async def grade_answers(self,
+                           requests: List[GradingRequest],
+                           max_concurrency: Optional[int] = None,
+                           timeout: Optional[float] = None,
+                           pack_answers: bool = False) -> BatchGradingResult:
+        """
+        Grade a batch of answers concurrently using OpenAI's API.
+
+        Unlike grade_answer, failed API calls and unparseable responses are
+        reported in the batch's errors rather than as zero-score results.
+
+        Args:
+            requests: The answers to grade
+            max_concurrency: Maximum number of API calls in flight
+            timeout: Optional timeout in seconds for each API call
+            pack_answers: Grade answers sharing the same problem, expected
+                          answer and metadata together in packed requests
+        """
+        if not pack_answers:
+            outcomes = await gather_bounded(
+                [lambda request=request: self._request_grade(request) for request in requests],
+                max_concurrency=max_concurrency or self.max_concurrency,
+                timeout=timeout
+            )
+            return self._collect_batch(outcomes)
+
+        groups: Dict[str, List[int]] = {}
+        for index, request in enumerate(requests):
+            key = json.dumps(
+                [request.problem, request.expected_answer, request.metadata],
+                sort_keys=True, default=str
+            )
+            groups.setdefault(key, []).append(index)
+
+        calls = []
+        call_indices = []
+        for indices in groups.values():
+            first = requests[indices[0]]
+            answers = [requests[index].student_answer for index in indices]
+            for pack in self._split_into_packs(
+                    first.problem, answers, first.expected_answer, first.metadata):
+                pack_indices = [indices[position] for position in pack]
+                call_indices.append(pack_indices)
+                if len(pack_indices) == 1:
+                    calls.append(lambda request=requests[pack_indices[0]]: self._request_grade(request))
+                else:
+                    calls.append(lambda first=first, pack_indices=pack_indices: self._request_packed_grades(
+                        first.problem,
+                        [requests[index].student_answer for index in pack_indices],
+                        first.expected_answer,
+                        first.metadata
+                    ))
+
+        outcomes = await gather_bounded(
+            calls,
+            max_concurrency=max_concurrency or self.max_concurrency,
+            timeout=timeout
+        )
+
+        aligned: List[Any] = [None] * len(requests)
+        for pack_indices, outcome in zip(call_indices, outcomes):
+            if isinstance(outcome, Exception):
+                for index in pack_indices:
+                    aligned[index] = outcome
+            elif isinstance(outcome, GradingResult):
+                aligned[pack_indices[0]] = outcome
+            else:
+                for index, result in zip(pack_indices, outcome):
+                    aligned[index] = result
+        return self._collect_batch(aligned)
+
+    async def grade_answers_packed(self,
+                                   problem: str,
+                                   student_answers: List[str],
+                                   expected_answer: str = None,
+                                   metadata: Dict[str, Any] = None,
+                                   max_concurrency: Optional[int] = None,
+                                   timeout: Optional[float] = None) -> BatchGradingResult:
+        """
+        Grade many answers to the same problem with packed requests.
+
+        The problem, expected answer and context are sent once per request,
+        followed by as many answers as fit in max_packed_prompt_tokens (and at
+        most max_answers_per_pack). Each request returns a JSON array with one
+        grade per answer.
+
+        Returns:
+            BatchGradingResult aligned with student_answers; answers of a pack
+            that came back malformed are graded one by one, and every answer
+            whose request failed is reported in errors
+        """
+        requests = [
+            GradingRequest(problem, answer, expected_answer, metadata)
+            for answer in student_answers
+        ]
+        return await self.grade_answers(
+            requests,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            pack_answers=True
+        )
+
+    def _split_into_packs(self,
+                          problem: str,
+                          student_answers: List[str],
+                          expected_answer: str = None,
+                          metadata: Dict[str, Any] = None) -> List[List[int]]:
+        """Split answer positions into packs that fit the prompt token budget."""
+        prefix_tokens = self._estimate_tokens(
+            self._create_packed_grading_prompt(problem, [], expected_answer, metadata)
+        )
+        packs: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = prefix_tokens
+        for position, answer in enumerate(student_answers):
+            answer_tokens = self._estimate_tokens(self._packed_answer_section(position, answer))
+            if current and (current_tokens + answer_tokens > self.max_packed_prompt_tokens
+                            or len(current) >= self.max_answers_per_pack):
+                packs.append(current)
+                current = []
+                current_tokens = prefix_tokens
+            current.append(position)
+            current_tokens += answer_tokens
+        if current:
+            packs.append(current)
+        return packs
+
+    async def _request_packed_grades(self,
+                                     problem: str,
+                                     student_answers: List[str],
+                                     expected_answer: str = None,
+                                     metadata: Dict[str, Any] = None) -> List[GradingResult]:
+        """
+        Grade several answers in one request.
+
+        If the packed response is malformed, each answer is graded on its own
+        instead; answers whose own request fails are returned as exceptions.
+        """
+        prompt = self._create_packed_grading_prompt(
+            problem, student_answers, expected_answer, metadata
+        )
+        content = await self._create_grading_completion(prompt, len(student_answers))
+        try:
+            return self._parse_packed_grading_response(content, len(student_answers))
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Malformed packed grading response, grading answers one by one: {str(e)}")
+        return await gather_bounded(
+            [lambda answer=answer: self._request_grade(
+                GradingRequest(problem, answer, expected_answer, metadata))
+             for answer in student_answers],
+            max_concurrency=len(student_answers)
+        )
+
+    def _parse_packed_grading_response(self, content: str, expected_count: int) -> List[GradingResult]:
+        """
+        Parse a JSON array of grades into GradingResults ordered by answer number.
+
+        Raises:
+            ValueError: If the array does not hold exactly one grade for each
+                        answer number 1..expected_count
+        """
+        grades = json.loads(content)
+        if isinstance(grades, dict):
+            grades = grades.get("grades", grades.get("results"))
+        if not isinstance(grades, list) or len(grades) != expected_count:
+            raise ValueError(f"Expected a JSON array of {expected_count} grades")
+        try:
+            numbers = [int(grade["answer"]) for grade in grades]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Every grade must carry its answer number")
+        if sorted(numbers) != list(range(1, expected_count + 1)):
+            raise ValueError(f"Expected grades numbered 1 to {expected_count}, got {numbers}")
+        by_number = dict(zip(numbers, grades))
+        return [self._grading_result_from_dict(by_number[number])
+                for number in range(1, expected_count + 1)]
@@ -0,0 +1,192 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+
+    Used both for request budgets (one token per request) and for token
+    budgets (one token per estimated LLM token).
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Maximum burst size (defaults to one minute's worth)
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until amount tokens are available and take them."""
+        # A request larger than the bucket could never proceed; let it drain the bucket instead
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket so no tokens are handed out for about seconds."""
+        self._refill()
+        self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit that adapts to throttling (additive increase,
+    multiplicative decrease).
+
+    Each throttled request halves the limit; after a full limit's worth of
+    consecutive successes the limit grows by one, up to maximum.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, initial: Optional[int] = None):
+        if minimum < 1 or maximum < minimum:
+            raise ValueError("limits must satisfy 1 <= minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = initial if initial is not None else maximum
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self.limit += 1
+            self._successes = 0
+
+    def on_throttle(self) -> None:
+        self.limit = max(self.minimum, self.limit // 2)
+        self._successes = 0
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the delay requested by a Retry-After(-ms) header on an HTTP error, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after") is not None:
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass  # HTTP-date values fall back to exponential backoff
+    return None
+
+
+class RequestScheduler:
+    """
+    Runs API calls under request and token budgets with adaptive concurrency,
+    retrying throttled and transient failures with jittered exponential backoff.
+    """
+
+    def __init__(self,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_concurrency: int = 10,
+                 max_retries: int = 3,
+                 base_delay: float = 0.5,
+                 max_delay: float = 30.0,
+                 retryable_exceptions: Tuple[Type[BaseException], ...] = ()):
+        """
+        Args:
+            requests_per_minute: Request budget, or None for no limit
+            tokens_per_minute: Estimated token budget, or None for no limit
+            max_concurrency: Upper bound of the adaptive concurrency limit
+            max_retries: Retries after the first attempt before giving up
+            base_delay: Backoff before the first retry, doubled on each retry
+            max_delay: Cap on any single backoff
+            retryable_exceptions: Extra exception types (e.g. connection errors)
+                                  to retry besides HTTP 429 and 5xx errors
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_exceptions = (asyncio.TimeoutError, ConnectionError) + tuple(retryable_exceptions)
+        self.throttled = 0  # Number of 429 responses seen
+        self.retries = 0  # Number of retried attempts
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+
+    def _classify(self, error: Exception) -> Tuple[bool, bool]:
+        """Return (retryable, throttled) for an error."""
+        status = getattr(error, "status_code", None)
+        if status == 429:
+            return True, True
+        if isinstance(status, int) and status >= 500:
+            return True, False
+        return isinstance(error, self.retryable_exceptions), False
+
+    async def run(self, call: Callable[[], Awaitable[T]], estimated_tokens: int = 0) -> T:
+        """
+        Run call within the budgets, retrying retryable failures.
+
+        Raises:
+            The last error once retries are exhausted, or any non-retryable error
+        """
+        attempt = 0
+        while True:
+            if self.requests is not None:
+                await self.requests.acquire(1)
+            if self.tokens is not None and estimated_tokens:
+                await self.tokens.acquire(estimated_tokens)
+            await self.concurrency.acquire()
+            try:
+                result = await call()
+            except Exception as e:
+                retryable, throttled = self._classify(e)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = retry_after_seconds(e)
+                if throttled:
+                    self.throttled += 1
+                    self.concurrency.on_throttle()
+                    if delay is not None and self.requests is not None:
+                        self.requests.pause(delay)
+                if delay is None:
+                    delay = self._backoff(attempt)
+            else:
+                self.concurrency.on_success()
+                return result
+            finally:
+                await self.concurrency.release()
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
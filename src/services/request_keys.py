@@ -0,0 +1,79 @@
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional
+from ..learning_point import LearningPoint
+
+# Metadata fields that change the grading prompt or, for code, the tests run;
+# other fields (e.g. time_spent) do not affect the grade and are left out of the key.
+GRADING_METADATA_FIELDS = ("topic", "difficulty", "student_level", "test_results", "test_cases")
+
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_text(text: Optional[str], case_sensitive: bool = False) -> Optional[str]:
+    """Collapse runs of whitespace, strip the ends and (optionally) casefold."""
+    if text is None:
+        return None
+    text = _WHITESPACE.sub(" ", text).strip()
+    return text if case_sensitive else text.casefold()
+
+
+def question_key(question: str) -> str:
+    """Normalize an exercise question for duplicate detection (ignores case, spacing and punctuation)."""
+    return normalize_text(_PUNCTUATION.sub(" ", question))
+
+
+def _digest(payload: Any) -> str:
+    encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def is_code_exercise(metadata: Optional[Dict[str, Any]]) -> bool:
+    """Whether grading metadata marks an exercise as code (exercise_type "coding" or test_cases)."""
+    metadata = metadata or {}
+    return metadata.get("exercise_type") == "coding" or bool(metadata.get("test_cases"))
+
+
+def grading_key(problem: str,
+                student_answer: str,
+                expected_answer: str = None,
+                metadata: Dict[str, Any] = None,
+                model: str = None,
+                case_sensitive: bool = False) -> str:
+    """
+    Build a canonical hash identifying a grading request.
+
+    Requests whose text differs only in whitespace (and case, unless
+    case_sensitive) map to the same key. Answers to coding exercises
+    (metadata with exercise_type "coding" or test_cases) are only trimmed,
+    since case and indentation change what code does.
+    """
+    metadata = metadata or {}
+    if is_code_exercise(metadata):
+        answer = student_answer.strip() if student_answer is not None else None
+    else:
+        answer = normalize_text(student_answer, case_sensitive)
+    return _digest({
+        "problem": normalize_text(problem, case_sensitive),
+        "student_answer": answer,
+        "expected_answer": normalize_text(expected_answer, case_sensitive),
+        "metadata": {field: metadata[field] for field in GRADING_METADATA_FIELDS if field in metadata},
+        "model": model,
+    })
+
+
+def generation_key(learning_points: List[LearningPoint],
+                   count: int = 1,
+                   difficulty: str = "intermediate",
+                   exercise_type: str = "open_ended",
+                   model: str = None) -> str:
+    """Build a hash identifying an exercise generation request."""
+    return _digest({
+        "learning_points": [[point.name, point.description] for point in learning_points],
+        "count": count,
+        "difficulty": difficulty,
+        "exercise_type": exercise_type,
+        "model": model,
+    })
@@ -0,0 +1,162 @@
+"""
+Cosine-similarity search over fixed-size float32 vectors.
+
+Vectors are L2-normalized on insert, so similarity is a dot product.
+BruteForceIndex scores every vector; LSHIndex narrows the search to
+vectors sharing a random-hyperplane hash bucket with the query, then
+scores only those.
+"""
+import hashlib
+import heapq
+import math
+import operator
+import random
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+from .request_keys import question_key
+
+
+def normalize(vector: Sequence[float]) -> array:
+    """Return vector scaled to unit length as float32 (zero vectors stay zero)."""
+    length = math.sqrt(sum(value * value for value in vector))
+    if length == 0:
+        return array("f", vector)
+    return array("f", (value / length for value in vector))
+
+
+def dot(first: Sequence[float], second: Sequence[float]) -> float:
+    return sum(map(operator.mul, first, second))
+
+
+class HashingEmbedder:
+    """
+    Dependency-free embedding of text by signed feature hashing of its words.
+
+    Similarity is lexical (shared words), not semantic; pass an embedding
+    model's function to ExerciseBank when paraphrases should match too.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def __call__(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for word in question_key(text).split():
+            digest = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        return vector
+
+
+class BruteForceIndex:
+    """
+    Exact nearest-neighbour search by scoring every vector.
+
+    Vectors live in one flat float32 buffer, which may be a read-only
+    memoryview of a mapped file; vectors added later go to an in-memory
+    array.
+    """
+
+    def __init__(self, dim: int, vectors: Optional[Sequence[float]] = None):
+        """
+        Args:
+            dim: Vector dimension
+            vectors: Existing flat buffer of normalized vectors (e.g. memory-mapped)
+        """
+        if dim < 1:
+            raise ValueError("dim must be positive")
+        self.dim = dim
+        self._base = vectors if vectors is not None else array("f")
+        self._base_count = len(self._base) // dim
+        self._added = array("f")
+
+    def __len__(self) -> int:
+        return self._base_count + len(self._added) // self.dim
+
+    def vector(self, vector_id: int) -> Sequence[float]:
+        if vector_id < self._base_count:
+            start = vector_id * self.dim
+            return self._base[start:start + self.dim]
+        start = (vector_id - self._base_count) * self.dim
+        return self._added[start:start + self.dim]
+
+    def add(self, vector: Sequence[float]) -> int:
+        """Normalize and store a vector, returning its id."""
+        if len(vector) != self.dim:
+            raise ValueError(f"Expected a vector of dimension {self.dim}, got {len(vector)}")
+        vector_id = len(self)
+        self._added.extend(normalize(vector))
+        return vector_id
+
+    def _candidates(self, query: Sequence[float]):
+        return range(len(self))
+
+    def search(self, vector: Sequence[float], k: int = 10) -> List[Tuple[int, float]]:
+        """The k most similar (id, cosine similarity) pairs, most similar first."""
+        if len(vector) != self.dim:
+            raise ValueError(f"Expected a vector of dimension {self.dim}, got {len(vector)}")
+        query = normalize(vector)
+        return heapq.nlargest(
+            k,
+            ((vector_id, dot(query, self.vector(vector_id))) for vector_id in self._candidates(query)),
+            key=operator.itemgetter(1)
+        )
+
+    def iter_buffers(self):
+        """The stored vectors as float32 buffers, in id order."""
+        return (self._base, self._added)
+
+
+class LSHIndex(BruteForceIndex):
+    """
+    Approximate search with random-hyperplane locality-sensitive hashing.
+
+    Each of tables hash tables keys a vector by which side of bits random
+    hyperplanes it falls on; vectors at a small angle collide in at least
+    one table with high probability. Only colliding vectors are scored, so
+    queries with no similar vector return quickly with few or no results.
+    """
+
+    def __init__(self,
+                 dim: int,
+                 vectors: Optional[Sequence[float]] = None,
+                 tables: int = 8,
+                 bits: int = 12,
+                 seed: int = 0):
+        super().__init__(dim, vectors)
+        rng = random.Random(seed)
+        self._planes = [
+            [array("f", (rng.gauss(0.0, 1.0) for _ in range(dim))) for _ in range(bits)]
+            for _ in range(tables)
+        ]
+        self._tables: List[Dict[int, array]] = [{} for _ in range(tables)]
+        for vector_id in range(self._base_count):
+            self._insert(vector_id, self.vector(vector_id))
+
+    def _keys(self, vector: Sequence[float]) -> List[int]:
+        keys = []
+        for planes in self._planes:
+            key = 0
+            for bit, plane in enumerate(planes):
+                if dot(vector, plane) >= 0:
+                    key |= 1 << bit
+            keys.append(key)
+        return keys
+
+    def _insert(self, vector_id: int, vector: Sequence[float]) -> None:
+        for table, key in zip(self._tables, self._keys(vector)):
+            bucket = table.get(key)
+            if bucket is None:
+                table[key] = array("i", [vector_id])
+            else:
+                bucket.append(vector_id)
+
+    def add(self, vector: Sequence[float]) -> int:
+        vector_id = super().add(vector)
+        self._insert(vector_id, self.vector(vector_id))
+        return vector_id
+
+    def _candidates(self, query: Sequence[float]):
+        candidates = set()
+        for table, key in zip(self._tables, self._keys(query)):
+            candidates.update(table.get(key, ()))
+        return candidates
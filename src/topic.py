@@ -1,12 +1,16 @@
-from typing import List, Set, Dict
+from typing import AbstractSet, Dict, KeysView, Set
 from .learning_point import LearningPoint
+from .views import SetView
 
 class Topic:
+    __slots__ = ("name", "description", "prerequisites", "learning_points")
+
     def __init__(self, name: str, description: str = ""):
         self.name = name
         self.description = description
         self.prerequisites: Set[str] = set()
-        self.learning_points: List[LearningPoint] = []
+        # Insertion-ordered, hash-indexed collection of learning points
+        self.learning_points: Dict[LearningPoint, None] = {}
         
     def add_prerequisite(self, prerequisite: str) -> None:
         """Add a prerequisite topic that must be completed before this one."""
@@ -19,22 +23,22 @@ class Topic:
     def add_learning_point(self, learning_point: LearningPoint) -> None:
         """Add a learning point to this topic."""
         if learning_point not in self.learning_points:
-            self.learning_points.append(learning_point)
+            self.learning_points[learning_point] = None
             learning_point.add_topic(self.name)
             
     def remove_learning_point(self, learning_point: LearningPoint) -> None:
         """Remove a learning point from this topic."""
         if learning_point in self.learning_points:
-            self.learning_points.remove(learning_point)
+            del self.learning_points[learning_point]
             learning_point.remove_topic(self.name)
             
-    def get_prerequisites(self) -> Set[str]:
-        """Get all prerequisite topics."""
-        return self.prerequisites.copy()
+    def get_prerequisites(self) -> AbstractSet[str]:
+        """Get a read-only view of all prerequisite topics."""
+        return SetView(self.prerequisites)
         
-    def get_learning_points(self) -> List[LearningPoint]:
-        """Get all learning points associated with this topic."""
-        return self.learning_points.copy()
+    def get_learning_points(self) -> KeysView[LearningPoint]:
+        """Get a read-only view of all learning points associated with this topic, in insertion order."""
+        return self.learning_points.keys()
         
     def __str__(self) -> str:
         return f"Topic(name='{self.name}', prerequisites={self.prerequisites}, learning_points={len(self.learning_points)})"
@@ -0,0 +1,24 @@
+from collections.abc import Set as AbstractSet
+from typing import Iterator, Set, TypeVar
+
+T = TypeVar("T")
+
+class SetView(AbstractSet):
+    """Read-only, live view of a set; membership and size are O(1) and nothing is copied."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Set[T]):
+        self._items = items
+
+    def __contains__(self, item) -> bool:
+        return item in self._items
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"SetView({self._items!r})"
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+from src.services.openai_service import OpenAIService
+from src.services.batch_grading import BatchGradingJob, BatchJobError, LocalBatchBackend
+from src.models.grading_request import GradingRequest
+
+from tests.async_test_case import AsyncTestCase
+
+def respond(body):
+    answer = body["messages"][-1]["content"].split("Student Answer: ")[1].split("\n")[0]
+    if answer == "broken":
+        raise RuntimeError("model overloaded")
+    if answer == "garbled":
+        return "not json"
+    return json.dumps({"score": 90, "feedback": f"Graded {answer}", "metadata": {"confidence": 0.8}})
+
+class TestBatchGradingJob(AsyncTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.service = OpenAIService(api_key="test-key", share_client=False)
+        self.backend = LocalBatchBackend(os.path.join(self.directory.name, "provider"), respond)
+        self.work_dir = os.path.join(self.directory.name, "job")
+        self.requests = [GradingRequest("What is 2+2?", f"answer {i}") for i in range(5)]
+
+    def tearDown(self):
+        self.async_test(self.service.aclose())
+        self.directory.cleanup()
+
+    def job(self, **kwargs):
+        return BatchGradingJob(self.service, self.backend, self.work_dir, poll_interval=0, **kwargs)
+
+    def test_input_uses_batch_format(self):
+        job = self.job(max_requests_per_file=2)
+        job.prepare(self.requests)
+        self.assertEqual(len(job.state["shards"]), 3)
+        with open(job.state["shards"][0]["input"], encoding="utf-8") as handle:
+            line = json.loads(handle.readline())
+        self.assertEqual(line["custom_id"], "request-0")
+        self.assertEqual((line["method"], line["url"]), ("POST", "/v1/chat/completions"))
+        self.assertEqual(line["body"]["model"], "gpt-3.5-turbo")
+
+    def test_run_maps_results_and_failures(self):
+        self.requests[1] = GradingRequest("What is 2+2?", "broken")
+        self.requests[3] = GradingRequest("What is 2+2?", "garbled")
+        batch = self.async_test(self.job(max_requests_per_file=2).run(self.requests))
+        self.assertEqual(len(batch), 5)
+        self.assertEqual(batch.results[0].feedback, "Graded answer 0")
+        self.assertEqual(batch.results[4].confidence, 0.8)
+        self.assertEqual(sorted(batch.errors), [1, 3])
+        self.assertIsInstance(batch.errors[1], BatchJobError)
+
+    def test_resumes_without_resubmitting(self):
+        job = self.job(max_requests_per_file=2)
+        job.prepare(self.requests)
+        self.async_test(job.submit())
+        job_ids = [shard["job_id"] for shard in job.state["shards"]]
+
+        resumed = self.job(max_requests_per_file=2)
+        batch = self.async_test(resumed.run(self.requests))
+        self.assertEqual([shard["job_id"] for shard in resumed.state["shards"]], job_ids)
+        self.assertTrue(batch.succeeded)
+
+    def test_work_dir_for_other_requests_is_rejected(self):
+        self.job().prepare(self.requests)
+        with self.assertRaises(ValueError):
+            self.job().prepare(self.requests[:2])
+
+if __name__ == '__main__':
+    unittest.main()
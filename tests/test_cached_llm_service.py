@@ -0,0 +1,62 @@
+import unittest
+from src.services.cached_llm_service import CachedLLMService
+from src.services.mock_llm_service import MockLLMService
+from src.models.grading_result import GradingResult
+from src.models.grading_request import GradingRequest
+from src.learning_point import LearningPoint
+
+from tests.async_test_case import AsyncTestCase
+
+class CountingMockLLMService(MockLLMService):
+    model = "mock-model"
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def grade_answer(self, problem, student_answer, expected_answer=None, metadata=None):
+        self.calls += 1
+        if self.fail:
+            return GradingResult(score=0, feedback="failed", metadata={"error": "boom"}, confidence=0)
+        return await super().grade_answer(problem, student_answer, expected_answer, metadata)
+
+class TestCachedLLMService(AsyncTestCase):
+    def setUp(self):
+        self.inner = CountingMockLLMService()
+        self.service = CachedLLMService(self.inner)
+
+    def test_repeated_answer_hits_cache(self):
+        first = self.async_test(self.service.grade_answer("What is 2+2?", "Four", "4"))
+        second = self.async_test(self.service.grade_answer("What is 2+2?", "  four ", "4"))
+        self.assertEqual(first.score, second.score)
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual((self.service.stats.hits, self.service.stats.misses), (1, 1))
+
+    def test_error_results_are_not_cached(self):
+        inner = CountingMockLLMService(fail=True)
+        service = CachedLLMService(inner)
+        self.async_test(service.grade_answer("Q", "A"))
+        self.async_test(service.grade_answer("Q", "A"))
+        self.assertEqual(inner.calls, 2)
+
+    def test_batch_forwards_only_unique_misses(self):
+        self.async_test(self.service.grade_answer("Q", "cached"))
+        requests = [
+            GradingRequest("Q", "cached"),
+            GradingRequest("Q", "new"),
+            GradingRequest("Q", "NEW"),
+        ]
+        batch = self.async_test(self.service.grade_answers(requests))
+        self.assertTrue(batch.succeeded)
+        self.assertEqual(len(batch.results), 3)
+        self.assertTrue(all(result.score == 75.0 for result in batch.results))
+        self.assertEqual(self.inner.calls, 2)
+
+    def test_generation_is_delegated(self):
+        exercises = self.async_test(self.service.generate_exercises(
+            [LearningPoint("variables", "Understanding variables")], count=2
+        ))
+        self.assertEqual(len(exercises), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import asyncio
+from src.services.coalescing_llm_service import CoalescingLLMService
+from src.services.mock_llm_service import MockLLMService
+from src.learning_point import LearningPoint
+
+from tests.async_test_case import AsyncTestCase
+
+class SlowMockLLMService(MockLLMService):
+    def __init__(self, fail=False):
+        self.grade_calls = 0
+        self.generate_calls = 0
+        self.fail = fail
+
+    async def grade_answer(self, problem, student_answer, expected_answer=None, metadata=None):
+        self.grade_calls += 1
+        await asyncio.sleep(0.01)
+        if self.fail:
+            raise RuntimeError("upstream error")
+        return await super().grade_answer(problem, student_answer, expected_answer, metadata)
+
+    async def generate_exercises(self, learning_points, count=1,
+                                 difficulty="intermediate", exercise_type="open_ended"):
+        self.generate_calls += 1
+        await asyncio.sleep(0.01)
+        return await super().generate_exercises(learning_points, count, difficulty, exercise_type)
+
+class TestCoalescingLLMService(AsyncTestCase):
+    def setUp(self):
+        self.inner = SlowMockLLMService()
+        self.service = CoalescingLLMService(self.inner)
+
+    def test_identical_concurrent_grades_share_one_call(self):
+        async def run():
+            return await asyncio.gather(*(
+                self.service.grade_answer("Q", "A", "E") for _ in range(5)
+            ))
+        results = self.async_test(run())
+        self.assertEqual(self.inner.grade_calls, 1)
+        self.assertEqual(self.service.coalesced, 4)
+        self.assertTrue(all(result.score == 75.0 for result in results))
+        self.assertIsNot(results[0], results[1])
+
+    def test_different_requests_are_not_coalesced(self):
+        async def run():
+            await asyncio.gather(
+                self.service.grade_answer("Q", "A"),
+                self.service.grade_answer("Q", "B"),
+            )
+        self.async_test(run())
+        self.assertEqual(self.inner.grade_calls, 2)
+
+    def test_sequential_requests_are_not_coalesced(self):
+        self.async_test(self.service.grade_answer("Q", "A"))
+        self.async_test(self.service.grade_answer("Q", "A"))
+        self.assertEqual(self.inner.grade_calls, 2)
+
+    def test_generation_is_coalesced(self):
+        point = LearningPoint("variables", "Understanding variables")
+        async def run():
+            return await asyncio.gather(*(
+                self.service.generate_exercises([point], count=2) for _ in range(3)
+            ))
+        results = self.async_test(run())
+        self.assertEqual(self.inner.generate_calls, 1)
+        self.assertTrue(all(len(exercises) == 2 for exercises in results))
+
+    def test_errors_propagate_to_all_callers(self):
+        service = CoalescingLLMService(SlowMockLLMService(fail=True))
+        async def run():
+            return await asyncio.gather(
+                service.grade_answer("Q", "A"),
+                service.grade_answer("Q", "A"),
+                return_exceptions=True
+            )
+        results = self.async_test(run())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(service._in_flight, {})
+
+    def test_cancelled_leader_does_not_cancel_followers(self):
+        async def run():
+            leader = asyncio.ensure_future(self.service.grade_answer("Q", "A"))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(self.service.grade_answer("Q", "A"))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+        result = self.async_test(run())
+        self.assertEqual(result.score, 75.0)
+        self.assertEqual(self.inner.grade_calls, 1)
+
+if __name__ == '__main__':
+    unittest.main()
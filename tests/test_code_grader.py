@@ -0,0 +1,145 @@
+import unittest
+from src.services.code_grader import CodeGradingService, SandboxedCodeRunner, extract_code
+from src.services.mock_llm_service import MockLLMService
+from src.services.cached_llm_service import CachedLLMService
+from src.models.grading_request import GradingRequest
+from src.models.grading_result import GradingResult
+
+from tests.async_test_case import AsyncTestCase
+
+TESTS = ["assert add(1, 2) == 3", "assert add(-1, 1) == 0", "assert add('a', 'b') == 'ab'"]
+
+class RecordingMockLLMService(MockLLMService):
+    def __init__(self):
+        self.graded = []
+        self.failing = False
+
+    async def grade_answer(self, problem, student_answer, expected_answer=None, metadata=None):
+        self.graded.append(metadata)
+        if self.failing:
+            return GradingResult(score=0, feedback="Error grading answer: rate limited",
+                                 metadata={"error": "rate limited"}, confidence=0)
+        return await super().grade_answer(problem, student_answer, expected_answer, metadata)
+
+class TestExtractCode(unittest.TestCase):
+    def test_fenced_blocks(self):
+        answer = "Here you go:\n```python\ndef f():\n    return 1\n```\nDone."
+        self.assertEqual(extract_code(answer), "def f():\n    return 1\n")
+        self.assertEqual(extract_code("x = 1"), "x = 1")
+
+class TestSandboxedCodeRunner(AsyncTestCase):
+    def setUp(self):
+        self.runner = SandboxedCodeRunner(max_workers=2, timeout=5, cpu_seconds=2)
+
+    def test_counts_passing_tests(self):
+        run = self.async_test(self.runner.run("def add(a, b):\n    print(a)\n    return a + b", TESTS))
+        self.assertEqual((run.passed, run.total), (3, 3))
+        self.assertIsNone(run.error)
+
+    def test_failures_are_described(self):
+        run = self.async_test(self.runner.run("def add(a, b):\n    return a - b", TESTS))
+        self.assertEqual(run.passed, 0)
+        self.assertEqual(run.failures[0], "AssertionError: assertion failed")
+        self.assertEqual(run.failures[2], "TypeError: unsupported operand type(s) for -: 'str' and 'str'")
+
+    def test_syntax_error_fails_every_test(self):
+        run = self.async_test(self.runner.run("def add(a, b) return a + b", TESTS))
+        self.assertEqual(run.passed, 0)
+        self.assertTrue(run.error.startswith("SyntaxError"))
+        self.assertEqual(len(run.failures), 3)
+
+    def test_runaway_submission_is_stopped(self):
+        runner = SandboxedCodeRunner(timeout=1, cpu_seconds=5)
+        code = "def add(a, b):\n    while True:\n        pass"
+        run = self.async_test(runner.run(code, ["assert add is not None", "assert add(1, 2) == 3"]))
+        self.assertEqual(run.passed, 0)
+        self.assertEqual(run.failures, {0: "Timed out after 1s", 1: "Timed out after 1s"})
+
+    def test_submission_cannot_report_results(self):
+        forge = (
+            "import __main__, os\n"
+            "for i in range(len(__main__.request['tests'])):\n"
+            "    __main__.report(index=i)\n"
+            "os._exit(0)"
+        )
+        run = self.async_test(self.runner.run(forge, TESTS))
+        self.assertEqual(run.passed, 0)
+        self.assertTrue(run.error.startswith("AttributeError"))
+
+    def test_submission_cannot_reach_harness_frames(self):
+        code = "import sys\ntry:\n    raise ValueError\nexcept ValueError as e:\n    frame = e.__traceback__.tb_frame"
+        run = self.async_test(self.runner.run(code, TESTS))
+        self.assertEqual(run.error, "ValueError: frame introspection is not allowed")
+
+    def test_early_exit_fails_every_test(self):
+        code = "import os\ndef add(a, b):\n    return a + b\nos.write(1, b'P P P\\n')\nos._exit(0)"
+        run = self.async_test(self.runner.run(code, TESTS))
+        self.assertEqual(run.passed, 0)
+        self.assertEqual(run.error, "Exited before reporting results")
+
+    def test_cpu_limit(self):
+        run = self.async_test(self.runner.run("while True:\n    pass", TESTS))
+        self.assertEqual(run.error, "CPU time limit exceeded")
+
+    def test_memory_limit(self):
+        runner = SandboxedCodeRunner(memory_mb=128)
+        run = self.async_test(runner.run("data = bytearray(512 * 1024 * 1024)", TESTS))
+        self.assertEqual(run.error, "MemoryError")
+
+class TestCodeGradingService(AsyncTestCase):
+    def setUp(self):
+        self.llm = RecordingMockLLMService()
+        self.service = CodeGradingService(self.llm, SandboxedCodeRunner(max_workers=2, timeout=5))
+
+    def test_all_passing_skips_llm(self):
+        result = self.async_test(self.service.grade_answer(
+            "Write add", "def add(a, b):\n    return a + b", metadata={"test_cases": TESTS}
+        ))
+        self.assertEqual(result.score, 100.0)
+        self.assertEqual(result.feedback, "All 3 tests passed.")
+        self.assertEqual(self.llm.graded, [])
+
+    def test_llm_only_writes_feedback(self):
+        result = self.async_test(self.service.grade_answer(
+            "Write add", "def add(a, b):\n    return 0", metadata={"test_cases": TESTS, "topic": "functions"}
+        ))
+        self.assertAlmostEqual(result.score, 100 / 3)
+        self.assertEqual(result.feedback, "Mock grading feedback")
+        self.assertEqual(result.metadata["tests_passed"], 1)
+        self.assertEqual(self.llm.graded[0]["topic"], "functions")
+        self.assertIn("1 of 3 tests passed.", self.llm.graded[0]["test_results"])
+        self.assertNotIn("test_cases", self.llm.graded[0])
+
+    def test_batch(self):
+        requests = [
+            GradingRequest("Write add", "def add(a, b):\n    return a + b", metadata={"test_cases": TESTS}),
+            GradingRequest("Explain functions", "They group code"),
+            GradingRequest("Write add", "def add(a, b):\n    return a - b", metadata={"test_cases": TESTS}),
+        ]
+        batch = self.async_test(self.service.grade_answers(requests))
+        self.assertTrue(batch.succeeded)
+        self.assertEqual([result.score for result in batch.results], [100.0, 75.0, 0.0])
+        self.assertEqual(batch.results[2].feedback, "Mock grading feedback")
+        self.assertEqual(len(self.llm.graded), 2)
+
+    def test_code_grades_are_cacheable(self):
+        cached = CachedLLMService(self.service)
+        for _ in range(2):
+            result = self.async_test(cached.grade_answer(
+                "Write add", "def add(a, b):\n    return a + b", metadata={"test_cases": TESTS}
+            ))
+        self.assertNotIn("error", result.metadata)
+        self.assertEqual((cached.stats.hits, cached.stats.misses), (1, 1))
+
+    def test_failed_feedback_falls_back_to_summary(self):
+        self.llm.failing = True
+        code = "def add(a, b):\n    return 0"
+        result = self.async_test(self.service.grade_answer("Write add", code, metadata={"test_cases": TESTS}))
+        self.assertTrue(result.feedback.startswith("1 of 3 tests passed."))
+        batch = self.async_test(self.service.grade_answers([
+            GradingRequest("Write add", code, metadata={"test_cases": TESTS})
+        ]))
+        self.assertEqual(batch.results[0].feedback, result.feedback)
+
+if __name__ == '__main__':
+    unittest.main()
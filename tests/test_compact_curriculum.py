@@ -0,0 +1,84 @@
+import unittest
+import random
+from src.curriculum import Curriculum
+from src.compact_curriculum import CompactCurriculum
+
+class TestCompactCurriculum(unittest.TestCase):
+    def setUp(self):
+        self.curriculum = CompactCurriculum()
+
+    def test_add_topic(self):
+        topic = self.curriculum.add_topic("Python Basics", "Introduction to Python")
+        self.assertIn("Python Basics", self.curriculum.topics)
+        self.assertEqual(topic.description, "Introduction to Python")
+        self.assertEqual(self.curriculum.add_topic("Python Basics"), topic)
+        self.assertEqual(len(self.curriculum.topics), 1)
+
+    def test_assign_prerequisite(self):
+        self.curriculum.add_topic("Functions")
+        self.curriculum.add_topic("Variables")
+        self.curriculum.assign_prerequisite("Functions", "Variables")
+        self.curriculum.assign_prerequisite("Functions", "NonexistentTopic")
+        self.assertEqual(self.curriculum.topics["Functions"].prerequisites, {"Variables"})
+        with self.assertRaises(ValueError):
+            self.curriculum.assign_prerequisite("Variables", "Functions")
+
+    def test_assign_learning_point_to_topic(self):
+        self.curriculum.add_topic("Variables")
+        self.curriculum.add_learning_point("variable_declaration", "How to declare variables")
+        self.curriculum.assign_learning_point_to_topic("variable_declaration", "Variables")
+        learning_point = self.curriculum.learning_points["variable_declaration"]
+        self.assertIn(learning_point, self.curriculum.get_topic_learning_points("Variables"))
+        self.assertEqual(learning_point.topics, {"Variables"})
+        materialized = learning_point.to_learning_point()
+        self.assertEqual(materialized.description, "How to declare variables")
+        self.assertEqual(materialized.get_topics(), {"Variables"})
+
+    def test_unknown_topics(self):
+        self.assertEqual(self.curriculum.get_topic_prerequisites("Unknown"), set())
+        self.assertEqual(self.curriculum.get_topic_learning_points("Unknown"), [])
+        self.assertEqual(self.curriculum.learning_path("Unknown"), [])
+        self.assertFalse(self.curriculum.is_prerequisite("Unknown", "Other"))
+
+    def test_matches_curriculum(self):
+        rng = random.Random(3)
+        reference = Curriculum()
+        names = [f"T{i}" for i in range(40)]
+        for name in names:
+            reference.add_topic(name, f"Topic {name}")
+        for i in range(1, 40):
+            for _ in range(2):
+                reference.assign_prerequisite(names[i], names[rng.randrange(i)])
+        for i in range(10):
+            reference.add_learning_point(f"P{i}", f"Point {i}")
+            reference.assign_learning_point_to_topic(f"P{i}", names[rng.randrange(40)])
+
+        compact = CompactCurriculum.from_curriculum(reference)
+        self.assertEqual(str(compact), str(reference))
+        self.assertEqual(compact.topological_order(), reference.topological_order())
+        for name in names:
+            self.assertEqual(compact.get_topic_prerequisites(name), reference.get_topic_prerequisites(name))
+            self.assertEqual(compact.get_all_prerequisites(name), reference.get_all_prerequisites(name))
+            self.assertEqual(compact.get_unlocked_topics(name), reference.get_unlocked_topics(name))
+            self.assertEqual(
+                compact.learning_path(name, completed=["T5", "T9"]),
+                reference.learning_path(name, completed=["T5", "T9"])
+            )
+            self.assertEqual(
+                {point.name for point in compact.get_topic_learning_points(name)},
+                {point.name for point in reference.get_topic_learning_points(name)}
+            )
+
+        for name in ["T3", "T17"]:
+            reference.remove_topic(name)
+            compact.remove_topic(name)
+        removed = sorted(reference.get_topic_prerequisites("T30"))[0]
+        reference.remove_prerequisite("T30", removed)
+        compact.remove_prerequisite("T30", removed)
+        self.assertEqual(compact.topological_order(), reference.topological_order())
+        for name in reference.topics:
+            self.assertEqual(compact.get_all_prerequisites(name), reference.get_all_prerequisites(name))
+            self.assertEqual(compact.learning_path(name), reference.learning_path(name))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import random
 from src.curriculum import Curriculum
 from src.topic import Topic
 from src.learning_point import LearningPoint
@@ -80,5 +81,154 @@ class TestCurriculum(unittest.TestCase):
         self.assertIn(point1, learning_points)
         self.assertIn(point2, learning_points)
 
+class TestPrerequisiteClosure(unittest.TestCase):
+    def setUp(self):
+        self.curriculum = Curriculum()
+        for name in ["Variables", "Functions", "Classes", "Inheritance", "Modules"]:
+            self.curriculum.add_topic(name)
+        self.curriculum.assign_prerequisite("Functions", "Variables")
+        self.curriculum.assign_prerequisite("Classes", "Functions")
+        self.curriculum.assign_prerequisite("Inheritance", "Classes")
+
+    def test_transitive_prerequisites(self):
+        self.assertEqual(
+            self.curriculum.get_all_prerequisites("Inheritance"),
+            {"Classes", "Functions", "Variables"}
+        )
+        self.assertTrue(self.curriculum.is_prerequisite("Inheritance", "Variables"))
+        self.assertFalse(self.curriculum.is_prerequisite("Variables", "Inheritance"))
+        self.assertEqual(self.curriculum.get_all_prerequisites("Unknown"), set())
+
+    def test_unlocked_topics(self):
+        self.assertEqual(
+            self.curriculum.get_unlocked_topics("Variables"),
+            {"Functions", "Classes", "Inheritance"}
+        )
+
+    def test_edge_joining_existing_chains(self):
+        self.curriculum.assign_prerequisite("Variables", "Modules")
+        self.assertIn("Modules", self.curriculum.get_all_prerequisites("Inheritance"))
+        self.assertIn("Inheritance", self.curriculum.get_unlocked_topics("Modules"))
+
+    def test_cycle_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.curriculum.assign_prerequisite("Variables", "Inheritance")
+        with self.assertRaises(ValueError):
+            self.curriculum.assign_prerequisite("Variables", "Variables")
+        self.assertNotIn("Inheritance", self.curriculum.get_topic_prerequisites("Variables"))
+
+    def test_remove_prerequisite(self):
+        self.curriculum.remove_prerequisite("Classes", "Functions")
+        self.assertEqual(self.curriculum.get_all_prerequisites("Inheritance"), {"Classes"})
+        self.assertEqual(self.curriculum.get_unlocked_topics("Variables"), {"Functions"})
+
+    def test_remove_prerequisite_keeps_other_paths(self):
+        self.curriculum.assign_prerequisite("Classes", "Variables")
+        self.curriculum.remove_prerequisite("Functions", "Variables")
+        self.assertIn("Variables", self.curriculum.get_all_prerequisites("Inheritance"))
+        self.assertNotIn("Functions", self.curriculum.get_unlocked_topics("Variables"))
+
+    def test_remove_topic(self):
+        self.curriculum.add_learning_point("def", "Defining functions")
+        self.curriculum.assign_learning_point_to_topic("def", "Functions")
+        self.curriculum.remove_topic("Functions")
+        self.assertNotIn("Functions", self.curriculum.topics)
+        self.assertEqual(self.curriculum.get_all_prerequisites("Inheritance"), {"Classes"})
+        self.assertEqual(self.curriculum.get_unlocked_topics("Variables"), set())
+        self.assertNotIn("Functions", self.curriculum.learning_points["def"].topics)
+        # The edge can now be added without creating a cycle
+        self.curriculum.assign_prerequisite("Variables", "Inheritance")
+
+    def test_matches_graph_search_after_random_edits(self):
+        rng = random.Random(7)
+        curriculum = Curriculum()
+        names = [f"T{i}" for i in range(30)]
+        for name in names:
+            curriculum.add_topic(name)
+        for _ in range(300):
+            topic, prerequisite = rng.sample(names, 2)
+            if rng.random() < 0.3:
+                curriculum.remove_prerequisite(topic, prerequisite)
+            else:
+                try:
+                    curriculum.assign_prerequisite(topic, prerequisite)
+                except ValueError:
+                    pass
+        for name in names:
+            expected = set()
+            stack = list(curriculum.get_topic_prerequisites(name))
+            while stack:
+                current = stack.pop()
+                if current not in expected:
+                    expected.add(current)
+                    stack.extend(curriculum.get_topic_prerequisites(current))
+            self.assertEqual(curriculum.get_all_prerequisites(name), expected)
+            for prerequisite in expected:
+                self.assertIn(name, curriculum.get_unlocked_topics(prerequisite))
+
+class TestLearningPath(unittest.TestCase):
+    def setUp(self):
+        self.curriculum = Curriculum()
+        for name in ["Classes", "Functions", "Variables", "Loops", "Inheritance"]:
+            self.curriculum.add_topic(name)
+        self.curriculum.assign_prerequisite("Functions", "Variables")
+        self.curriculum.assign_prerequisite("Loops", "Variables")
+        self.curriculum.assign_prerequisite("Classes", "Functions")
+        self.curriculum.assign_prerequisite("Classes", "Loops")
+        self.curriculum.assign_prerequisite("Inheritance", "Classes")
+
+    def assertValidOrder(self, order):
+        position = {name: index for index, name in enumerate(order)}
+        for name in order:
+            for prerequisite in self.curriculum.get_topic_prerequisites(name):
+                self.assertLess(position[prerequisite], position[name])
+
+    def test_topological_order(self):
+        order = self.curriculum.topological_order()
+        self.assertEqual(order, ["Variables", "Functions", "Loops", "Classes", "Inheritance"])
+        self.assertValidOrder(order)
+
+    def test_topological_order_updates(self):
+        self.curriculum.topological_order()
+        self.curriculum.add_topic("Basics")
+        self.curriculum.assign_prerequisite("Variables", "Basics")
+        order = self.curriculum.topological_order()
+        self.assertEqual(order[0], "Basics")
+        self.assertValidOrder(order)
+        self.curriculum.add_topic("Extras")
+        self.assertEqual(self.curriculum.topological_order()[-1], "Extras")
+
+    def test_learning_path(self):
+        self.assertEqual(
+            self.curriculum.learning_path("Inheritance"),
+            ["Variables", "Functions", "Loops", "Classes"]
+        )
+        self.assertEqual(self.curriculum.learning_path("Variables"), [])
+        self.assertEqual(self.curriculum.learning_path("Unknown"), [])
+
+    def test_learning_path_skips_completed(self):
+        self.assertEqual(
+            self.curriculum.learning_path("Inheritance", completed={"Functions"}),
+            ["Loops", "Classes"]
+        )
+        self.assertEqual(
+            self.curriculum.learning_path("Inheritance", completed={"Classes"}),
+            []
+        )
+
+    def test_learning_path_invalidated_by_prerequisite_changes(self):
+        self.assertEqual(self.curriculum.learning_path("Classes"), ["Variables", "Functions", "Loops"])
+        self.curriculum.remove_prerequisite("Classes", "Loops")
+        self.assertEqual(self.curriculum.learning_path("Classes"), ["Variables", "Functions"])
+        self.assertEqual(self.curriculum.learning_path("Inheritance"), ["Variables", "Functions", "Classes"])
+        self.curriculum.add_topic("Modules")
+        self.curriculum.assign_prerequisite("Functions", "Modules")
+        self.assertEqual(
+            self.curriculum.learning_path("Inheritance"),
+            ["Variables", "Modules", "Functions", "Classes"]
+        )
+        self.curriculum.remove_topic("Functions")
+        self.assertEqual(self.curriculum.learning_path("Inheritance"), ["Classes"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,163 @@
+import random
+import unittest
+from unittest.mock import patch
+from src.curriculum_graph import Adjacency, CurriculumGraph
+
+class TestAdjacency(unittest.TestCase):
+    def setUp(self):
+        self.adjacency = Adjacency()
+        for source, target in [(0, 1), (0, 2), (2, 1), (3, 0)]:
+            self.adjacency.add(source, target)
+
+    def test_add_and_neighbours(self):
+        self.assertEqual(sorted(self.adjacency.neighbours(0)), [1, 2])
+        self.assertEqual(list(self.adjacency.neighbours(1)), [])
+        self.assertFalse(self.adjacency.add(0, 1))
+        self.assertEqual(len(self.adjacency), 4)
+
+    def test_compaction_preserves_edges(self):
+        self.adjacency.compact(4)
+        self.assertEqual(list(self.adjacency.offsets), [0, 2, 2, 3, 4])
+        self.assertEqual(list(self.adjacency.targets), [1, 2, 1, 0])
+        self.assertTrue(self.adjacency.contains(3, 0))
+        self.assertEqual(list(self.adjacency.neighbours(7)), [])
+
+    def test_remove_compacted_and_staged_edges(self):
+        self.adjacency.compact(4)
+        self.adjacency.add(1, 3)
+        self.assertTrue(self.adjacency.remove(0, 2))
+        self.assertTrue(self.adjacency.remove(1, 3))
+        self.assertFalse(self.adjacency.remove(1, 3))
+        self.assertEqual(list(self.adjacency.neighbours(0)), [1])
+        self.assertEqual(len(self.adjacency), 3)
+        self.adjacency.add(0, 2)
+        self.assertEqual(sorted(self.adjacency.neighbours(0)), [1, 2])
+        self.adjacency.remove(0, 1)
+        self.adjacency.compact(4)
+        self.assertEqual(list(self.adjacency.targets), [2, 1, 0])
+
+    @patch("src.curriculum_graph.MIN_COMPACTION_THRESHOLD", 2)
+    def test_needs_compaction(self):
+        adjacency = Adjacency()
+        adjacency.add(0, 1)
+        adjacency.add(0, 2)
+        self.assertFalse(adjacency.needs_compaction())
+        adjacency.add(1, 2)
+        self.assertTrue(adjacency.needs_compaction())
+
+class TestCurriculumGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = CurriculumGraph()
+        self.ids = {
+            name: self.graph.add_topic(name)
+            for name in ["Variables", "Functions", "Classes", "Loops"]
+        }
+        self.graph.add_prerequisite(self.ids["Functions"], self.ids["Variables"])
+        self.graph.add_prerequisite(self.ids["Classes"], self.ids["Functions"])
+        self.graph.add_prerequisite(self.ids["Classes"], self.ids["Loops"])
+
+    def test_interning(self):
+        self.assertEqual(self.graph.add_topic("Variables"), self.ids["Variables"])
+        self.assertEqual(self.graph.topic_names[self.ids["Loops"]], "Loops")
+        point_id = self.graph.add_learning_point("def", "Defining functions")
+        self.assertEqual(self.graph.add_learning_point("def", "Other"), point_id)
+        self.assertEqual(self.graph.point_count, 1)
+
+    def test_closure_queries(self):
+        self.assertEqual(
+            self.graph.ancestors(self.ids["Classes"]),
+            {self.ids["Variables"], self.ids["Functions"], self.ids["Loops"]}
+        )
+        self.assertEqual(
+            self.graph.descendants(self.ids["Variables"]),
+            {self.ids["Functions"], self.ids["Classes"]}
+        )
+        self.assertTrue(self.graph.reaches(self.ids["Classes"], self.ids["Variables"]))
+        self.assertFalse(self.graph.reaches(self.ids["Variables"], self.ids["Classes"]))
+
+    def test_cycle_rejected(self):
+        with self.assertRaises(ValueError):
+            self.graph.add_prerequisite(self.ids["Variables"], self.ids["Classes"])
+
+    def test_topological_order_and_path(self):
+        order = list(self.graph.topological_order())
+        self.assertEqual(order, [0, 1, 3, 2])
+        self.assertEqual(
+            self.graph.learning_path(self.ids["Classes"], [self.ids["Functions"]]),
+            [self.ids["Loops"]]
+        )
+
+    def test_remove_topic(self):
+        point_id = self.graph.add_learning_point("def", "Defining functions")
+        self.graph.assign_point(self.ids["Functions"], point_id)
+        self.graph.remove_topic(self.ids["Functions"])
+        self.assertNotIn("Functions", self.graph.topic_ids)
+        self.assertEqual(self.graph.ancestors(self.ids["Classes"]), {self.ids["Loops"]})
+        self.assertEqual(list(self.graph.point_topics.neighbours(point_id)), [])
+        self.assertEqual(list(self.graph.topological_order()), [0, 3, 2])
+
+    def test_closure_index_follows_edits(self):
+        def walk(graph, topic_id):
+            seen, stack = set(), [topic_id]
+            while stack:
+                for node in graph.prerequisites.neighbours(stack.pop()):
+                    if node not in seen:
+                        seen.add(node)
+                        stack.append(node)
+            return seen
+
+        rng = random.Random(7)
+        graph = CurriculumGraph()
+        ids = [graph.add_topic(f"T{i}") for i in range(30)]
+        for _ in range(300):
+            topic_id, prerequisite_id = rng.sample(ids, 2)
+            if rng.random() < 0.3:
+                graph.remove_prerequisite(topic_id, prerequisite_id)
+            else:
+                try:
+                    graph.add_prerequisite(topic_id, prerequisite_id)
+                except ValueError:
+                    self.assertIn(topic_id, walk(graph, prerequisite_id))
+        for topic_id in ids:
+            self.assertEqual(graph.ancestors(topic_id), walk(graph, topic_id))
+
+    def test_unchecked_edges_rebuild_closure_index(self):
+        self.assertTrue(self.graph.reaches(self.ids["Classes"], self.ids["Variables"]))
+        extra = self.graph.add_topic("Modules")
+        self.graph.add_prerequisite(extra, self.ids["Classes"], check_cycles=False)
+        self.assertIsNone(self.graph._ancestors)
+        self.assertTrue(self.graph.reaches(extra, self.ids["Variables"]))
+        self.assertIn(extra, self.graph.descendants(self.ids["Loops"]))
+
+    @patch("src.curriculum_graph.MIN_COMPACTION_THRESHOLD", 2)
+    def test_removals_are_compacted(self):
+        graph = CurriculumGraph()
+        ids = [graph.add_topic(f"T{i}") for i in range(8)]
+        points = [graph.add_learning_point(f"P{i}", "Point") for i in range(2)]
+        for topic_id in ids[1:]:
+            graph.add_prerequisite(topic_id, ids[0])
+            graph.assign_point(topic_id, points[0])
+        graph.compact()
+        for topic_id in ids[2:7]:
+            graph.add_prerequisite(topic_id, ids[1])
+            graph.assign_point(topic_id, points[1])
+        # The third removal stages more edits than there are compacted edges
+        for topic_id in ids[2:5]:
+            graph.remove_prerequisite(topic_id, ids[0])
+            graph.unassign_point(topic_id, points[0])
+        self.assertEqual(len(graph.prerequisites.targets), 9)
+        self.assertEqual(len(graph.topic_points.targets), 9)
+        self.assertEqual(graph.descendants(ids[0]), set(ids[1:]))  # T2-T4 still via T1
+
+    @patch("src.curriculum_graph.MIN_COMPACTION_THRESHOLD", 4)
+    def test_automatic_compaction(self):
+        graph = CurriculumGraph()
+        ids = [graph.add_topic(f"T{i}") for i in range(20)]
+        for i in range(1, 20):
+            graph.add_prerequisite(ids[i], ids[i - 1])
+        self.assertGreater(len(graph.prerequisites.targets), 0)
+        self.assertEqual(len(graph.ancestors(ids[19])), 19)
+        self.assertEqual(list(graph.topological_order()), ids)
+
+if __name__ == '__main__':
+    unittest.main()
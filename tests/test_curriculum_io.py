@@ -0,0 +1,130 @@
+import io
+import os
+import tempfile
+import unittest
+from src.curriculum import Curriculum
+from src.compact_curriculum import CompactCurriculum
+from src.curriculum_io import export_jsonl, import_jsonl, save_snapshot, load_snapshot
+
+def build_curriculum():
+    curriculum = Curriculum()
+    curriculum.add_topic("Variables", "Storing values")
+    curriculum.add_topic("Functions", "Reusable code")
+    curriculum.add_topic("Classes", "Objects and types")
+    curriculum.assign_prerequisite("Functions", "Variables")
+    curriculum.assign_prerequisite("Classes", "Functions")
+    curriculum.add_learning_point("assignment", "Assigning a value")
+    curriculum.add_learning_point("def", "Defining a function — with ünïcode")
+    curriculum.assign_learning_point_to_topic("assignment", "Variables")
+    curriculum.assign_learning_point_to_topic("def", "Functions")
+    curriculum.assign_learning_point_to_topic("assignment", "Functions")
+    return curriculum
+
+class TestJSONL(unittest.TestCase):
+    def assertSameCurriculum(self, loaded, original):
+        self.assertEqual(set(loaded.topics), set(original.topics))
+        self.assertEqual(set(loaded.learning_points), set(original.learning_points))
+        for name, topic in original.topics.items():
+            self.assertEqual(loaded.topics[name].description, topic.description)
+            self.assertEqual(set(loaded.get_topic_prerequisites(name)), set(topic.get_prerequisites()))
+            self.assertEqual(
+                [point.name for point in loaded.get_topic_learning_points(name)],
+                [point.name for point in topic.get_learning_points()]
+            )
+        for name, point in original.learning_points.items():
+            self.assertEqual(loaded.learning_points[name].description, point.description)
+
+    def test_round_trip(self):
+        original = build_curriculum()
+        buffer = io.StringIO()
+        self.assertEqual(export_jsonl(original, buffer), 10)
+        buffer.seek(0)
+        self.assertSameCurriculum(import_jsonl(buffer), original)
+
+    def test_round_trip_into_compact_curriculum(self):
+        original = build_curriculum()
+        buffer = io.StringIO()
+        export_jsonl(original, buffer)
+        buffer.seek(0)
+        loaded = import_jsonl(buffer, CompactCurriculum())
+        self.assertIsInstance(loaded, CompactCurriculum)
+        self.assertSameCurriculum(loaded, original)
+
+    def test_forward_references(self):
+        lines = io.StringIO(
+            '{"type": "prerequisite", "topic": "B", "prerequisite": "A"}\n'
+            '\n'
+            '{"type": "assignment", "topic": "B", "learning_point": "p"}\n'
+            '{"type": "topic", "name": "A", "description": "First"}\n'
+            '{"type": "learning_point", "name": "p", "description": "Point"}\n'
+        )
+        curriculum = import_jsonl(lines)
+        self.assertEqual(curriculum.topics["A"].description, "First")
+        self.assertEqual(curriculum.learning_points["p"].description, "Point")
+        self.assertEqual(set(curriculum.get_topic_prerequisites("B")), {"A"})
+
+    def test_invalid_records(self):
+        for line in ['not json', '{"type": "unknown"}', '{"type": "topic"}']:
+            with self.assertRaises(ValueError):
+                import_jsonl(io.StringIO(line))
+        cycle = io.StringIO(
+            '{"type": "prerequisite", "topic": "B", "prerequisite": "A"}\n'
+            '{"type": "prerequisite", "topic": "A", "prerequisite": "B"}\n'
+        )
+        with self.assertRaises(ValueError) as context:
+            import_jsonl(cycle)
+        self.assertIn("line 2", str(context.exception))
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "curriculum.snapshot")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        original = build_curriculum()
+        save_snapshot(original, self.path)
+        loaded = load_snapshot(self.path)
+        self.assertIsInstance(loaded.graph.prerequisites.targets, memoryview)
+        self.assertEqual(loaded.topological_order(), original.topological_order())
+        self.assertEqual(loaded.learning_path("Classes"), ["Variables", "Functions"])
+        self.assertEqual(loaded.topics["Functions"].description, "Reusable code")
+        self.assertEqual(
+            loaded.learning_points["def"].description, "Defining a function — with ünïcode"
+        )
+        self.assertEqual(loaded.learning_points["assignment"].topics, {"Variables", "Functions"})
+
+    def test_loaded_snapshot_is_editable(self):
+        save_snapshot(build_curriculum(), self.path)
+        loaded = load_snapshot(self.path)
+        loaded.add_topic("Inheritance")
+        loaded.assign_prerequisite("Inheritance", "Classes")
+        loaded.remove_prerequisite("Functions", "Variables")
+        loaded.graph.compact()
+        self.assertEqual(loaded.get_all_prerequisites("Inheritance"), {"Classes", "Functions"})
+        self.assertNotIsInstance(loaded.graph.prerequisites.targets, memoryview)
+
+    def test_snapshot_of_compact_curriculum_with_removed_topic(self):
+        compact = CompactCurriculum.from_curriculum(build_curriculum())
+        compact.remove_topic("Functions")
+        save_snapshot(compact, self.path)
+        loaded = load_snapshot(self.path)
+        self.assertEqual(set(loaded.topics), {"Variables", "Classes"})
+        self.assertEqual(loaded.get_topic_prerequisites("Classes"), set())
+
+    def test_empty_curriculum(self):
+        save_snapshot(Curriculum(), self.path)
+        loaded = load_snapshot(self.path)
+        self.assertEqual(len(loaded.topics), 0)
+        self.assertEqual(loaded.topological_order(), [])
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as handle:
+            handle.write(b"x" * 200)
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
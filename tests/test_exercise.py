@@ -10,7 +10,8 @@ class TestExercise(unittest.TestCase):
             "explanation": "Tests basic understanding of variables.",
             "difficulty_level": "beginner",
             "exercise_type": "open_ended",
-            "related_learning_points": ["variables", "data_types"]
+            "related_learning_points": ["variables", "data_types"],
+            "test_cases": []
         }
         
     def test_exercise_initialization(self):
@@ -30,6 +31,7 @@ class TestExercise(unittest.TestCase):
         self.assertIsNone(exercise.difficulty_level)
         self.assertIsNone(exercise.exercise_type)
         self.assertEqual(exercise.related_learning_points, [])
+        self.assertEqual(exercise.test_cases, [])
         
     def test_exercise_asdict(self):
         exercise = Exercise(**self.exercise_data)
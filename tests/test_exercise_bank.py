@@ -0,0 +1,72 @@
+import unittest
+import os
+import tempfile
+from src.services.exercise_bank import ExerciseBank
+from src.learning_point import LearningPoint
+from src.models.exercise import Exercise
+
+def make_exercise(question, difficulty="intermediate", exercise_type="open_ended"):
+    return Exercise(question=question, expected_answer="answer", difficulty_level=difficulty,
+                    exercise_type=exercise_type, related_learning_points=["loops"])
+
+class TestExerciseBank(unittest.TestCase):
+    def setUp(self):
+        self.bank = ExerciseBank(min_similarity=0.6)
+        self.loops = LearningPoint("loops", "Repeating a block of code with for and while loops")
+        self.files = LearningPoint("files", "Reading and writing text files on disk")
+        self.bank.add(self.loops, [make_exercise("What is a loop?"),
+                                   make_exercise("Write a while loop.", difficulty="beginner")])
+        self.bank.add(self.files, [make_exercise("How do you open a file?")])
+
+    def test_find_similar_learning_point(self):
+        similar = LearningPoint("for loops", "Repeating a block of code with for loops")
+        self.assertEqual([exercise.question for exercise in self.bank.find(similar)],
+                         ["What is a loop?", "Write a while loop."])
+        self.assertEqual(len(self.bank.find(similar, k=1)), 1)
+        self.assertEqual([exercise.question for exercise in self.bank.find(similar, difficulty="beginner")],
+                         ["Write a while loop."])
+
+    def test_dissimilar_learning_point_misses(self):
+        unrelated = LearningPoint("recursion", "Functions that call themselves")
+        self.assertEqual(self.bank.find(unrelated), [])
+
+    def test_add_to_existing_point_reuses_vector(self):
+        self.bank.add(self.loops, [make_exercise("What does break do?")])
+        self.assertEqual(len(self.bank.index), 2)
+        self.assertEqual(len(self.bank), 4)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bank.bin")
+            self.bank.save(path)
+            for approximate in (False, True):
+                loaded = ExerciseBank.load(path, approximate=approximate, min_similarity=0.6)
+                self.assertEqual(len(loaded), 3)
+                self.assertEqual([exercise.question for exercise in loaded.find(self.files)],
+                                 ["How do you open a file?"])
+                loaded.add(LearningPoint("recursion", "Functions that call themselves"),
+                           [make_exercise("What is a base case?")])
+                self.assertEqual(len(loaded.find(LearningPoint("recursion", "Functions that call themselves"))), 1)
+                del loaded
+
+    def test_save_over_loaded_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bank.bin")
+            self.bank.save(path)
+            loaded = ExerciseBank.load(path, min_similarity=0.6)
+            loaded.add(self.loops, [make_exercise("What does break do?")])
+            loaded.save(path)
+            self.assertEqual(len(ExerciseBank.load(path)), 4)
+            self.assertEqual(len(loaded.find(self.loops)), 3)
+            self.assertEqual(os.listdir(directory), ["bank.bin"])
+
+    def test_load_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bank.bin")
+            with open(path, "wb") as handle:
+                handle.write(b"not a bank" * 10)
+            with self.assertRaises(ValueError):
+                ExerciseBank.load(path)
+
+if __name__ == '__main__':
+    unittest.main()
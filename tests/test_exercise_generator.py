@@ -1,10 +1,40 @@
 import unittest
 import asyncio
-from src.services.exercise_generator import ExerciseGenerator
+from src.services.exercise_generator import (
+    ExerciseGenerator, ExerciseGenerationError, EmptyGenerationError
+)
+from src.services.near_duplicate_index import NearDuplicateIndex
+from src.services.exercise_bank import ExerciseBank
 from src.services.mock_llm_service import MockLLMService
 from src.learning_point import LearningPoint
 from src.models.exercise import Exercise
 
+class DelayedMockLLMService(MockLLMService):
+    """Mock service whose calls finish in reverse order and can fail per point."""
+
+    def __init__(self, delays=None, failing=(), empty=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.empty = set(empty)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_exercises(self, learning_points, count=1,
+                                 difficulty="intermediate", exercise_type="open_ended"):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(learning_points[0].name, 0))
+            if learning_points[0].name in self.failing:
+                raise RuntimeError("generation failed")
+            if learning_points[0].name in self.empty:
+                return []
+            return await super().generate_exercises(
+                learning_points, count, difficulty, exercise_type
+            )
+        finally:
+            self.in_flight -= 1
+
 class TestExerciseGenerator(unittest.TestCase):
     def setUp(self):
         self.mock_llm = MockLLMService()
@@ -89,5 +119,116 @@ class TestExerciseGenerator(unittest.TestCase):
                 )
             )
 
+class TestConcurrentExerciseGeneration(unittest.TestCase):
+    def setUp(self):
+        self.points = [
+            LearningPoint(f"point_{i}", f"Description {i}") for i in range(6)
+        ]
+
+    def test_results_keep_learning_point_order(self):
+        delays = {point.name: 0.01 * (6 - i) for i, point in enumerate(self.points)}
+        llm = DelayedMockLLMService(delays=delays)
+        generator = ExerciseGenerator(llm)
+        exercises = asyncio.run(
+            generator.generate_exercises_for_learning_points(
+                learning_points=self.points,
+                max_concurrency=3
+            )
+        )
+        self.assertEqual(
+            [ex.related_learning_points[0] for ex in exercises],
+            [point.name for point in self.points]
+        )
+        self.assertEqual(llm.max_in_flight, 3)
+
+    def test_partial_failure_report(self):
+        llm = DelayedMockLLMService(failing={"point_2"})
+        generator = ExerciseGenerator(llm)
+        report = asyncio.run(
+            generator.generate_exercise_report(
+                learning_points=self.points,
+                max_concurrency=4
+            )
+        )
+        self.assertFalse(report.succeeded)
+        self.assertEqual(list(report.failures), [2])
+        self.assertEqual(report.exercises_by_point[2], [])
+        self.assertEqual(len(report.exercises), 5)
+
+    def test_empty_result_is_reported_as_failure(self):
+        llm = DelayedMockLLMService(empty={"point_3"})
+        generator = ExerciseGenerator(llm)
+        report = asyncio.run(generator.generate_exercise_report(learning_points=self.points))
+        self.assertIsInstance(report.failures[3], EmptyGenerationError)
+        self.assertEqual(len(report.exercises), 5)
+
+    def test_failure_raises_with_report(self):
+        llm = DelayedMockLLMService(failing={"point_0"})
+        generator = ExerciseGenerator(llm)
+        with self.assertRaises(ExerciseGenerationError) as context:
+            asyncio.run(
+                generator.generate_exercises_for_learning_points(
+                    learning_points=self.points,
+                    max_concurrency=2
+                )
+            )
+        self.assertEqual(len(context.exception.report.exercises), 5)
+        self.assertIn("point_0", str(context.exception))
+
+    def test_timeout_is_reported_as_failure(self):
+        llm = DelayedMockLLMService(delays={"point_1": 1.0})
+        generator = ExerciseGenerator(llm)
+        report = asyncio.run(
+            generator.generate_exercise_report(
+                learning_points=self.points[:3],
+                max_concurrency=3,
+                timeout=0.05
+            )
+        )
+        self.assertIsInstance(report.failures[1], asyncio.TimeoutError)
+        self.assertEqual(len(report.exercises), 2)
+
+    def test_invalid_max_concurrency(self):
+        generator = ExerciseGenerator(MockLLMService())
+        with self.assertRaises(ValueError):
+            asyncio.run(
+                generator.generate_exercises_for_learning_points(
+                    learning_points=self.points,
+                    max_concurrency=0
+                )
+            )
+
+    def test_duplicate_index_rejects_repeated_questions(self):
+        index = NearDuplicateIndex()
+        index.add("Explain the concept of point_0 in your own words")
+        generator = ExerciseGenerator(MockLLMService(), duplicate_index=index)
+        report = asyncio.run(
+            generator.generate_exercise_report(learning_points=self.points, count_per_point=2)
+        )
+        # The mock repeats one question per point; point_0's is already in the bank
+        self.assertEqual([len(exercises) for exercises in report.exercises_by_point], [0, 1, 1, 1, 1, 1])
+        self.assertEqual(report.duplicates_rejected, 7)
+        self.assertEqual(len(index), 6)
+
+    def test_bank_serves_first_and_stores_generated(self):
+        bank = ExerciseBank()
+        bank.add(self.points[0], [Exercise(question="Banked question",
+                                           difficulty_level="intermediate", exercise_type="open_ended")])
+        requested = []
+
+        class RecordingMockLLMService(MockLLMService):
+            async def generate_exercises(self, learning_points, *args, **kwargs):
+                requested.append(learning_points[0].name)
+                return await super().generate_exercises(learning_points, *args, **kwargs)
+
+        generator = ExerciseGenerator(RecordingMockLLMService(), bank=bank)
+        report = asyncio.run(
+            generator.generate_exercise_report(learning_points=self.points[:2], count_per_point=1)
+        )
+        self.assertEqual(report.exercises_by_point[0][0].question, "Banked question")
+        self.assertEqual(report.served_from_bank, 1)
+        self.assertEqual(requested, ["point_1"])
+        self.assertEqual(len(bank.find(self.points[1])), 1)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import asyncio
+from unittest.mock import patch
+from src.services.exercise_pool import ExercisePool
+from src.services.mock_llm_service import MockLLMService
+from src.learning_point import LearningPoint
+from src.models.exercise import Exercise
+
+from tests.async_test_case import AsyncTestCase
+
+class CountingMockLLMService(MockLLMService):
+    def __init__(self, fail=False):
+        self.requested = []
+        self.fail = fail
+
+    async def generate_exercises(self, learning_points, count=1,
+                                 difficulty="intermediate", exercise_type="open_ended"):
+        self.requested.append(count)
+        if self.fail:
+            raise RuntimeError("generation failed")
+        return await super().generate_exercises(learning_points, count, difficulty, exercise_type)
+
+class TestExercisePool(AsyncTestCase):
+    def setUp(self):
+        self.llm = CountingMockLLMService()
+        self.pool = ExercisePool(self.llm, capacity=4, low_water_mark=2)
+        self.point = LearningPoint("variables", "Understanding variables")
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            ExercisePool(self.llm, capacity=0)
+        with self.assertRaises(ValueError):
+            ExercisePool(self.llm, capacity=2, low_water_mark=3)
+
+    def test_warm_fills_to_capacity(self):
+        self.async_test(self.pool.warm([self.point], difficulty="beginner"))
+        self.assertEqual(self.pool.stock_level(self.point, difficulty="beginner"), 4)
+        self.assertEqual(self.pool.stock_level(self.point), 0)
+
+    def test_get_exercise_on_empty_pool_waits_for_refill(self):
+        exercise = self.async_test(self.pool.get_exercise(self.point))
+        self.assertIsInstance(exercise, Exercise)
+        self.assertEqual(self.pool.misses, 1)
+        self.assertEqual(self.pool.stock_level(self.point), 3)
+
+    def test_take_below_low_water_mark_refills_in_background(self):
+        async def run():
+            await self.pool.warm([self.point])
+            for _ in range(3):
+                self.assertIsNotNone(self.pool.take_nowait(self.point))
+            self.assertEqual(self.pool.stock_level(self.point), 1)
+            await self.pool.wait_for_refills()
+            return self.pool.stock_level(self.point)
+        self.assertEqual(self.async_test(run()), 4)
+        self.assertEqual(self.llm.requested, [4, 3])
+        self.assertEqual(self.pool.hits, 3)
+
+    def test_take_nowait_on_empty_pool(self):
+        async def run():
+            exercise = self.pool.take_nowait(self.point, exercise_type="coding")
+            await self.pool.wait_for_refills()
+            return exercise
+        self.assertIsNone(self.async_test(run()))
+        self.assertEqual(self.pool.stock_level(self.point, exercise_type="coding"), 4)
+
+    def test_stale_exercises_are_evicted(self):
+        pool = ExercisePool(self.llm, capacity=2, low_water_mark=0, max_age=60)
+        with patch("src.services.exercise_pool.time.monotonic", return_value=100.0):
+            self.async_test(pool.warm([self.point]))
+        with patch("src.services.exercise_pool.time.monotonic", return_value=200.0):
+            self.assertEqual(pool.stock_level(self.point), 0)
+
+    def test_failed_refill_raises_lookup_error(self):
+        pool = ExercisePool(CountingMockLLMService(fail=True), capacity=2, low_water_mark=1)
+        with self.assertRaises(LookupError):
+            self.async_test(pool.get_exercise(self.point))
+
+    def test_close_cancels_refills(self):
+        async def run():
+            self.pool.take_nowait(self.point)
+            await self.pool.close()
+            await asyncio.sleep(0)
+        self.async_test(run())
+        self.assertEqual(self.pool._refills, {})
+
+if __name__ == '__main__':
+    unittest.main()
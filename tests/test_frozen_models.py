@@ -0,0 +1,76 @@
+import pickle
+import unittest
+from dataclasses import FrozenInstanceError
+from src.models.exercise import Exercise
+from src.models.grading_result import GradingResult
+from src.models.frozen_exercise import FrozenExercise
+from src.models.frozen_grading_result import FrozenGradingResult
+from src.learning_point import LearningPoint
+from src.topic import Topic
+
+class TestFrozenExercise(unittest.TestCase):
+    def setUp(self):
+        self.exercise = Exercise(
+            question="What is a variable?",
+            expected_answer="A named storage location.",
+            explanation="Tests basic understanding of variables.",
+            difficulty_level="".join(["begin", "ner"]),
+            exercise_type="open_ended",
+            related_learning_points=["variables"]
+        )
+
+    def test_round_trip(self):
+        frozen = FrozenExercise.from_exercise(self.exercise)
+        self.assertEqual(frozen.related_learning_points, ("variables",))
+        self.assertEqual(frozen.to_exercise(), self.exercise)
+
+    def test_is_frozen_and_slotted(self):
+        frozen = FrozenExercise("What is a loop?")
+        self.assertFalse(hasattr(frozen, "__dict__"))
+        with self.assertRaises(FrozenInstanceError):
+            frozen.question = "Changed"
+        self.assertEqual(frozen.related_learning_points, ())
+
+    def test_repeated_fields_are_interned(self):
+        first = FrozenExercise.from_exercise(self.exercise)
+        second = FrozenExercise("Another", difficulty_level="".join(["begin", "ner"]))
+        self.assertIs(first.difficulty_level, second.difficulty_level)
+
+class TestFrozenGradingResult(unittest.TestCase):
+    def test_round_trip(self):
+        result = GradingResult(score=80, feedback="Good", metadata={"mastery_level": "advanced"}, confidence=0.7)
+        frozen = FrozenGradingResult.from_grading_result(result)
+        self.assertFalse(hasattr(frozen, "__dict__"))
+        self.assertEqual(frozen.to_grading_result(), result)
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            FrozenGradingResult(score=101, feedback="")
+        with self.assertRaises(ValueError):
+            FrozenGradingResult(score=50, feedback="", confidence=2)
+
+    def test_hashable_with_read_only_metadata(self):
+        metadata = {"key_concepts_understood": ["loops"], "mastery_level": "beginner"}
+        first = FrozenGradingResult(50, "a", metadata)
+        second = FrozenGradingResult(50, "a", dict(metadata))
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(len({first, second}), 1)
+        with self.assertRaises(TypeError):
+            first.metadata["mastery_level"] = "advanced"
+        metadata["mastery_level"] = "advanced"
+        self.assertEqual(first.metadata["mastery_level"], "beginner")
+        self.assertEqual(pickle.loads(pickle.dumps(first)), first)
+
+    def test_metadata_values_are_interned(self):
+        first = FrozenGradingResult(50, "a", {"mastery_level": "".join(["adv", "anced"])})
+        second = FrozenGradingResult(60, "b", {"mastery_level": "".join(["adv", "anced"])})
+        self.assertIs(first.metadata["mastery_level"], second.metadata["mastery_level"])
+
+class TestSlottedCurriculumModels(unittest.TestCase):
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(LearningPoint("variables", "Variables"), "__dict__"))
+        self.assertFalse(hasattr(Topic("Python Basics"), "__dict__"))
+
+if __name__ == '__main__':
+    unittest.main()
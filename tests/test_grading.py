@@ -1,8 +1,10 @@
 import unittest
 import asyncio
 from unittest.mock import patch, AsyncMock
+from src.services.llm_service import LLMService
 from src.services.mock_llm_service import MockLLMService
 from src.models.grading_result import GradingResult
+from src.models.grading_request import GradingRequest
 
 from tests.async_test_case import AsyncTestCase
 
@@ -43,5 +45,65 @@ class TestGrading(AsyncTestCase):
         self.assertIsInstance(result.feedback, str)  # Should have some feedback
         self.assertIsInstance(result.metadata, dict)  # Should have metadata
 
+class FlakyGradingService(LLMService):
+    """Service relying on the default batch implementation; fails on empty answers."""
+
+    def __init__(self, slow_delay=0.02):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.slow_delay = slow_delay
+
+    async def generate_exercises(self, learning_points, count=1,
+                                 difficulty="intermediate", exercise_type="open_ended"):
+        return []
+
+    async def grade_answer(self, problem, student_answer, expected_answer=None, metadata=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01 if len(student_answer) % 2 else self.slow_delay)
+            if not student_answer:
+                raise RuntimeError("empty answer")
+            return GradingResult(score=len(student_answer), feedback="ok", metadata={})
+        finally:
+            self.in_flight -= 1
+
+class TestBatchGrading(AsyncTestCase):
+    def setUp(self):
+        self.requests = [
+            GradingRequest(problem="Count the letters", student_answer="a" * length)
+            for length in (3, 1, 0, 4, 2)
+        ]
+
+    def test_default_batch_is_aligned_with_errors(self):
+        service = FlakyGradingService()
+        batch = self.async_test(service.grade_answers(self.requests, max_concurrency=2))
+        self.assertEqual(len(batch), 5)
+        self.assertEqual(
+            [result.score if result else None for result in batch.results],
+            [3.0, 1.0, None, 4.0, 2.0]
+        )
+        self.assertEqual(list(batch.errors), [2])
+        self.assertFalse(batch.succeeded)
+        self.assertEqual(service.max_in_flight, 2)
+
+    def test_default_batch_timeout(self):
+        service = FlakyGradingService(slow_delay=0.5)
+        batch = self.async_test(service.grade_answers(self.requests, timeout=0.2))
+        self.assertEqual(batch.results[0].score, 3.0)
+        self.assertIsNone(batch.results[3])
+        self.assertIsInstance(batch.errors[3], asyncio.TimeoutError)
+
+    def test_mock_batch(self):
+        service = MockLLMService()
+        batch = self.async_test(service.grade_answers(self.requests))
+        self.assertTrue(batch.succeeded)
+        self.assertTrue(all(result.score == 75.0 for result in batch.results))
+
+    def test_grading_request_defaults(self):
+        request = GradingRequest(problem="p", student_answer="a")
+        self.assertIsNone(request.expected_answer)
+        self.assertEqual(request.metadata, {})
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.services.grading_cache import LRUGradingCache, SQLiteGradingCache
+from src.services.request_keys import grading_key
+from src.models.grading_result import GradingResult
+
+def make_result(score=80.0):
+    return GradingResult(score=score, feedback="Good", metadata={"mastery_level": "beginner"}, confidence=0.9)
+
+class TestGradingKey(unittest.TestCase):
+    def test_whitespace_and_case_insensitive(self):
+        self.assertEqual(
+            grading_key("What is 2+2?", "  Four ", "4"),
+            grading_key("what is  2+2?", "four", "4")
+        )
+
+    def test_case_sensitive(self):
+        self.assertNotEqual(
+            grading_key("Q", "Print", case_sensitive=True),
+            grading_key("Q", "print", case_sensitive=True)
+        )
+
+    def test_code_answers_are_only_trimmed(self):
+        coding = {"exercise_type": "coding"}
+        self.assertNotEqual(
+            grading_key("Q", "if x:\n    return X", metadata=coding),
+            grading_key("Q", "if x:\nreturn x", metadata=coding)
+        )
+        self.assertEqual(
+            grading_key("Q", "  print(x)\n", metadata={"test_cases": ["assert True"]}),
+            grading_key("Q", "print(x)", metadata={"test_cases": ["assert True"]})
+        )
+
+    def test_test_cases_are_part_of_key(self):
+        self.assertNotEqual(
+            grading_key("Q", "def f(): return 1", metadata={"test_cases": ["assert f() == 1"]}),
+            grading_key("Q", "def f(): return 1", metadata={"test_cases": ["assert f() == 2"]})
+        )
+
+    def test_only_relevant_metadata(self):
+        self.assertEqual(
+            grading_key("Q", "A", metadata={"topic": "math", "time_spent": 10}),
+            grading_key("Q", "A", metadata={"topic": "math", "time_spent": 99})
+        )
+        self.assertNotEqual(
+            grading_key("Q", "A", metadata={"topic": "math"}),
+            grading_key("Q", "A", metadata={"topic": "physics"})
+        )
+
+    def test_model_is_part_of_key(self):
+        self.assertNotEqual(grading_key("Q", "A", model="a"), grading_key("Q", "A", model="b"))
+
+class TestLRUGradingCache(unittest.TestCase):
+    def test_hit_and_miss_counters(self):
+        cache = LRUGradingCache()
+        self.assertIsNone(cache.get("k"))
+        cache.set("k", make_result())
+        self.assertEqual(cache.get("k").score, 80.0)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_returns_copies(self):
+        cache = LRUGradingCache()
+        cache.set("k", make_result())
+        cache.get("k").metadata["changed"] = True
+        self.assertNotIn("changed", cache.get("k").metadata)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUGradingCache(max_entries=2)
+        cache.set("a", make_result())
+        cache.set("b", make_result())
+        cache.get("a")
+        cache.set("c", make_result())
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl_expiry(self):
+        cache = LRUGradingCache(ttl=10)
+        with patch("src.services.grading_cache.time.monotonic", return_value=100.0):
+            cache.set("k", make_result())
+        with patch("src.services.grading_cache.time.monotonic", return_value=105.0):
+            self.assertIsNotNone(cache.get("k"))
+        with patch("src.services.grading_cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("k"))
+        self.assertEqual(len(cache), 0)
+
+class TestSQLiteGradingCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "grades.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_persists_across_instances(self):
+        cache = SQLiteGradingCache(self.path)
+        cache.set("k", make_result(55.0))
+        cache.close()
+        reopened = SQLiteGradingCache(self.path)
+        result = reopened.get("k")
+        self.assertEqual(result.score, 55.0)
+        self.assertEqual(result.metadata, {"mastery_level": "beginner"})
+        self.assertEqual(len(reopened), 1)
+        reopened.clear()
+        self.assertEqual(len(reopened), 0)
+        reopened.close()
+
+    def test_ttl_expiry(self):
+        cache = SQLiteGradingCache(self.path, ttl=10)
+        with patch("src.services.grading_cache.time.time", return_value=100.0):
+            cache.set("k", make_result())
+        with patch("src.services.grading_cache.time.time", return_value=120.0):
+            self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats.misses, 1)
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from src.services.grading_cascade import (
+    GradingCascadeService, ExactMatchGrader, MultipleChoiceGrader, NumericGrader,
+    parse_option, parse_single_number, split_number
+)
+from src.services.mock_llm_service import MockLLMService
+from src.models.grading_request import GradingRequest
+
+from tests.async_test_case import AsyncTestCase
+
+class TestParsing(unittest.TestCase):
+    def test_parse_option(self):
+        self.assertEqual(parse_option("(b)"), "B")
+        self.assertEqual(parse_option("C) Rome"), "C")
+        self.assertEqual(parse_option("The correct answer is d."), "D")
+        self.assertEqual(parse_option("A) London\nB) Paris\nC) Rome\nAnswer: B"), "B")
+        self.assertIsNone(parse_option("A) London\nB) Paris"))
+        self.assertIsNone(parse_option("A variable stores data"))
+        self.assertIsNone(parse_option("Answer: A or answer: B"))
+        self.assertIsNone(parse_option("b or c"))
+
+    def test_parse_single_number(self):
+        self.assertEqual(parse_single_number("x = 3.5"), 3.5)
+        self.assertEqual(parse_single_number("1,000"), 1000.0)
+        self.assertEqual(parse_single_number("1/4"), 0.25)
+        self.assertEqual(parse_single_number("12%"), 0.12)
+        self.assertIsNone(parse_single_number("between 3 and 4"))
+        self.assertIsNone(parse_single_number("Python 3 added many new features to the language"))
+
+    def test_split_number(self):
+        self.assertEqual(split_number("The answer is 9.8 m/s."), (9.8, "", "m/s"))
+        self.assertEqual(split_number("x^2"), (2.0, "x^", ""))
+        self.assertIsNone(split_number("3 or 4"))
+
+class TestDeterministicGraders(unittest.TestCase):
+    def test_exact_match_only_decides_matches(self):
+        grader = ExactMatchGrader()
+        self.assertEqual(grader.grade("Capital?", "  paris. ", "Paris").score, 100.0)
+        self.assertIsNone(grader.grade("Capital?", "It is Paris", "Paris"))
+
+    def test_exact_match_skips_code(self):
+        grader = ExactMatchGrader()
+        expected = "def f(x): return x"
+        self.assertIsNone(grader.grade("Write f", "def f(X): return X", expected, {"exercise_type": "coding"}))
+        self.assertIsNone(grader.grade("Write f", expected, expected, {"test_cases": ["assert f(1) == 1"]}))
+
+    def test_multiple_choice(self):
+        grader = MultipleChoiceGrader()
+        self.assertEqual(grader.grade("Pick one", "b)", "B").score, 100.0)
+        wrong = grader.grade("Pick one", "A", "B")
+        self.assertEqual(wrong.score, 0.0)
+        self.assertEqual(wrong.confidence, 1.0)
+        self.assertIsNone(grader.grade("Pick one", "I am not sure", "B"))
+        # Expected answers that are not a bare letter need multiple_choice metadata
+        self.assertIsNone(grader.grade("Who?", "A", "A. Lincoln"))
+        self.assertEqual(
+            grader.grade("Pick one", "c", "C) Rome", {"exercise_type": "multiple_choice"}).score, 100.0
+        )
+
+    def test_numeric_tolerance(self):
+        grader = NumericGrader()
+        self.assertEqual(grader.grade("2/3 as a decimal?", "0.6666667", "2/3", {"tolerance": 0.001}).score, 100.0)
+        self.assertEqual(grader.grade("6 * 7?", "The answer is 41", "42").score, 0.0)
+        self.assertEqual(grader.grade("6 * 7?", "42.0", "42").score, 100.0)
+        self.assertIsNone(grader.grade("Explain", "42", "It depends on the input size and memory"))
+
+    def test_numeric_escalates_answers_that_only_share_a_number(self):
+        grader = NumericGrader()
+        for student_answer, expected_answer in [("O(2^n)", "O(n^2)"), ("CO2", "H2O"), ("5 cm", "5 km"),
+                                                ("not 5", "5"), ("x^2", "2"), ("3", "Python 3")]:
+            self.assertIsNone(grader.grade("Q", student_answer, expected_answer), student_answer)
+        self.assertEqual(grader.grade("Length?", "5cm", "5 cm").score, 100.0)
+
+    def test_numeric_escalates_answers_at_other_precision(self):
+        grader = NumericGrader()
+        self.assertIsNone(grader.grade("Pi?", "3.14", "3.14159"))
+        self.assertIsNone(grader.grade("1/3?", "0.333", "0.3333333"))
+        self.assertIsNone(grader.grade("1/3?", "0.333", "1/3"))
+        self.assertEqual(grader.grade("Pi?", "3.15", "3.14").score, 0.0)
+        self.assertEqual(grader.grade("Pi?", "3.14", "3.14159", {"tolerance": 0.01}).score, 100.0)
+        self.assertEqual(grader.grade("Solve for x", "x = 3.5", "3.5").score, 100.0)
+
+class TestGradingCascadeService(AsyncTestCase):
+    def setUp(self):
+        self.service = GradingCascadeService(MockLLMService())
+
+    def test_deterministic_stage_skips_llm(self):
+        result = self.async_test(self.service.grade_answer("6 * 7?", "42", "42"))
+        self.assertEqual(result.score, 100.0)
+        self.assertEqual(result.metadata["grader"], "exact_match")
+        result = self.async_test(self.service.grade_answer("Explain loops", "They repeat code", "Loops repeat"))
+        self.assertEqual(result.score, 75.0)  # MockLLMService grade
+        self.assertEqual(self.service.stats.hits, {"exact_match": 1, "llm": 1})
+        self.assertEqual(self.service.stats.deterministic_rate, 0.5)
+
+    def test_batch_escalates_only_undecided(self):
+        requests = [
+            GradingRequest("Pick one", "a", "B"),
+            GradingRequest("Explain loops", "They repeat code", "Loops repeat"),
+            GradingRequest("Half of 9?", "4.5", "4.50"),
+        ]
+        batch = self.async_test(self.service.grade_answers(requests))
+        self.assertEqual([result.score for result in batch.results], [0.0, 75.0, 100.0])
+        self.assertEqual(self.service.stats.hits, {"multiple_choice": 1, "llm": 1, "numeric": 1})
+
+if __name__ == '__main__':
+    unittest.main()
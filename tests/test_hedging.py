@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+from src.services.hedging import HedgingPolicy
+
+from tests.async_test_case import AsyncTestCase
+
+def delayed(value, delay, started=None):
+    async def call():
+        if started is not None:
+            started.append(value)
+        await asyncio.sleep(delay)
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return call
+
+class TestHedgingPolicy(AsyncTestCase):
+    def test_delay_uses_latency_percentile(self):
+        policy = HedgingPolicy(percentile=90, initial_delay=1.0, min_samples=10)
+        self.assertEqual(policy.delay(), 1.0)
+        for latency in range(1, 11):
+            policy.record(latency / 100)
+        self.assertAlmostEqual(policy.delay(), 0.09)
+
+    def test_fast_call_is_not_hedged(self):
+        policy = HedgingPolicy(initial_delay=0.5)
+        started = []
+        result = self.async_test(policy.run(delayed("primary", 0), delayed("hedge", 0, started)))
+        self.assertEqual(result, "primary")
+        self.assertEqual((policy.hedged, started), (0, []))
+
+    def test_slow_call_is_hedged_and_cancelled(self):
+        policy = HedgingPolicy(initial_delay=0.02)
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        result = self.async_test(policy.run(slow, delayed("hedge", 0)))
+        self.assertEqual(result, "hedge")
+        self.assertEqual((policy.hedged, policy.hedge_wins), (1, 1))
+        self.async_test(asyncio.sleep(0))
+        self.assertEqual(cancelled, [True])
+
+    def test_failed_attempt_waits_for_the_other(self):
+        policy = HedgingPolicy(initial_delay=0.01)
+        result = self.async_test(policy.run(delayed("primary", 0.05), delayed(RuntimeError("down"), 0)))
+        self.assertEqual(result, "primary")
+        with self.assertRaisesRegex(RuntimeError, "primary failed"):
+            self.async_test(policy.run(
+                delayed(RuntimeError("primary failed"), 0.05), delayed(RuntimeError("hedge failed"), 0)
+            ))
+
+    def test_hedge_rate_is_capped(self):
+        policy = HedgingPolicy(initial_delay=0.001, min_delay=0.001, max_hedge_rate=0.25)
+        for _ in range(8):
+            self.async_test(policy.run(delayed("primary", 0.01), delayed("hedge", 0.05)))
+        self.assertEqual(policy.calls, 8)
+        self.assertEqual(policy.hedged, 2)
+
+if __name__ == '__main__':
+    unittest.main()
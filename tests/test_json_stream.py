@@ -0,0 +1,60 @@
+import unittest
+from src.services.json_stream import JSONFieldStream, JSONObjectStream
+
+class TestJSONObjectStream(unittest.TestCase):
+    def test_object_split_across_chunks(self):
+        stream = JSONObjectStream()
+        text = '{"question": "What is {x}?", "answer": "a \\"quoted\\" }", "tags": [1, {"a": 2}]}'
+        objects = []
+        for i in range(0, len(text), 3):
+            objects.extend(stream.feed(text[i:i + 3]))
+        self.assertEqual(objects, [{"question": "What is {x}?", "answer": 'a "quoted" }',
+                                    "tags": [1, {"a": 2}]}])
+        self.assertEqual(stream.pending, "")
+
+    def test_skips_text_between_objects(self):
+        stream = JSONObjectStream()
+        objects = stream.feed('```json\n{"a": 1}\n```\nAnd another: {"b"')
+        self.assertEqual(objects, [{"a": 1}])
+        self.assertEqual(stream.pending, '{"b"')
+        self.assertEqual(stream.feed(': 2}'), [{"b": 2}])
+
+    def test_invalid_object_raises(self):
+        with self.assertRaises(ValueError):
+            JSONObjectStream().feed('{"a": oops}')
+
+class TestJSONFieldStream(unittest.TestCase):
+    TEXT = ('{"score": 85, "confidence": 0.9, "feedback": "Good \\"job\\" \\u00e9t\\u00e9!", '
+            '"metadata": {"tags": [1, "}"]}, "final": true}')
+
+    def feed_in_chunks(self, size):
+        stream = JSONFieldStream()
+        events = []
+        for i in range(0, len(self.TEXT), size):
+            events.extend(stream.feed(self.TEXT[i:i + size]))
+        self.assertTrue(stream.done)
+        return events
+
+    def test_fields_reported_in_order_for_any_chunking(self):
+        for size in (1, 2, 5, len(self.TEXT)):
+            events = self.feed_in_chunks(size)
+            values = [(key, value) for kind, key, value in events if kind == "value"]
+            self.assertEqual(values, [
+                ("score", 85), ("confidence", 0.9), ("feedback", 'Good "job" été!'),
+                ("metadata", {"tags": [1, "}"]}), ("final", True)
+            ])
+            feedback = "".join(value for kind, key, value in events if kind == "delta")
+            self.assertEqual(feedback, 'Good "job" été!')
+
+    def test_string_deltas_arrive_before_value_completes(self):
+        stream = JSONFieldStream()
+        self.assertEqual(stream.feed('{"score": 70,'), [("value", "score", 70)])
+        self.assertEqual(stream.feed(' "feedback": "Nice wo'), [("delta", "feedback", "Nice wo")])
+        self.assertEqual(stream.feed('rk\\'), [("delta", "feedback", "rk")])
+        self.assertEqual(stream.feed('n"'), [
+            ("delta", "feedback", "\n"), ("value", "feedback", "Nice work\n")
+        ])
+        self.assertFalse(stream.done)
+
+if __name__ == '__main__':
+    unittest.main()
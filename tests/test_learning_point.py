@@ -31,11 +31,20 @@ class TestLearningPoint(unittest.TestCase):
         self.assertIn("Python Basics", topics)
         self.assertIn("Variables", topics)
         
-    def test_get_topics_returns_copy(self):
+    def test_get_topics_returns_read_only_view(self):
         self.learning_point.add_topic("Python Basics")
         topics = self.learning_point.get_topics()
-        topics.add("New Topic")
-        self.assertNotIn("New Topic", self.learning_point.topics)
+        self.assertFalse(hasattr(topics, "add"))
+        self.learning_point.add_topic("Variables")
+        self.assertEqual(topics, {"Python Basics", "Variables"})
+
+    def test_equality_and_hash_by_name(self):
+        same = LearningPoint("variables", "Different description")
+        other = LearningPoint("functions", "Understanding variables in programming")
+        self.assertEqual(self.learning_point, same)
+        self.assertEqual(hash(self.learning_point), hash(same))
+        self.assertNotEqual(self.learning_point, other)
+        self.assertEqual(len({self.learning_point, same, other}), 2)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import time
+import unittest
+from src.services.llm_router import CircuitBreaker, NoBackendAvailableError, RouterLLMService
+from src.services.mock_llm_service import MockLLMService
+from src.models.grading_result import GradingResult
+from src.models.grading_request import GradingRequest
+from src.learning_point import LearningPoint
+
+from tests.async_test_case import AsyncTestCase
+
+class BadRequestError(Exception):
+    status_code = 400
+
+class BackendMockLLMService(MockLLMService):
+    """Mock backend that can be slowed down or made to fail."""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay
+        self.error = None
+        self.graded = 0
+
+    async def grade_answer(self, problem, student_answer, expected_answer=None, metadata=None):
+        self.graded += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return GradingResult(score=80, feedback=self.name, metadata={})
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_half_opens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.01)
+        breaker.on_failure()
+        self.assertTrue(breaker.available())
+        breaker.on_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.before_call())
+        time.sleep(0.02)
+        self.assertTrue(breaker.before_call())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.before_call())  # One trial at a time
+        breaker.on_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0)
+        for _ in range(3):
+            breaker.on_failure()
+        self.assertTrue(breaker.before_call())
+        breaker.on_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+class TestRouterLLMService(AsyncTestCase):
+    def setUp(self):
+        self.first = BackendMockLLMService("first", delay=0.01)
+        self.second = BackendMockLLMService("second", delay=0.01)
+        self.router = RouterLLMService([self.first, self.second], names=["first", "second"], failure_threshold=2)
+
+    def test_least_outstanding_spreads_concurrent_calls(self):
+        requests = [GradingRequest("Q", f"answer {i}") for i in range(10)]
+        batch = self.async_test(self.router.grade_answers(requests, max_concurrency=4))
+        self.assertTrue(batch.succeeded)
+        self.assertEqual((self.first.graded, self.second.graded), (5, 5))
+
+    def test_failover_and_circuit_breaking(self):
+        self.first.error = ConnectionError("region down")
+        for _ in range(4):
+            result = self.async_test(self.router.grade_answer("Q", "A"))
+            self.assertEqual(result.feedback, "second")
+        self.assertEqual(self.first.graded, 2)  # Skipped once its breaker opened
+        self.assertEqual(self.router.stats()[0]["state"], CircuitBreaker.OPEN)
+        self.assertGreaterEqual(self.router.failovers, 2)
+
+    def test_all_backends_failing(self):
+        self.first.error = self.second.error = ConnectionError("down")
+        with self.assertRaises(ConnectionError):
+            self.async_test(self.router.grade_answer("Q", "A"))
+        with self.assertRaises(ConnectionError):
+            self.async_test(self.router.grade_answer("Q", "A"))
+        with self.assertRaises(NoBackendAvailableError):
+            self.async_test(self.router.grade_answer("Q", "A"))
+
+    def test_bad_request_is_not_failed_over(self):
+        self.first.error = self.second.error = BadRequestError("too long")
+        with self.assertRaises(BadRequestError):
+            self.async_test(self.router.grade_answer("Q", "A"))
+        self.assertEqual(self.first.graded + self.second.graded, 1)
+        self.assertEqual(self.router.failovers, 0)
+
+    def test_latency_weighted_prefers_fast_backend(self):
+        slow = BackendMockLLMService("slow", delay=0.05)
+        fast = BackendMockLLMService("fast", delay=0.001)
+        router = RouterLLMService([slow, fast], strategy="latency_weighted")
+        for _ in range(30):
+            self.async_test(router.grade_answer("Q", "A"))
+        self.assertGreater(fast.graded, slow.graded)
+
+    def test_generate_exercises_routes(self):
+        exercises = self.async_test(self.router.generate_exercises([LearningPoint("loops", "Repeating code")]))
+        self.assertEqual(len(exercises), 1)
+
+if __name__ == '__main__':
+    unittest.main()
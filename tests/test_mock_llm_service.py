@@ -26,6 +26,24 @@ class TestMockLLMService(unittest.TestCase):
             self.assertEqual(exercise.exercise_type, "open_ended")
             self.assertEqual(exercise.related_learning_points, ["variables"])
 
+    def test_astream_exercises(self):
+        async def collect():
+            return [exercise async for exercise in self.llm_service.astream_exercises(
+                learning_points=[self.learning_point], count=3, difficulty="beginner"
+            )]
+        exercises = asyncio.run(collect())
+        self.assertEqual(len(exercises), 3)
+        self.assertTrue(all(exercise.difficulty_level == "beginner" for exercise in exercises))
+
+    def test_astream_grade_default_implementation(self):
+        async def collect():
+            return [event async for event in self.llm_service.astream_grade("Problem", "Answer")]
+        events = asyncio.run(collect())
+        self.assertEqual([event.kind for event in events], ["score", "feedback", "result"])
+        self.assertEqual(events[0].score, 75.0)
+        self.assertEqual(events[1].text, "Mock grading feedback")
+        self.assertEqual(events[2].result.score, 75.0)
+
     def test_multiple_learning_points(self):
         second_point = LearningPoint(
             "functions",
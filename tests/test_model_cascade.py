@@ -0,0 +1,71 @@
+import unittest
+from src.services.model_cascade import ModelCascadeService
+from src.services.mock_llm_service import MockLLMService
+from src.models.grading_result import GradingResult
+from src.models.grading_request import GradingRequest
+
+from tests.async_test_case import AsyncTestCase
+
+class ScriptedMockLLMService(MockLLMService):
+    """Grades each answer with the (score, confidence) scripted for it."""
+
+    def __init__(self, grades, error=None):
+        self.grades = grades
+        self.error = error
+        self.graded = []
+
+    async def grade_answer(self, problem, student_answer, expected_answer=None, metadata=None):
+        self.graded.append(student_answer)
+        if self.error is not None:
+            raise self.error
+        score, confidence = self.grades[student_answer]
+        return GradingResult(score=score, feedback=student_answer, metadata={}, confidence=confidence)
+
+class TestModelCascadeService(AsyncTestCase):
+    def setUp(self):
+        self.fast = ScriptedMockLLMService({
+            "sure": (90, 0.95),
+            "unsure": (90, 0.5),
+            "borderline": (58, 0.95),
+        })
+        self.strong = ScriptedMockLLMService({
+            "unsure": (40, 0.9),
+            "borderline": (70, 0.9),
+        })
+        self.service = ModelCascadeService(self.fast, self.strong)
+
+    def test_confident_grade_stays_on_fast_tier(self):
+        result = self.async_test(self.service.grade_answer("Q", "sure"))
+        self.assertEqual(result.metadata["tier"], "fast")
+        self.assertEqual(self.strong.graded, [])
+
+    def test_escalation_reasons(self):
+        unsure = self.async_test(self.service.grade_answer("Q", "unsure"))
+        self.assertEqual((unsure.score, unsure.metadata["tier"]), (40, "strong"))
+        self.assertEqual(unsure.metadata["escalation_reason"], "low_confidence")
+        self.assertEqual(unsure.metadata["fast_score"], 90)
+        borderline = self.async_test(self.service.grade_answer("Q", "borderline"))
+        self.assertEqual(borderline.metadata["escalation_reason"], "near_boundary")
+        self.assertEqual(self.service.stats.hits, {"strong": 2})
+
+    def test_strong_failure_keeps_fast_grade(self):
+        self.strong.error = RuntimeError("overloaded")
+        result = self.async_test(self.service.grade_answer("Q", "unsure"))
+        self.assertEqual((result.score, result.metadata["tier"]), (90, "fast"))
+        self.assertEqual(result.metadata["escalation_error"], "overloaded")
+
+    def test_fast_failure_escalates(self):
+        self.fast.error = RuntimeError("timeout")
+        result = self.async_test(self.service.grade_answer("Q", "borderline"))
+        self.assertEqual((result.score, result.metadata["escalation_reason"]), (70, "error"))
+
+    def test_batch_escalates_only_uncertain(self):
+        requests = [GradingRequest("Q", answer) for answer in ["sure", "unsure", "borderline"]]
+        batch = self.async_test(self.service.grade_answers(requests))
+        self.assertTrue(batch.succeeded)
+        self.assertEqual([result.score for result in batch.results], [90, 40, 70])
+        self.assertEqual([result.metadata["tier"] for result in batch.results], ["fast", "strong", "strong"])
+        self.assertEqual(self.strong.graded, ["unsure", "borderline"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from src.services.near_duplicate_index import NearDuplicateIndex, simhash
+
+class TestSimHash(unittest.TestCase):
+    def test_ignores_case_punctuation_and_word_order(self):
+        self.assertEqual(
+            simhash("Explain the difference between a list and a tuple in Python."),
+            simhash("explain the difference between a TUPLE and a list in python")
+        )
+
+    def test_unrelated_questions_differ(self):
+        distance = (simhash("What is a variable?") ^ simhash("How do you declare a constant in JavaScript?")).bit_count()
+        self.assertGreater(distance, 3)
+
+    def test_empty_text(self):
+        self.assertEqual(simhash("?!"), 0)
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = NearDuplicateIndex(max_distance=3)
+
+    def test_add_if_unique_rejects_near_duplicates(self):
+        self.assertEqual(self.index.add_if_unique("What is a for loop in Python?"), 0)
+        self.assertIsNone(self.index.add_if_unique("What is a for-loop in python"))
+        self.assertEqual(self.index.add_if_unique("How do you open a file in Python?"), 1)
+        self.assertEqual(len(self.index), 2)
+
+    def test_query_orders_by_distance(self):
+        first = self.index.add("What is a for loop in Python?")
+        self.index.add("Write a function that reverses a string.")
+        self.assertEqual(self.index.query("what is a FOR loop in python"), [first])
+        self.assertTrue(self.index.contains("What is a for loop in Python?"))
+        self.assertFalse(self.index.contains("Describe the water cycle."))
+
+    def test_lookup_matches_brute_force(self):
+        questions = [f"Question number {i} about topic {i % 7} and item {i * 3}" for i in range(300)]
+        for question in questions:
+            self.index.add(question)
+        for question in questions[:50]:
+            fingerprint = simhash(question + " extra")
+            expected = sorted(
+                item_id for item_id in range(len(questions))
+                if (self.index.fingerprint(item_id) ^ fingerprint).bit_count() <= 3
+            )
+            self.assertEqual(sorted(self.index.query(question + " extra")), expected)
+
+    def test_invalid_distance(self):
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(max_distance=16)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,15 @@
 import unittest
-from unittest.mock import patch, AsyncMock
+from unittest.mock import patch, AsyncMock, MagicMock
 import os
 import asyncio
+import json
+import openai
 from src.services.openai_service import OpenAIService
+from src.services.client_pool import HTTPClientOptions, shared_client_count
+from src.services.hedging import HedgingPolicy
 from src.learning_point import LearningPoint
 from src.models.exercise import Exercise
+from src.models.grading_request import GradingRequest
 
 from tests.async_test_case import AsyncTestCase
 
@@ -15,7 +20,7 @@ class TestOpenAIService(AsyncTestCase):
         self.test_api_key = "test-key"
         self.patcher = patch('openai.AsyncOpenAI')
         self.mock_openai = self.patcher.start()
-        self.service = OpenAIService(api_key=self.test_api_key)
+        self.service = OpenAIService(api_key=self.test_api_key, raise_on_error=False)
         self.learning_point = LearningPoint(
             "variables",
             "Understanding variables in programming"
@@ -153,5 +158,438 @@ class TestOpenAIService(AsyncTestCase):
         )
         self.assertEqual(len(exercises), 0)
 
+def make_completion(content):
+    """Build a fake chat completion response with a single choice."""
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+GRADE_JSON = '{"score": 80, "feedback": "Good", "metadata": {"confidence": 0.9}}'
+
+class TestOpenAIServiceBatchGrading(AsyncTestCase):
+    def setUp(self):
+        self.service = OpenAIService(api_key="test-key", max_concurrency=2)
+        self.service.client = MagicMock()
+
+    def test_grade_answers_reports_errors_per_item(self):
+        self.service.client.chat.completions.create = AsyncMock(side_effect=[
+            make_completion(GRADE_JSON),
+            make_completion("not json"),
+            make_completion(GRADE_JSON),
+        ])
+        requests = [
+            GradingRequest(problem="What is a variable?", student_answer=f"answer {i}")
+            for i in range(3)
+        ]
+        batch = self.async_test(self.service.grade_answers(requests))
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.results[0].score, 80.0)
+        self.assertIsNone(batch.results[1])
+        self.assertIn(1, batch.errors)
+        self.assertEqual(batch.results[2].confidence, 0.9)
+
+class TestOpenAIServicePackedGrading(AsyncTestCase):
+    def setUp(self):
+        self.service = OpenAIService(api_key="test-key", max_answers_per_pack=3)
+        self.service.client = MagicMock()
+
+    def test_split_into_packs_respects_answer_limit(self):
+        packs = self.service._split_into_packs("Problem", [f"answer {i}" for i in range(7)])
+        self.assertEqual(packs, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_split_into_packs_respects_token_budget(self):
+        self.service.max_packed_prompt_tokens = self.service._estimate_tokens(
+            self.service._create_packed_grading_prompt("Problem", [])
+        ) + 32
+        packs = self.service._split_into_packs("Problem", ["x" * 80, "y" * 80, "z"])
+        self.assertEqual(packs, [[0], [1, 2]])
+
+    def test_packed_prompt_shares_problem(self):
+        prompt = self.service._create_packed_grading_prompt(
+            "What is a loop?", ["first", "second"], "A repeated block"
+        )
+        self.assertEqual(prompt.count("What is a loop?"), 1)
+        self.assertIn("Student Answer 2:\nsecond", prompt)
+
+    def test_parse_packed_response_orders_by_answer(self):
+        content = (
+            '[{"answer": 2, "score": 40, "feedback": "b", "metadata": {}},'
+            ' {"answer": 1, "score": 90, "feedback": "a", "metadata": {}}]'
+        )
+        results = self.service._parse_packed_grading_response(content, 2)
+        self.assertEqual([result.score for result in results], [90.0, 40.0])
+        with self.assertRaises(ValueError):
+            self.service._parse_packed_grading_response(content, 3)
+
+    def test_parse_packed_response_requires_each_answer_number(self):
+        grade = '{{"answer": {}, "score": 50, "feedback": "f", "metadata": {{}}}}'
+        for numbers in ([1, 1], [1, 3], [0, 1], [2, None]):
+            content = "[" + ", ".join(
+                grade.format(number) if number is not None
+                else '{"score": 50, "feedback": "f", "metadata": {}}'
+                for number in numbers
+            ) + "]"
+            with self.assertRaises(ValueError):
+                self.service._parse_packed_grading_response(content, 2)
+
+    def test_misnumbered_pack_is_graded_per_answer(self):
+        misnumbered = (
+            '[{"answer": 1, "score": 70, "feedback": "a", "metadata": {}},'
+            ' {"answer": 1, "score": 60, "feedback": "b", "metadata": {}}]'
+        )
+        self.service.client.chat.completions.create = AsyncMock(side_effect=[
+            make_completion(misnumbered),
+            make_completion(GRADE_JSON),
+            make_completion(GRADE_JSON),
+        ])
+        batch = self.async_test(
+            self.service.grade_answers_packed("What is a loop?", ["first", "second"])
+        )
+        self.assertEqual([result.score for result in batch.results], [80.0, 80.0])
+        self.assertEqual(batch.errors, {})
+        self.assertEqual(self.service.client.chat.completions.create.await_count, 3)
+
+    def test_grade_answers_packed(self):
+        packed = (
+            '[{"answer": 1, "score": 70, "feedback": "a", "metadata": {}},'
+            ' {"answer": 2, "score": 60, "feedback": "b", "metadata": {}}]'
+        )
+        self.service.client.chat.completions.create = AsyncMock(
+            return_value=make_completion(packed)
+        )
+        batch = self.async_test(
+            self.service.grade_answers_packed("What is a loop?", ["first", "second"])
+        )
+        self.assertEqual([result.score for result in batch.results], [70.0, 60.0])
+        self.service.client.chat.completions.create.assert_awaited_once()
+
+class RateLimitError(Exception):
+    """Stand-in for an HTTP 429 error from the API."""
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("Rate limit exceeded")
+        self.response = MagicMock(headers={"retry-after": retry_after} if retry_after else {})
+
+class TestOpenAIServiceRateLimiting(AsyncTestCase):
+    def setUp(self):
+        self.service = OpenAIService(api_key="test-key", max_concurrency=4, max_retries=2)
+        self.service.scheduler.base_delay = 0.001
+        self.service.client = MagicMock()
+
+    def test_throttled_grade_is_retried(self):
+        self.service.client.chat.completions.create = AsyncMock(side_effect=[
+            RateLimitError(retry_after="0"),
+            make_completion(GRADE_JSON),
+        ])
+        result = self.async_test(self.service.grade_answer("Problem", "answer"))
+        self.assertEqual(result.score, 80.0)
+        self.assertEqual(self.service.scheduler.throttled, 1)
+        self.assertEqual(self.service.scheduler.concurrency.limit, 2)
+
+    def test_exhausted_retries_raise(self):
+        self.service.client.chat.completions.create = AsyncMock(side_effect=RateLimitError())
+        with self.assertRaises(RateLimitError):
+            self.async_test(self.service.grade_answer("Problem", "answer"))
+        self.assertEqual(self.service.client.chat.completions.create.await_count, 3)
+        with self.assertRaises(RateLimitError):
+            self.async_test(self.service.generate_exercises([LearningPoint("loops", "Loops")]))
+
+    def test_exhausted_retries_in_batch_are_errors(self):
+        self.service.client.chat.completions.create = AsyncMock(side_effect=RateLimitError())
+        batch = self.async_test(self.service.grade_answers([GradingRequest("Problem", "answer")]))
+        self.assertEqual(batch.results, [None])
+        self.assertIsInstance(batch.errors[0], RateLimitError)
+
+    def test_error_result_without_raise_on_error(self):
+        self.service.raise_on_error = False
+        self.service.client.chat.completions.create = AsyncMock(side_effect=RateLimitError())
+        result = self.async_test(self.service.grade_answer("Problem", "answer"))
+        self.assertEqual(result.score, 0)
+        self.assertIn("error", result.metadata)
+
+def make_stream(*deltas):
+    """Build a fake streamed completion from (choice index, content) pairs."""
+    async def stream():
+        for index, content in deltas:
+            yield MagicMock(choices=[MagicMock(index=index, delta=MagicMock(content=content))])
+    return stream()
+
+class TestOpenAIServiceChunkedGeneration(AsyncTestCase):
+    def setUp(self):
+        self.service = OpenAIService(api_key="test-key", max_choices_per_request=8)
+        self.service.client = MagicMock()
+        self.learning_point = LearningPoint("loops", "Repeating code")
+        self.questions = iter(f"Question {i}?" for i in range(1000))
+
+    def completion_with_questions(self, questions):
+        return MagicMock(choices=[
+            MagicMock(message=MagicMock(content=json.dumps(
+                {"question": question, "expected_answer": "A", "explanation": "E"}
+            )))
+            for question in questions
+        ])
+
+    def unique_completion(self, **kwargs):
+        return self.completion_with_questions([next(self.questions) for _ in range(kwargs["n"])])
+
+    def test_coding_exercises_have_test_cases(self):
+        prompt = self.service._create_prompt([self.learning_point], "beginner", "coding")
+        self.assertIn('"test_cases"', prompt)
+        exercise = self.service._exercise_from_dict(
+            {"question": "Write add", "expected_answer": "def add(a, b): return a + b",
+             "explanation": "Adds", "test_cases": ["assert add(1, 2) == 3"]},
+            [self.learning_point], "beginner", "coding"
+        )
+        self.assertEqual(exercise.test_cases, ["assert add(1, 2) == 3"])
+
+    def test_large_count_split_into_bounded_requests(self):
+        create = AsyncMock(side_effect=self.unique_completion)
+        self.service.client.chat.completions.create = create
+        exercises = self.async_test(self.service.generate_exercises([self.learning_point], count=20))
+        self.assertEqual(len(exercises), 20)
+        self.assertEqual(sorted(call.kwargs["n"] for call in create.call_args_list), [4, 8, 8])
+
+    def test_duplicates_removed_and_topped_up(self):
+        responses = [
+            self.completion_with_questions(["What is a loop?", "what is a  LOOP", "Other?"]),
+            self.completion_with_questions(["Third question?"]),
+        ]
+        create = AsyncMock(side_effect=responses)
+        self.service.client.chat.completions.create = create
+        exercises = self.async_test(self.service.generate_exercises([self.learning_point], count=3))
+        self.assertEqual([exercise.question for exercise in exercises],
+                         ["What is a loop?", "Other?", "Third question?"])
+        self.assertEqual([call.kwargs["n"] for call in create.call_args_list], [3, 1])
+
+    def test_top_up_rounds_are_bounded(self):
+        create = AsyncMock(side_effect=lambda **kwargs: self.completion_with_questions(["Same?"] * kwargs["n"]))
+        self.service.client.chat.completions.create = create
+        exercises = self.async_test(self.service.generate_exercises([self.learning_point], count=2))
+        self.assertEqual(len(exercises), 1)
+        self.assertEqual(create.await_count, 1 + self.service.max_top_up_rounds)
+
+class TestOpenAIServiceStreaming(AsyncTestCase):
+    def setUp(self):
+        self.service = OpenAIService(api_key="test-key", raise_on_error=False)
+        self.service.client = MagicMock()
+        self.learning_point = LearningPoint("loops", "Repeating code")
+
+    def collect(self, **kwargs):
+        async def collect():
+            return [exercise async for exercise in self.service.astream_exercises(
+                [self.learning_point], **kwargs
+            )]
+        return self.async_test(collect())
+
+    def test_astream_exercises_yields_each_choice_when_complete(self):
+        self.service.client.chat.completions.create = AsyncMock(return_value=make_stream(
+            (0, '{"question": "Q1", "expected'),
+            (1, '{"question": "Q2", "expected_answer": "A2", "explanation": "E2"}'),
+            (0, '_answer": "A1", "explanation": "E1"}'),
+        ))
+        exercises = self.collect(count=2, exercise_type="coding")
+        self.assertEqual([exercise.question for exercise in exercises], ["Q2", "Q1"])
+        self.assertEqual(exercises[0].related_learning_points, ["loops"])
+        self.assertEqual(exercises[0].exercise_type, "coding")
+        kwargs = self.service.client.chat.completions.create.call_args.kwargs
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(kwargs["n"], 2)
+
+    def test_astream_exercises_skips_malformed_choices(self):
+        self.service.client.chat.completions.create = AsyncMock(return_value=make_stream(
+            (0, '{"question": "missing fields"}'),
+            (1, '{"question": "Q", "expected_answer": "A", "explanation": "E"}'),
+        ))
+        self.assertEqual([exercise.question for exercise in self.collect(count=2)], ["Q"])
+
+    def test_astream_exercises_splits_large_counts(self):
+        self.service.max_choices_per_request = 8
+        questions = iter(f"Question {i}?" for i in range(1000))
+
+        def unique_stream(**kwargs):
+            return make_stream(*[
+                (index, json.dumps({"question": next(questions), "expected_answer": "A", "explanation": "E"}))
+                for index in range(kwargs["n"])
+            ])
+
+        create = AsyncMock(side_effect=unique_stream)
+        self.service.client.chat.completions.create = create
+        self.assertEqual(len(self.collect(count=20)), 20)
+        self.assertEqual(sorted(call.kwargs["n"] for call in create.call_args_list), [4, 8, 8])
+
+        create.reset_mock()
+        self.assertEqual(self.collect(count=0), [])
+        create.assert_not_called()
+
+    def test_astream_exercises_failed_request_keeps_others(self):
+        self.service.max_choices_per_request = 1
+        self.service.client.chat.completions.create = AsyncMock(side_effect=[
+            make_stream((0, '{"question": "Q", "expected_answer": "A", "explanation": "E"}')),
+            Exception("API Error"),
+            make_stream((0, '{"question": "q ", "expected_answer": "A", "explanation": "E"}')),
+        ])
+        self.assertEqual([exercise.question for exercise in self.collect(count=3)], ["Q"])
+
+    def test_astream_exercises_api_error(self):
+        self.service.client.chat.completions.create = AsyncMock(side_effect=Exception("API Error"))
+        self.assertEqual(self.collect(), [])
+
+    def test_astream_exercises_error_mid_stream(self):
+        async def broken_stream():
+            yield MagicMock(choices=[MagicMock(index=0, delta=MagicMock(
+                content='{"question": "Q", "expected_answer": "A", "explanation": "E"}'
+            ))])
+            raise ConnectionError("stream dropped")
+
+        self.service.client.chat.completions.create = AsyncMock(return_value=broken_stream())
+        self.assertEqual([exercise.question for exercise in self.collect()], ["Q"])
+
+        self.service.raise_on_error = True
+        self.service.client.chat.completions.create = AsyncMock(return_value=broken_stream())
+        with self.assertRaises(ConnectionError):
+            self.collect()
+
+class TestOpenAIServiceStreamingGrading(AsyncTestCase):
+    def setUp(self):
+        self.service = OpenAIService(api_key="test-key", raise_on_error=False)
+        self.service.client = MagicMock()
+
+    def collect(self):
+        async def collect():
+            return [event async for event in self.service.astream_grade("What is a loop?", "Repetition")]
+        return self.async_test(collect())
+
+    def test_score_precedes_feedback(self):
+        self.service.client.chat.completions.create = AsyncMock(return_value=make_stream(
+            (0, '{"score": 90, "confid'),
+            (0, 'ence": 0.8, "feedback": "Clear '),
+            (0, 'answer.", "metadata": {"mastery_level": "advanced"}}'),
+        ))
+        events = self.collect()
+        self.assertEqual([event.kind for event in events], ["score", "feedback", "feedback", "result"])
+        self.assertEqual((events[0].score, events[0].confidence), (90.0, 0.8))
+        self.assertEqual("".join(event.text for event in events[1:3]), "Clear answer.")
+        result = events[-1].result
+        self.assertEqual(result.feedback, "Clear answer.")
+        self.assertEqual(result.confidence, 0.8)
+        self.assertEqual(result.metadata["mastery_level"], "advanced")
+        prompt = self.service.client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        self.assertLess(prompt.index('"confidence"'), prompt.index('"feedback"'))
+
+    def test_truncated_stream_ends_with_error_result(self):
+        self.service.client.chat.completions.create = AsyncMock(return_value=make_stream(
+            (0, '{"score": 90, "feedback": "Cut o'),
+        ))
+        events = self.collect()
+        self.assertEqual([event.kind for event in events], ["score", "feedback", "result"])
+        self.assertIsNone(events[0].confidence)
+        self.assertEqual(events[-1].result.score, 0)
+        self.assertIn("error", events[-1].result.metadata)
+        self.assertEqual(events[-1].result.metadata["retracted_score"], 90.0)
+
+    def test_unparseable_score_is_not_marked_sent(self):
+        self.service.client.chat.completions.create = AsyncMock(return_value=make_stream(
+            (0, '{"score": "high", "confidence": 0.8, "feedback": "Good"}'),
+        ))
+        events = self.collect()
+        self.assertEqual([event.kind for event in events], ["score", "result"])
+        self.assertEqual(events[0].score, 0)
+        self.assertIn("error", events[-1].result.metadata)
+        self.assertNotIn("retracted_score", events[-1].result.metadata)
+
+class TestOpenAIServiceHedging(AsyncTestCase):
+    def setUp(self):
+        self.service = OpenAIService(
+            api_key="test-key",
+            hedging=HedgingPolicy(initial_delay=0.02),
+            hedge_model="gpt-4o-mini"
+        )
+        self.service.client = MagicMock()
+        self.service.hedge_client = self.service.client
+
+    def test_slow_grade_is_hedged_with_secondary_model(self):
+        content = json.dumps({"score": 80, "feedback": "Good", "metadata": {"confidence": 0.9}})
+
+        async def create(**kwargs):
+            if kwargs["model"] == "gpt-3.5-turbo":
+                await asyncio.sleep(5)
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+        self.service.client.chat.completions.create = create
+        result = self.async_test(self.service.grade_answer("What is 2+2?", "4"))
+        self.assertEqual(result.score, 80.0)
+        self.assertEqual(self.service.hedging.hedge_wins, 1)
+
+    def test_packed_grading_is_not_hedged(self):
+        create = AsyncMock(return_value=MagicMock(choices=[MagicMock(message=MagicMock(content="{}"))]))
+        self.service.client.chat.completions.create = create
+        self.async_test(self.service._create_grading_completion("prompt", expected_grades=3))
+        self.assertEqual(self.service.hedging.calls, 0)
+
+class TestOpenAIServiceClientPool(AsyncTestCase):
+    def test_services_share_client_per_key_and_base_url(self):
+        first = OpenAIService(api_key="pool-key", share_client=True)
+        second = OpenAIService(api_key="pool-key", share_client=True)
+        other_endpoint = OpenAIService(api_key="pool-key", base_url="http://localhost:8000/v1", share_client=True)
+        self.assertIs(first.client, second.client)
+        self.assertIsNot(first.client, other_endpoint.client)
+        for service in (first, second, other_endpoint):
+            self.async_test(service.aclose())
+
+    def test_clients_are_not_shared_by_default(self):
+        count = shared_client_count()
+        first = OpenAIService(api_key="default-key")
+        second = OpenAIService(api_key="default-key")
+        self.assertIsNot(first.client, second.client)
+        self.assertEqual(shared_client_count(), count)
+        for service in (first, second):
+            self.async_test(service.aclose())
+
+    def test_sdk_timeout_kept_unless_set(self):
+        default = OpenAIService(api_key="timeout-key")
+        custom = OpenAIService(api_key="timeout-key", http_options=HTTPClientOptions(timeout=20.0))
+        self.assertEqual(default.client.timeout, openai.DEFAULT_TIMEOUT)
+        self.assertEqual(custom.client.timeout.read, 20.0)
+        for service in (default, custom):
+            self.async_test(service.aclose())
+
+    def test_hedge_endpoint_client_released_on_close(self):
+        count = shared_client_count()
+        service = OpenAIService(api_key="hedge-key", hedge_base_url="http://localhost:8001/v1",
+                                share_client=True)
+        self.assertIsNot(service.hedge_client, service.client)
+        self.assertEqual(shared_client_count(), count + 2)
+        self.async_test(service.aclose())
+        self.assertEqual(shared_client_count(), count)
+
+    def test_shared_client_closes_with_last_service(self):
+        count = shared_client_count()
+        first = OpenAIService(api_key="close-key", share_client=True)
+        second = OpenAIService(api_key="close-key", share_client=True)
+        self.assertEqual(shared_client_count(), count + 1)
+        self.async_test(first.aclose())
+        self.async_test(first.aclose())  # Closing twice releases once
+        self.assertEqual(shared_client_count(), count + 1)
+        self.async_test(second.aclose())
+        self.assertEqual(shared_client_count(), count)
+
+    def test_conflicting_options_rejected(self):
+        service = OpenAIService(api_key="options-key", share_client=True,
+                                http_options=HTTPClientOptions(http2=False))
+        with self.assertRaises(ValueError):
+            OpenAIService(api_key="options-key", share_client=True,
+                          http_options=HTTPClientOptions(max_connections=5))
+        self.async_test(service.aclose())
+
+    def test_async_context_manager_closes_unshared_client(self):
+        count = shared_client_count()
+
+        async def use_service():
+            async with OpenAIService(api_key="private-key", share_client=False) as service:
+                service.client.close = AsyncMock()
+                self.assertEqual(shared_client_count(), count)
+                return service.client
+        client = self.async_test(use_service())
+        client.close.assert_awaited_once()
+
 if __name__ == '__main__':
     unittest.main()
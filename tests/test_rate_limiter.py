@@ -0,0 +1,98 @@
+import unittest
+import time
+from unittest.mock import MagicMock
+from src.services.rate_limiter import (
+    TokenBucket, AdaptiveConcurrencyLimiter, RequestScheduler, retry_after_seconds
+)
+
+from tests.async_test_case import AsyncTestCase
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = MagicMock(headers=headers or {})
+
+class TestTokenBucket(AsyncTestCase):
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    def test_waits_once_burst_is_spent(self):
+        bucket = TokenBucket(per_minute=6000, capacity=2)  # 100 tokens per second
+        start = time.monotonic()
+        for _ in range(4):
+            self.async_test(bucket.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.015)
+
+    def test_oversized_request_drains_bucket(self):
+        bucket = TokenBucket(per_minute=60000, capacity=10)
+        self.async_test(bucket.acquire(50))
+        self.assertLessEqual(bucket._tokens, 0)
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    def test_throttling_halves_and_successes_grow_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(maximum=8)
+        limiter.on_throttle()
+        self.assertEqual(limiter.limit, 4)
+        for _ in range(4):
+            limiter.on_success()
+        self.assertEqual(limiter.limit, 5)
+        for _ in range(10):
+            limiter.on_throttle()
+        self.assertEqual(limiter.limit, 1)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(maximum=0)
+
+class TestRetryAfter(unittest.TestCase):
+    def test_headers(self):
+        self.assertEqual(retry_after_seconds(HTTPError(429, {"retry-after": "2"})), 2.0)
+        self.assertEqual(retry_after_seconds(HTTPError(429, {"retry-after-ms": "250"})), 0.25)
+        self.assertIsNone(retry_after_seconds(HTTPError(429, {"retry-after": "Wed, 21 Oct 2015"})))
+        self.assertIsNone(retry_after_seconds(ValueError("no response")))
+
+class TestRequestScheduler(AsyncTestCase):
+    def setUp(self):
+        self.scheduler = RequestScheduler(max_concurrency=4, max_retries=2, base_delay=0.001)
+
+    def failing_call(self, *errors, result="ok"):
+        calls = []
+
+        async def call():
+            calls.append(len(calls))
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return result
+        return call, calls
+
+    def test_retries_throttled_and_server_errors(self):
+        call, calls = self.failing_call(HTTPError(429, {"retry-after": "0"}), HTTPError(503))
+        self.assertEqual(self.async_test(self.scheduler.run(call)), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.scheduler.throttled, 1)
+        self.assertEqual(self.scheduler.retries, 2)
+        self.assertEqual(self.scheduler.concurrency.limit, 2)
+
+    def test_does_not_retry_client_errors(self):
+        call, calls = self.failing_call(HTTPError(400))
+        with self.assertRaises(HTTPError):
+            self.async_test(self.scheduler.run(call))
+        self.assertEqual(len(calls), 1)
+
+    def test_gives_up_after_max_retries(self):
+        call, calls = self.failing_call(*(ConnectionError("reset") for _ in range(5)))
+        with self.assertRaises(ConnectionError):
+            self.async_test(self.scheduler.run(call))
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.scheduler.concurrency.in_flight, 0)
+
+    def test_extra_retryable_exceptions(self):
+        scheduler = RequestScheduler(max_retries=1, base_delay=0.001,
+                                     retryable_exceptions=(KeyError,))
+        call, calls = self.failing_call(KeyError("transient"))
+        self.assertEqual(self.async_test(scheduler.run(call)), "ok")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,11 +47,30 @@ class TestTopic(unittest.TestCase):
         self.assertIn("Computer Fundamentals", prereqs)
         self.assertIn("Basic Math", prereqs)
         
-    def test_get_prerequisites_returns_copy(self):
+    def test_get_prerequisites_returns_read_only_view(self):
         self.topic.add_prerequisite("Computer Fundamentals")
         prereqs = self.topic.get_prerequisites()
-        prereqs.add("New Prerequisite")
-        self.assertNotIn("New Prerequisite", self.topic.prerequisites)
+        self.assertFalse(hasattr(prereqs, "add"))
+        self.topic.add_prerequisite("Basic Math")
+        self.assertIn("Basic Math", prereqs)
+        self.assertEqual(prereqs, {"Computer Fundamentals", "Basic Math"})
+
+    def test_get_learning_points_returns_ordered_view(self):
+        points = [LearningPoint(f"point_{i}", "Description") for i in range(5)]
+        for point in points:
+            self.topic.add_learning_point(point)
+        view = self.topic.get_learning_points()
+        self.assertEqual(list(view), points)
+        self.assertFalse(hasattr(view, "append"))
+        self.topic.remove_learning_point(points[2])
+        self.assertEqual(list(view), points[:2] + points[3:])
+
+    def test_learning_points_identified_by_name(self):
+        self.topic.add_learning_point(self.learning_point)
+        duplicate = LearningPoint("variables", "Another description")
+        self.assertIn(duplicate, self.topic.learning_points)
+        self.topic.add_learning_point(duplicate)
+        self.assertEqual(len(self.topic.learning_points), 1)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import random
+from src.services.vector_index import BruteForceIndex, LSHIndex, HashingEmbedder, normalize, dot
+
+class TestHashingEmbedder(unittest.TestCase):
+    def test_similar_texts_have_similar_vectors(self):
+        embed = HashingEmbedder(dim=64)
+        loops = normalize(embed("Loops: repeating a block of code"))
+        for_loops = normalize(embed("For loops: repeating a block of code for each item"))
+        files = normalize(embed("Files: reading and writing data on disk"))
+        self.assertGreater(dot(loops, for_loops), dot(loops, files))
+        self.assertEqual(len(loops), 64)
+
+class TestBruteForceIndex(unittest.TestCase):
+    def test_search_orders_by_cosine_similarity(self):
+        index = BruteForceIndex(dim=2)
+        index.add([1.0, 0.0])
+        index.add([0.0, 3.0])
+        index.add([1.0, 1.0])
+        results = index.search([2.0, 0.1], k=2)
+        self.assertEqual([vector_id for vector_id, _ in results], [0, 2])
+        self.assertAlmostEqual(results[0][1], 0.99875, places=4)
+
+    def test_dimension_checked(self):
+        index = BruteForceIndex(dim=3)
+        with self.assertRaises(ValueError):
+            index.add([1.0, 2.0])
+        with self.assertRaises(ValueError):
+            index.search([1.0])
+
+    def test_existing_buffer_and_added_vectors(self):
+        index = BruteForceIndex(dim=2, vectors=normalize([1.0, 0.0]) + normalize([0.0, 1.0]))
+        index.add([-1.0, 0.0])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.search([-5.0, 0.0], k=1)[0][0], 2)
+
+class TestLSHIndex(unittest.TestCase):
+    def test_finds_near_vectors_without_scoring_everything(self):
+        rng = random.Random(3)
+        dim = 32
+        vectors = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(500)]
+        index = LSHIndex(dim, tables=8, bits=10)
+        for vector in vectors:
+            index.add(vector)
+        for vector_id in range(0, 500, 25):
+            query = [value + rng.gauss(0, 0.05) for value in vectors[vector_id]]
+            self.assertEqual(index.search(query, k=1)[0][0], vector_id)
+            self.assertLess(len(index._candidates(normalize(query))), 100)
+
+    def test_indexes_existing_buffer(self):
+        buffer = normalize([1.0, 0.0, 0.0]) + normalize([0.0, 1.0, 0.0])
+        index = LSHIndex(3, vectors=buffer, tables=4, bits=4)
+        self.assertEqual(index.search([0.0, 1.0, 0.01], k=1)[0][0], 1)
+
+if __name__ == '__main__':
+    unittest.main()